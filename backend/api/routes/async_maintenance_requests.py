@@ -0,0 +1,251 @@
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from database.async_database import get_async_db
+from schemas.schemas import (
+    MaintenanceRequest, MaintenanceRequestCreate, MaintenanceRequestUpdate, MessageResponse,
+    MaintenanceRequestChanges
+)
+from crud.async_maintenance_request_crud import (
+    get_maintenance_request, get_maintenance_requests, create_maintenance_request,
+    update_maintenance_request, delete_maintenance_request, get_active_requests,
+    get_requests_by_hall, get_maintenance_request_rows, get_request_changes, snapshots_ready
+)
+from crud.maintenance_request_crud import CURSOR_FIELDS
+from crud.pagination import InvalidCursor, decode_request_cursor, next_cursor
+from api.routes.auth import verify_token
+from api.routes.maintenance_requests import (
+    resolve_request_scope, resolve_fieldset, sparse_response, request_etag, expected_version, version_conflict,
+    list_cache_headers, not_modified, resolve_changes_request, expired_sync_token
+)
+from crud.maintenance_request_crud import StaleVersion, ExpiredSyncToken
+from services.principal import Principal, get_principal_async, principal_from_claims
+from services.watermark import request_watermark_async, list_etag
+
+# AsyncSession-backed versions of the core maintenance request routes. When
+# "maintenance-requests" is listed in ASYNC_DB_ROUTERS this router is mounted
+# ahead of the sync one, so these paths take precedence and every other
+# route keeps being served by the sync router. Item paths only match numeric
+# IDs so fixed sync paths such as /export are not shadowed.
+async def current_snapshots():
+    """Reload due lookup/topology snapshots off the event loop before the
+    route (scopes, watermarks, responses) reads them"""
+    await snapshots_ready()
+
+router = APIRouter(
+    prefix="/maintenance-requests",
+    tags=["maintenance-requests"],
+    dependencies=[Depends(current_snapshots)],
+)
+
+async def get_current_user(db: AsyncSession = Depends(get_async_db), token = Depends(verify_token)) -> Principal:
+    """Get current user from token - Authentication required"""
+    if token.claims:
+        # Versioned tokens carry the full scope, no lookup needed
+        return principal_from_claims(token.claims)
+    user = await get_principal_async(db, token.email)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    return user
+
+@router.get("/", response_model=List[MaintenanceRequest])
+async def read_maintenance_requests(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    view: Optional[str] = None,
+    fields: Optional[str] = None,
+    student_id: Optional[int] = None,
+    status_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    hall_id: Optional[int] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Get all maintenance requests with optional filtering - Authentication required
+
+    Newest first. Pass the ``X-Next-Cursor`` header of one page as ``cursor``
+    to fetch the next; ``skip`` still works but gets slower with depth.
+    ``view=summary`` or ``fields=a,b,c`` returns flat rows with only those
+    columns instead of the full nested objects. Responses carry a weak
+    ETag; send it back as ``If-None-Match`` to get a 304 while nothing in
+    your scope has changed.
+    """
+    try:
+        after = decode_request_cursor(cursor) if cursor else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    fieldset = resolve_fieldset(view, fields)
+
+    scope = resolve_request_scope(current_user, student_id=student_id, hall_id=hall_id)
+    if scope is None:
+        return []
+    student_id, hall_id = scope
+
+    etag = list_etag(
+        await request_watermark_async(db, student_id=student_id, hall_id=hall_id),
+        "list", skip, limit, cursor, fieldset, status_id, category_id
+    )
+    cached = not_modified("list", etag, if_none_match)
+    if cached is not None:
+        return cached
+
+    if fieldset is not None:
+        rows = await get_maintenance_request_rows(
+            db,
+            fieldset,
+            skip=skip,
+            limit=limit,
+            student_id=student_id,
+            status_id=status_id,
+            category_id=category_id,
+            hall_id=hall_id,
+            after=after,
+        )
+        sparse = sparse_response(rows, limit)
+        sparse.headers.update(list_cache_headers(etag))
+        return sparse
+
+    requests = await get_maintenance_requests(
+        db,
+        skip=skip,
+        limit=limit,
+        student_id=student_id,
+        status_id=status_id,
+        category_id=category_id,
+        hall_id=hall_id,
+        after=after,
+    )
+    next_page = next_cursor(requests, limit, *CURSOR_FIELDS)
+    if next_page:
+        response.headers["X-Next-Cursor"] = next_page
+    response.headers.update(list_cache_headers(etag))
+    return requests
+
+@router.get("/changes", response_model=MaintenanceRequestChanges)
+async def read_request_changes(
+    since: Optional[str] = None,
+    limit: int = 100,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Maintenance requests created, updated or deleted since a sync token - Authentication required"""
+    token, student_id, hall_id = resolve_changes_request(current_user, since, limit)
+    try:
+        changed, deleted, next_token, has_more = await get_request_changes(
+            db, token, limit=limit, student_id=student_id, hall_id=hall_id
+        )
+    except ExpiredSyncToken:
+        raise expired_sync_token()
+    return {"changed": changed, "deleted": deleted, "next_token": next_token, "has_more": has_more}
+
+@router.get("/active", response_model=List[MaintenanceRequest])
+async def read_active_requests(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Get all active (pending, assigned, in progress, under review) maintenance requests - Authentication required
+
+    Newest first, read from the materialized active_requests table. Honours
+    If-None-Match like the main listing.
+    """
+    etag = list_etag(await request_watermark_async(db), "active")
+    cached = not_modified("active", etag, if_none_match)
+    if cached is not None:
+        return cached
+    response.headers.update(list_cache_headers(etag))
+    return await get_active_requests(db)
+
+@router.get("/hall/{hall_id}", response_model=List[MaintenanceRequest])
+async def read_requests_by_hall(
+    hall_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Get all maintenance requests for a specific hall - Authentication required"""
+    return await get_requests_by_hall(db, hall_id=hall_id)
+
+@router.get("/{request_id:int}", response_model=MaintenanceRequest)
+async def read_maintenance_request(
+    request_id: int,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Get a specific maintenance request by ID - Authentication required"""
+    db_request = await get_maintenance_request(db, request_id=request_id)
+    if db_request is None:
+        raise HTTPException(status_code=404, detail="Maintenance request not found")
+    response.headers["ETag"] = request_etag(db_request.issue_ID, db_request.version)
+    return db_request
+
+@router.post("/", response_model=MaintenanceRequest, status_code=status.HTTP_201_CREATED)
+async def create_new_maintenance_request(
+    request: MaintenanceRequestCreate,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Create a new maintenance request (Students only)"""
+    # Only students can create maintenance requests
+    if current_user.role != "student":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"Only students can create maintenance requests. Current role: {current_user.role}"
+        )
+
+    # Verify the user has a student record
+    if not current_user.student_ID:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Student record not found. Please contact administrator."
+        )
+
+    # Override the student_ID in the request with the current user's student ID
+    request.student_ID = current_user.student_ID
+    db_request = await create_maintenance_request(db=db, request=request)
+    response.headers["ETag"] = request_etag(db_request["issue_ID"], db_request["version"])
+    return db_request
+
+@router.put("/{request_id:int}", response_model=MaintenanceRequest)
+async def update_existing_maintenance_request(
+    request_id: int,
+    request_update: MaintenanceRequestUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Update an existing maintenance request - Authentication required (honours If-Match)"""
+    try:
+        db_request = await update_maintenance_request(
+            db,
+            request_id=request_id,
+            request_update=request_update,
+            expected_version=expected_version(if_match, request_id)
+        )
+    except StaleVersion as e:
+        raise version_conflict(e)
+    if db_request is None:
+        raise HTTPException(status_code=404, detail="Maintenance request not found")
+    response.headers["ETag"] = request_etag(db_request.issue_ID, db_request.version)
+    return db_request
+
+@router.delete("/{request_id:int}", response_model=MessageResponse)
+async def delete_existing_maintenance_request(
+    request_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Delete a maintenance request - Authentication required"""
+    success = await delete_maintenance_request(db, request_id=request_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="Maintenance request not found")
+    return MessageResponse(message="Maintenance request deleted successfully")
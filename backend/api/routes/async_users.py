@@ -0,0 +1,84 @@
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from database.async_database import get_async_db
+from schemas.schemas import User, UserCreate, UserUpdate, MessageResponse
+from crud.async_user_crud import (
+    get_user, get_users, create_user, update_user, delete_user, get_user_by_email
+)
+from models.models import UserRole
+from crud.pagination import InvalidCursor, decode_id_cursor, next_cursor
+from api.routes.auth import hash_new_password
+
+# AsyncSession-backed versions of the user routes, mounted ahead of the sync
+# router when "users" is listed in ASYNC_DB_ROUTERS.
+router = APIRouter(prefix="/users", tags=["users"])
+
+@router.get("/", response_model=List[User])
+async def read_users(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    role: UserRole = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get all users with optional filtering by role, paginated by ``cursor`` or ``skip``"""
+    try:
+        after_id = decode_id_cursor(cursor) if cursor else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    users = await get_users(db, skip=skip, limit=limit, role=role, after_id=after_id)
+    next_page = next_cursor(users, limit, "id")
+    if next_page:
+        response.headers["X-Next-Cursor"] = next_page
+    return users
+
+@router.get("/{user_id}", response_model=User)
+async def read_user(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Get a specific user by ID"""
+    db_user = await get_user(db, user_id=user_id)
+    if db_user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return db_user
+
+@router.get("/email/{email}", response_model=User)
+async def read_user_by_email(email: str, db: AsyncSession = Depends(get_async_db)):
+    """Get a specific user by email"""
+    db_user = await get_user_by_email(db, email=email)
+    if db_user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return db_user
+
+@router.post("/", response_model=User, status_code=status.HTTP_201_CREATED)
+async def create_new_user(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    """Create a new user"""
+    # Check if user with email already exists
+    db_user = await get_user_by_email(db, email=user.email)
+    if db_user:
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    user.password = await hash_new_password(user.password)
+    return await create_user(db=db, user=user)
+
+@router.put("/{user_id}", response_model=User)
+async def update_existing_user(
+    user_id: int,
+    user_update: UserUpdate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Update an existing user"""
+    user_update.password = await hash_new_password(user_update.password)
+    db_user = await update_user(db, user_id=user_id, user_update=user_update)
+    if db_user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return db_user
+
+@router.delete("/{user_id}", response_model=MessageResponse)
+async def delete_existing_user(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Delete a user"""
+    success = await delete_user(db, user_id=user_id)
+    if not success:
+        raise HTTPException(status_code=404, detail="User not found")
+    return MessageResponse(message="User deleted successfully")
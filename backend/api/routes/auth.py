@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from sqlalchemy import or_
@@ -6,13 +7,20 @@ from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
 import bcrypt
+import hashlib
 import os
 import logging
 from dotenv import load_dotenv
 
 from database.database import get_db
 from models.models import User
-from schemas.schemas import LoginCredentials, LoginResponse, TokenData
+from schemas.schemas import LoginCredentials, LoginResponse, TokenData, RefreshRequest, TokenPair
+from services.password_hasher import password_pool, PasswordPoolSaturated
+from services.cache import BoundedTTLCache
+from services.principal import (
+    Principal, load_principal, principal_cache, principal_claims
+)
+from config import settings
 
 load_dotenv()
 
@@ -24,7 +32,21 @@ security = HTTPBearer()
 # JWT Configuration
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-here-please-change-in-production")
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
+ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
+REFRESH_TOKEN_EXPIRE_DAYS = settings.REFRESH_TOKEN_EXPIRE_DAYS
+
+# Version 2 tokens carry the caller's scope (uid, sid, rid, hid, sv) so routes
+# can authorize without looking the user up again. Tokens without "ver" are
+# treated as legacy subject-only tokens. Access tokens are trusted until they
+# expire; the scope version ("sv") is only compared with the stored one when
+# the pair is refreshed.
+TOKEN_VERSION = 2
+
+# Verified tokens, keyed by a digest of the raw token so the cache never holds credentials
+token_cache = BoundedTTLCache(
+    max_entries=settings.TOKEN_CACHE_MAX_ENTRIES,
+    default_ttl=settings.TOKEN_CACHE_TTL_SECONDS,
+)
 
 # Default Covenant University credentials - redirects to real accounts
 # Default credentials matching actual database users
@@ -67,6 +89,21 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def create_token_pair(principal: Principal):
+    """Create a short-lived access token and a longer-lived refresh token"""
+    access_token = create_access_token(
+        data={"ver": TOKEN_VERSION, "typ": "access", **principal_claims(principal)},
+        expires_delta=timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    refresh_token = create_access_token(
+        data={
+            "ver": TOKEN_VERSION, "typ": "refresh", "sub": principal.email, "uid": principal.id,
+            "sv": principal.scope_version,
+        },
+        expires_delta=timedelta(days=REFRESH_TOKEN_EXPIRE_DAYS)
+    )
+    return access_token, refresh_token
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a plain password against its hash"""
     try:
@@ -92,14 +129,33 @@ def hash_password(password: str) -> str:
     """Hash a password"""
     return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
 
-def authenticate_user(db: Session, email: str, password: str):
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the bounded hashing pool instead of the event loop"""
+    return await password_pool.run(verify_password, plain_password, hashed_password)
+
+async def hash_password_async(password: str) -> str:
+    """Hash a password on the bounded hashing pool instead of the event loop"""
+    return await password_pool.run(hash_password, password)
+
+async def hash_new_password(password: str) -> str:
+    """Hash a password being set through the API, answering 503 when the pool is saturated"""
+    try:
+        return await hash_password_async(password)
+    except PasswordPoolSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent password changes, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+async def authenticate_user(db: Session, email: str, password: str):
     """Authenticate a user with email and password"""
     # Check database for real users only
-    user = db.query(User).filter(User.email == email).first()
+    user = await run_in_threadpool(lambda: db.query(User).filter(User.email == email).first())
     if user:
         logger.info(f"Found user {email} in database, checking password...")
         logger.debug(f"Stored password starts with: {user.password[:10]}...")
-        password_valid = verify_password(password, user.password)
+        password_valid = await verify_password_async(password, user.password)
         logger.info(f"Password verification result for {email}: {password_valid}")
         if password_valid:
             return user
@@ -112,22 +168,27 @@ def authenticate_user(db: Session, email: str, password: str):
 
 def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Verify JWT token"""
-    try:
-        payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
+    cache_key = hashlib.sha256(credentials.credentials.encode('utf-8')).digest()
+    token_data = token_cache.get(cache_key)
+    if token_data is None:
+        try:
+            payload = jwt.decode(credentials.credentials, SECRET_KEY, algorithms=[ALGORITHM])
+            email: str = payload.get("sub")
+            if email is None or payload.get("typ") == "refresh":
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid authentication credentials",
+                    headers={"WWW-Authenticate": "Bearer"},
+                )
+            claims = payload if payload.get("ver") == TOKEN_VERSION else None
+            token_data = TokenData(email=email, role=payload.get("role"), claims=claims)
+        except JWTError:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid authentication credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        token_data = TokenData(email=email)    
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
+        token_cache.set(cache_key, token_data, expires_at=payload.get("exp"))
     return token_data
 
 @router.post("/login", response_model=LoginResponse)
@@ -146,7 +207,14 @@ async def login(credentials: LoginCredentials, db: Session = Depends(get_db)):
     """
     
     # Authenticate user
-    user = authenticate_user(db, credentials.email, credentials.password)
+    try:
+        user = await authenticate_user(db, credentials.email, credentials.password)
+    except PasswordPoolSaturated:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many concurrent logins, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -154,13 +222,10 @@ async def login(credentials: LoginCredentials, db: Session = Depends(get_db)):
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Create access token
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user["email"] if isinstance(user, dict) else user.email, 
-              "role": user["role"] if isinstance(user, dict) else user.role},
-        expires_delta=access_token_expires
-    )
+    # Resolve the user's scope once and embed it in the tokens
+    principal = await run_in_threadpool(load_principal, db, user.email)
+    principal_cache.set(principal.email, principal)
+    access_token, refresh_token = create_token_pair(principal)
     
     # Prepare user data for response
     user_data = {
@@ -171,13 +236,11 @@ async def login(credentials: LoginCredentials, db: Session = Depends(get_db)):
         "phone_number": user.get("phone_number") if isinstance(user, dict) else user.phone_number
     }
     
-    # If user is a student, fetch student_ID and room_ID
-    if (user["role"] if isinstance(user, dict) else user.role) == "student":
-        from models.models import Student
-        student_record = db.query(Student).filter(Student.user_ID == user_data["id"]).first()
-        if student_record:
-            user_data["student_ID"] = student_record.student_ID
-            user_data["room_ID"] = student_record.room_ID
+    # If user is a student, include student_ID and room_ID
+    if principal.role == "student":
+        if principal.student_ID:
+            user_data["student_ID"] = principal.student_ID
+            user_data["room_ID"] = principal.room_ID
         else:
             # Student record doesn't exist - this is an error
             raise HTTPException(
@@ -185,10 +248,48 @@ async def login(credentials: LoginCredentials, db: Session = Depends(get_db)):
                 detail="Student record not found. Please contact administrator."
             )
     
+    elif principal.role == "hall officer":
+        user_data["hall_ID"] = principal.hall_ID
+    
     return LoginResponse(
         access_token=access_token,
         token_type="bearer",
         user=user_data,
+        expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+        refresh_token=refresh_token
+    )
+
+@router.post("/refresh", response_model=TokenPair)
+def refresh_tokens(body: RefreshRequest, db: Session = Depends(get_db)):
+    """Exchange a refresh token for a new token pair with up-to-date scope claims"""
+    invalid = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Invalid refresh token",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    try:
+        payload = jwt.decode(body.refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        raise invalid
+    if payload.get("typ") != "refresh" or payload.get("sub") is None:
+        raise invalid
+
+    # Always re-read the scope so a room or hall change is picked up
+    principal = load_principal(db, payload["sub"])
+    if principal is None or principal.id != payload.get("uid"):
+        raise invalid
+    if payload.get("sv", 0) > principal.scope_version:
+        # Versions only grow, so this token was not minted from this database
+        raise invalid
+    if payload.get("sv", 0) < principal.scope_version:
+        logger.info(f"Scope of {principal.email} changed since its tokens were issued, reissuing")
+    principal_cache.set(principal.email, principal)
+
+    access_token, refresh_token = create_token_pair(principal)
+    return TokenPair(
+        access_token=access_token,
+        refresh_token=refresh_token,
+        token_type="bearer",
         expires_in=ACCESS_TOKEN_EXPIRE_MINUTES * 60
     )
 
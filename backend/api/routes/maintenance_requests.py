@@ -1,28 +1,66 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from database.database import get_db
+from typing import List, Optional, Tuple
+from datetime import datetime
+import asyncio
+import tempfile
+from database.database import get_db, SessionLocal
+from pydantic import TypeAdapter
 from schemas.schemas import (
-    MaintenanceRequest, MaintenanceRequestCreate, MaintenanceRequestUpdate, MessageResponse
+    MaintenanceRequest, MaintenanceRequestCreate, MaintenanceRequestUpdate, MessageResponse,
+    MaintenanceRequestSummary, BulkStatusUpdate, BulkStatusOutcome, BulkStatusResult, ImportResult,
+    MaintenanceRequestChanges
 )
 from crud.maintenance_request_crud import (
     get_maintenance_request, get_maintenance_requests, create_maintenance_request,
     update_maintenance_request, delete_maintenance_request, get_active_requests,
-    get_requests_by_hall
+    get_requests_by_hall, get_maintenance_request_rows, CURSOR_FIELDS, PROJECTION_FIELDS, SUMMARY_FIELDS,
+    StaleVersion, bulk_update_status, hydrate_projection, get_request_changes, ExpiredSyncToken
 )
-from models.models import User, Student, HallOfficer
+from services.lookup_registry import (
+    lookup_registry, UnknownLookup, PENDING, IN_PROGRESS, UNDER_REVIEW, COMPLETED
+)
+from crud.pagination import InvalidCursor, decode_request_cursor, decode_sync_token, next_cursor
+from models.models import Student
 from api.routes.auth import verify_token
+from services.principal import Principal, get_principal, principal_from_claims
+from config import settings
+from services.request_export import EXPORT_FORMATS, export_maintenance_requests
+from services.request_importer import IMPORT_FORMATS, import_maintenance_requests
+from services.watermark import request_watermark, list_etag, etag_matches, conditional_get_stats
+from services.event_bus import event_bus
 from jose import jwt, JWTError
 import os
+import re
 
 router = APIRouter(prefix="/maintenance-requests", tags=["maintenance-requests"])
 security = HTTPBearer()
 
-def get_current_user(db: Session = Depends(get_db), token = Depends(verify_token)):
+def get_current_user(db: Session = Depends(get_db), token = Depends(verify_token)) -> Principal:
     """Get current user from token - Authentication required"""
-    user = db.query(User).filter(User.email == token.email).first()
+    if token.claims:
+        # Versioned tokens carry the full scope, no lookup needed
+        return principal_from_claims(token.claims)
+    user = get_principal(db, token.email)
+    if not user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found"
+        )
+    return user
+
+def get_stream_user(token = Depends(verify_token)) -> Principal:
+    """get_current_user for long-lived streams: never holds a pooled session open"""
+    if token.claims:
+        return principal_from_claims(token.claims)
+    db = SessionLocal()
+    try:
+        user = get_principal(db, token.email)
+    finally:
+        db.close()
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -30,6 +68,140 @@ def get_current_user(db: Session = Depends(get_db), token = Depends(verify_token
         )
     return user
 
+def resolve_request_scope(
+    current_user: Principal,
+    student_id: Optional[int] = None,
+    hall_id: Optional[int] = None
+) -> Optional[Tuple[Optional[int], Optional[int]]]:
+    """Apply role-based filtering to the requested student/hall filters.
+
+    Returns the (student_id, hall_id) pair to query with, or None when the
+    caller has no scope and should see nothing.
+    """
+    if current_user.role == "student":
+        # Students can only see their own requests
+        if not current_user.student_ID:
+            # If no student record, nothing is visible
+            return None
+        student_id = current_user.student_ID
+            
+    elif current_user.role == "hall officer":
+        # Hall officers can only see requests from their assigned hall
+        if not current_user.hall_ID:
+            # If no hall assignment, nothing is visible
+            return None
+        hall_id = current_user.hall_ID
+    
+    # Admin and maintenance officers can see all requests (no additional filtering)
+    return student_id, hall_id
+
+def resolve_fieldset(view: Optional[str], fields: Optional[str]) -> Optional[List[str]]:
+    """Field names for a sparse listing, or None for the full nested response"""
+    if fields:
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        unknown = [name for name in names if name not in PROJECTION_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(unknown)}. Available: {', '.join(PROJECTION_FIELDS)}"
+            )
+        return names
+    if view is None or view == "full":
+        return None
+    if view == "summary":
+        return list(SUMMARY_FIELDS)
+    raise HTTPException(status_code=400, detail=f"Unknown view: {view}. Use 'summary' or 'full'")
+
+_summary_rows = TypeAdapter(List[MaintenanceRequestSummary])
+
+def sparse_response(rows, limit: int) -> Response:
+    """Serialize projection rows straight to JSON, skipping response_model validation"""
+    summaries = _summary_rows.validate_python([hydrate_projection(row) for row in rows])
+    response = Response(
+        content=_summary_rows.dump_json(summaries, exclude_unset=True),
+        media_type="application/json"
+    )
+    next_page = next_cursor(rows, limit, *CURSOR_FIELDS)
+    if next_page:
+        response.headers["X-Next-Cursor"] = next_page
+    return response
+
+def list_cache_headers(etag: str) -> dict:
+    """Let clients cache a listing but revalidate it on every use"""
+    return {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+def not_modified(endpoint: str, etag: str, if_none_match: Optional[str]) -> Optional[Response]:
+    """304 when If-None-Match still matches the listing; counts every request either way"""
+    matched = etag_matches(if_none_match, etag)
+    conditional_get_stats.record(endpoint, if_none_match is not None, matched)
+    if matched:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=list_cache_headers(etag))
+    return None
+
+def resolve_changes_request(current_user: Principal, since: Optional[str], limit: int):
+    """Validate a changes feed call; returns (decoded token, student_id, hall_id)"""
+    if not 1 <= limit <= settings.CHANGES_MAX_LIMIT:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {settings.CHANGES_MAX_LIMIT}")
+    try:
+        token = decode_sync_token(since) if since else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    scope = resolve_request_scope(current_user)
+    if scope is None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No maintenance requests visible to this account")
+    return (token, *scope)
+
+def expired_sync_token() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_410_GONE,
+        detail="Sync token is too old; reload the full list and start again without since"
+    )
+
+def require_status(status_id: int) -> None:
+    """400 unless ``status_id`` is a configured status"""
+    statuses = lookup_registry.current().statuses
+    if status_id not in statuses:
+        valid = ", ".join(f"{i}={s.status_name}" for i, s in sorted(statuses.items()))
+        raise HTTPException(status_code=400, detail=f"Invalid status_id. Must be one of: {valid}")
+
+def status_by_name(name: str) -> int:
+    try:
+        return lookup_registry.status_id(name)
+    except UnknownLookup:
+        raise HTTPException(status_code=400, detail=f"Status '{name}' is not configured")
+
+def request_etag(issue_id: int, version: int) -> str:
+    """Strong ETag identifying one maintenance request at one version"""
+    return f'"{issue_id}-{version}"'
+
+_ETAG_PATTERN = re.compile(r'"(\d+)-(\d+)"')
+
+def expected_version(if_match: Optional[str], request_id: int) -> Optional[int]:
+    """Version an If-Match header pins an update to.
+
+    None when the header is absent or ``*`` (update unconditionally). A
+    header naming no current ETag of this request fails the precondition.
+    """
+    if if_match is None or if_match.strip() == "*":
+        return None
+    for tag in if_match.split(","):
+        # Weak tags never satisfy If-Match
+        match = _ETAG_PATTERN.fullmatch(tag.strip())
+        if match and int(match.group(1)) == request_id:
+            return int(match.group(2))
+    raise HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="If-Match does not name a version of this maintenance request"
+    )
+
+def version_conflict(e: StaleVersion) -> HTTPException:
+    """412 carrying the current ETag so the client can reload and retry"""
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail="Maintenance request was modified by someone else; reload and retry",
+        headers={"ETag": request_etag(e.current.issue_ID, e.current.version)}
+    )
+
 # Explicit OPTIONS handler for debugging
 @router.options("/")
 @router.options("")
@@ -46,38 +218,65 @@ async def options_handler():
 
 @router.get("/", response_model=List[MaintenanceRequest])
 def read_maintenance_requests(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    view: Optional[str] = None,
+    fields: Optional[str] = None,
     student_id: Optional[int] = None,
     status_id: Optional[int] = None,
     category_id: Optional[int] = None,
     hall_id: Optional[int] = None,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
-    """Get all maintenance requests with optional filtering - Authentication required"""
-    
-    # Role-based filtering
-    if current_user.role == "student":
-        # Students can only see their own requests
-        student_record = db.query(Student).filter(Student.user_ID == current_user.id).first()
-        if student_record:
-            student_id = student_record.student_ID
-        else:
-            # If no student record, return empty list
-            return []
-            
-    elif current_user.role == "hall officer":
-        # Hall officers can only see requests from their assigned hall
-        hall_officer = db.query(HallOfficer).filter(HallOfficer.user_ID == current_user.id).first()
-        if hall_officer and hall_officer.hall_ID:
-            hall_id = hall_officer.hall_ID
-        else:
-            # If no hall assignment, return empty list
-            return []
+    """Get all maintenance requests with optional filtering - Authentication required
+
+    Newest first. Pass the ``X-Next-Cursor`` header of one page as ``cursor``
+    to fetch the next; ``skip`` still works but gets slower with depth.
+    ``view=summary`` or ``fields=a,b,c`` returns flat rows with only those
+    columns instead of the full nested objects. Responses carry a weak
+    ETag; send it back as ``If-None-Match`` to get a 304 while nothing in
+    your scope has changed.
+    """
     
-    # Admin and maintenance officers can see all requests (no additional filtering)
+    try:
+        after = decode_request_cursor(cursor) if cursor else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    fieldset = resolve_fieldset(view, fields)
+
+    scope = resolve_request_scope(current_user, student_id=student_id, hall_id=hall_id)
+    if scope is None:
+        return []
+    student_id, hall_id = scope
+
+    etag = list_etag(
+        request_watermark(db, student_id=student_id, hall_id=hall_id),
+        "list", skip, limit, cursor, fieldset, status_id, category_id
+    )
+    cached = not_modified("list", etag, if_none_match)
+    if cached is not None:
+        return cached
     
+    if fieldset is not None:
+        rows = get_maintenance_request_rows(
+            db,
+            fieldset,
+            skip=skip,
+            limit=limit,
+            student_id=student_id,
+            status_id=status_id,
+            category_id=category_id,
+            hall_id=hall_id,
+            after=after,
+        )
+        sparse = sparse_response(rows, limit)
+        sparse.headers.update(list_cache_headers(etag))
+        return sparse
+
     requests = get_maintenance_requests(
         db, 
         skip=skip, 
@@ -86,22 +285,190 @@ def read_maintenance_requests(
         status_id=status_id,
         category_id=category_id,
         hall_id=hall_id,
+        after=after,
     )
+    next_page = next_cursor(requests, limit, *CURSOR_FIELDS)
+    if next_page:
+        response.headers["X-Next-Cursor"] = next_page
+    response.headers.update(list_cache_headers(etag))
     return requests
 
+@router.get("/export")
+def export_requests(
+    format: str = "ndjson",
+    status_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    hall_id: Optional[int] = None,
+    submitted_from: Optional[datetime] = None,
+    submitted_to: Optional[datetime] = None,
+    current_user: Principal = Depends(get_current_user)
+):
+    """Stream maintenance requests as NDJSON or CSV - Authentication required
+
+    Rows are flat (see PROJECTION_FIELDS) and read through a server-side
+    cursor, so exports of any size run in constant memory. Scoped like the
+    listing; ``submitted_to`` is exclusive.
+    """
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown format: {format}. Use one of: {', '.join(EXPORT_FORMATS)}"
+        )
+
+    scope = resolve_request_scope(current_user, hall_id=hall_id)
+    if scope is None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Nothing to export for this account")
+    student_id, hall_id = scope
+
+    filename = f"maintenance-requests-{datetime.now():%Y%m%d-%H%M%S}.{format}"
+    return StreamingResponse(
+        export_maintenance_requests(
+            format,
+            student_id=student_id,
+            status_id=status_id,
+            category_id=category_id,
+            hall_id=hall_id,
+            submitted_from=submitted_from,
+            submitted_to=submitted_to,
+        ),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get("/changes", response_model=MaintenanceRequestChanges)
+def read_request_changes(
+    since: Optional[str] = None,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Maintenance requests created, updated or deleted since a sync token - Authentication required
+
+    Call without ``since`` for a first sync (every visible request, oldest
+    change first), then pass the returned ``next_token`` each time. Changes
+    from the last few seconds may be sent twice, so apply them by issue_ID.
+    410 means the token is too old to be trusted and the client must
+    reload the full list.
+    """
+    token, student_id, hall_id = resolve_changes_request(current_user, since, limit)
+    try:
+        changed, deleted, next_token, has_more = get_request_changes(
+            db, token, limit=limit, student_id=student_id, hall_id=hall_id
+        )
+    except ExpiredSyncToken:
+        raise expired_sync_token()
+    return {"changed": changed, "deleted": deleted, "next_token": next_token, "has_more": has_more}
+
+async def event_stream(request: Request, subscription):
+    """SSE frames for one subscription until the client leaves or is evicted"""
+    try:
+        yield f"retry: {settings.EVENT_STREAM_RETRY_MS}\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(
+                    subscription.queue.get(), timeout=settings.EVENT_STREAM_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                # Comment line; keeps proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                # Evicted or shutting down; the client reconnects with Last-Event-ID
+                break
+            yield event.to_sse()
+    finally:
+        event_bus.unsubscribe(subscription)
+
+@router.get("/events")
+async def stream_request_events(
+    request: Request,
+    last_event_id: Optional[str] = Header(None),
+    current_user: Principal = Depends(get_stream_user)
+):
+    """Server-Sent Events stream of maintenance request changes - Authentication required
+
+    Students receive events for their own requests, hall officers for their
+    hall and everyone else for all requests. Event types are
+    request.created, request.updated, request.status_changed,
+    request.deleted and (unscoped only) requests.imported; each carries the
+    request's IDs, status and version. Reconnect with ``Last-Event-ID`` to
+    resume; a ``resync`` event means events were missed and the client
+    should reload. Send the bearer token in the Authorization header
+    (browser EventSource cannot, so use a fetch-based SSE reader).
+    """
+    scope = resolve_request_scope(current_user)
+    if scope is None:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="No maintenance requests visible to this account")
+    student_id, hall_id = scope
+
+    subscription = event_bus.subscribe(student_id=student_id, hall_id=hall_id, last_event_id=last_event_id)
+    return StreamingResponse(
+        event_stream(request, subscription),
+        media_type="text/event-stream",
+        # Disable proxy buffering so events are flushed as they happen
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/import", response_model=ImportResult)
+async def import_requests(
+    request: Request,
+    format: str = "csv",
+    current_user: Principal = Depends(get_current_user)
+):
+    """Bulk import maintenance requests from a CSV or NDJSON body (Admins only)
+
+    The body is spooled (to disk past IMPORT_SPOOL_BYTES) and then imported
+    in chunks; rows that fail validation or lookups are reported per row
+    and skipped. The same import is available offline via import_requests.py.
+    """
+    if current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Only admins can import maintenance requests")
+    if format not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown format: {format}. Use one of: {', '.join(IMPORT_FORMATS)}"
+        )
+
+    with tempfile.SpooledTemporaryFile(max_size=settings.IMPORT_SPOOL_BYTES) as spool:
+        async for chunk in request.stream():
+            spool.write(chunk)
+        spool.seek(0)
+        summary = await run_in_threadpool(import_maintenance_requests, spool, format)
+
+    return ImportResult(
+        total=summary.total,
+        imported=summary.imported,
+        failed=summary.failed,
+        errors=summary.errors,
+        errors_truncated=summary.errors_truncated,
+    )
+
 @router.get("/active", response_model=List[MaintenanceRequest])
 def read_active_requests(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
-    """Get all active (pending, assigned, in progress) maintenance requests - Authentication required"""
+    """Get all active (pending, assigned, in progress, under review) maintenance requests - Authentication required
+
+    Newest first, read from the materialized active_requests table. Honours
+    If-None-Match like the main listing.
+    """
+    etag = list_etag(request_watermark(db), "active")
+    cached = not_modified("active", etag, if_none_match)
+    if cached is not None:
+        return cached
+    response.headers.update(list_cache_headers(etag))
     return get_active_requests(db)
 
 @router.get("/hall/{hall_id}", response_model=List[MaintenanceRequest])
 def read_requests_by_hall(
     hall_id: int, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get all maintenance requests for a specific hall - Authentication required"""
     return get_requests_by_hall(db, hall_id=hall_id)
@@ -109,20 +476,23 @@ def read_requests_by_hall(
 @router.get("/{request_id}", response_model=MaintenanceRequest)
 def read_maintenance_request(
     request_id: int, 
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Get a specific maintenance request by ID - Authentication required"""
     db_request = get_maintenance_request(db, request_id=request_id)
     if db_request is None:
         raise HTTPException(status_code=404, detail="Maintenance request not found")
+    response.headers["ETag"] = request_etag(db_request.issue_ID, db_request.version)
     return db_request
 
 @router.post("/", response_model=MaintenanceRequest, status_code=status.HTTP_201_CREATED)
 def create_new_maintenance_request(
     request: MaintenanceRequestCreate, 
+    response: Response,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Create a new maintenance request (Students only)"""
     
@@ -136,15 +506,14 @@ def create_new_maintenance_request(
             )
         
         # Verify the user has a student record
-        student_record = db.query(Student).filter(Student.user_ID == current_user.id).first()
-        if not student_record:
+        if not current_user.student_ID:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Student record not found. Please contact administrator."
             )
         
         # Override the student_ID in the request with the current user's student ID
-        request.student_ID = student_record.student_ID
+        request.student_ID = current_user.student_ID
     else:
         # For testing without authentication, validate that student_ID exists
         student_record = db.query(Student).filter(Student.student_ID == request.student_ID).first()
@@ -154,30 +523,43 @@ def create_new_maintenance_request(
                 detail=f"Student ID {request.student_ID} not found in database"
             )
     
-    return create_maintenance_request(db=db, request=request)
+    db_request = create_maintenance_request(db=db, request=request)
+    response.headers["ETag"] = request_etag(db_request["issue_ID"], db_request["version"])
+    return db_request
 
 @router.put("/{request_id}", response_model=MaintenanceRequest)
 def update_existing_maintenance_request(
     request_id: int,
     request_update: MaintenanceRequestUpdate,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
-    """Update an existing maintenance request - Authentication required"""
-    db_request = update_maintenance_request(
-        db, 
-        request_id=request_id, 
-        request_update=request_update
-    )
+    """Update an existing maintenance request - Authentication required
+
+    Send the ETag from a previous read as ``If-Match`` to fail with 412
+    instead of overwriting someone else's change.
+    """
+    try:
+        db_request = update_maintenance_request(
+            db, 
+            request_id=request_id, 
+            request_update=request_update,
+            expected_version=expected_version(if_match, request_id)
+        )
+    except StaleVersion as e:
+        raise version_conflict(e)
     if db_request is None:
         raise HTTPException(status_code=404, detail="Maintenance request not found")
+    response.headers["ETag"] = request_etag(db_request.issue_ID, db_request.version)
     return db_request
 
 @router.delete("/{request_id}", response_model=MessageResponse)
 def delete_existing_maintenance_request(
     request_id: int, 
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: Principal = Depends(get_current_user)
 ):
     """Delete a maintenance request - Authentication required"""
     success = delete_maintenance_request(db, request_id=request_id)
@@ -186,23 +568,63 @@ def delete_existing_maintenance_request(
     return MessageResponse(message="Maintenance request deleted successfully")
 
 # Status Update Endpoints for easier progress management
+@router.patch("/bulk-status", response_model=BulkStatusResult)
+def update_bulk_status(
+    bulk_update: BulkStatusUpdate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Move many maintenance requests to one status - Authentication required
+
+    Applied as a single UPDATE. Each issue ID gets its own outcome; requests
+    outside the caller's scope (same rules as the listing) are reported as
+    forbidden rather than failing the whole batch.
+    """
+    require_status(bulk_update.status_ID)
+    if not bulk_update.issue_IDs:
+        raise HTTPException(status_code=400, detail="No issue IDs given")
+    if len(bulk_update.issue_IDs) > settings.BULK_STATUS_MAX_IDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.BULK_STATUS_MAX_IDS} issue IDs per request"
+        )
+
+    scope = resolve_request_scope(current_user)
+    if scope is None:
+        outcomes = {issue_id: ("forbidden", None) for issue_id in dict.fromkeys(bulk_update.issue_IDs)}
+    else:
+        student_id, hall_id = scope
+        outcomes = bulk_update_status(
+            db,
+            bulk_update.issue_IDs,
+            bulk_update.status_ID,
+            student_id=student_id,
+            hall_id=hall_id,
+        )
+
+    return BulkStatusResult(
+        status_ID=bulk_update.status_ID,
+        updated=sum(1 for outcome, _ in outcomes.values() if outcome == "updated"),
+        results=[
+            BulkStatusOutcome(issue_ID=issue_id, outcome=outcome, version=version)
+            for issue_id, (outcome, version) in outcomes.items()
+        ],
+    )
+
 @router.patch("/{request_id}/status/{status_id}", response_model=MaintenanceRequest)
 def update_request_status(
     request_id: int,
     status_id: int,
+    response: Response,
+    if_match: Optional[str] = Header(None),
     db: Session = Depends(get_db)
 ):
-    """Update the status of a maintenance request"""
+    """Update the status of a maintenance request (honours If-Match)"""
     from schemas.schemas import MaintenanceRequestUpdate
     from datetime import datetime
     
-    # Validate status_id (1=Pending, 2=In Progress, 3=Under Review, 4=Completed)
-    valid_statuses = [1, 2, 3, 4]
-    if status_id not in valid_statuses:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Invalid status_id. Must be one of: {valid_statuses}"
-        )
+    # Any status in the lookup registry is valid
+    require_status(status_id)
     
     # Create update data
     update_data = MaintenanceRequestUpdate(
@@ -211,30 +633,59 @@ def update_request_status(
     )
     
     # Add completion timestamp if marking as completed
-    if status_id == 4:  # Completed
+    if status_id == lookup_registry.status_id(COMPLETED):
         update_data.completion_timestamp = datetime.now()
     
-    db_request = update_maintenance_request(db, request_id=request_id, request_update=update_data)
+    try:
+        db_request = update_maintenance_request(
+            db,
+            request_id=request_id,
+            request_update=update_data,
+            expected_version=expected_version(if_match, request_id)
+        )
+    except StaleVersion as e:
+        raise version_conflict(e)
     if db_request is None:
         raise HTTPException(status_code=404, detail="Maintenance request not found")
+    response.headers["ETag"] = request_etag(db_request.issue_ID, db_request.version)
     return db_request
 
 @router.patch("/{request_id}/in-progress", response_model=MaintenanceRequest)
-def mark_request_in_progress(request_id: int, db: Session = Depends(get_db)):
+def mark_request_in_progress(
+    request_id: int,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
     """Mark a maintenance request as in progress"""
-    return update_request_status(request_id, 2, db)
+    return update_request_status(request_id, status_by_name(IN_PROGRESS), response, if_match, db)
 
 @router.patch("/{request_id}/complete", response_model=MaintenanceRequest)
-def mark_request_complete(request_id: int, db: Session = Depends(get_db)):
+def mark_request_complete(
+    request_id: int,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
     """Mark a maintenance request as completed"""
-    return update_request_status(request_id, 4, db)
+    return update_request_status(request_id, status_by_name(COMPLETED), response, if_match, db)
 
 @router.patch("/{request_id}/under-review", response_model=MaintenanceRequest)
-def mark_request_under_review(request_id: int, db: Session = Depends(get_db)):
+def mark_request_under_review(
+    request_id: int,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
     """Mark a maintenance request as under review"""
-    return update_request_status(request_id, 3, db)
+    return update_request_status(request_id, status_by_name(UNDER_REVIEW), response, if_match, db)
 
 @router.patch("/{request_id}/reopen", response_model=MaintenanceRequest)
-def reopen_request(request_id: int, db: Session = Depends(get_db)):
+def reopen_request(
+    request_id: int,
+    response: Response,
+    if_match: Optional[str] = Header(None),
+    db: Session = Depends(get_db)
+):
     """Reopen a maintenance request (set back to pending)"""
-    return update_request_status(request_id, 1, db)
+    return update_request_status(request_id, status_by_name(PENDING), response, if_match, db)
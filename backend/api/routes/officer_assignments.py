@@ -0,0 +1,156 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from typing import List, Optional
+from database.database import get_db
+from schemas.schemas import (
+    OfficerAssignmentCreate, OfficerAssignmentUpdate, OfficerAssignmentRecord, AssignmentCompletion,
+    OfficerWorkloadSummary, DispatchReport
+)
+from crud.officer_assignment_crud import (
+    get_assignment, get_assignments, create_assignment, update_assignment, complete_assignment,
+    get_officer_by_user
+)
+from crud.officer_workload_crud import get_officer_workloads
+from services.dispatch import dispatch
+from api.routes.maintenance_requests import get_current_user
+from services.principal import Principal
+
+router = APIRouter(prefix="/assignments", tags=["assignments"])
+
+# Roles that dispatch work to maintenance officers
+DISPATCH_ROLES = ("admin", "hall officer")
+
+def require_dispatcher(current_user: Principal) -> None:
+    if current_user.role not in DISPATCH_ROLES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Only admins and hall officers can assign maintenance work"
+        )
+
+def require_assignment_access(db: Session, current_user: Principal, assignment_id: int):
+    """The assignment, if the user dispatches work or is the officer it is assigned to"""
+    db_assignment = get_assignment(db, assignment_id)
+    if db_assignment is None:
+        raise HTTPException(status_code=404, detail="Assignment not found")
+    if current_user.role in DISPATCH_ROLES:
+        return db_assignment
+    if current_user.role == "maintenance officer":
+        officer = get_officer_by_user(db, current_user.id)
+        if officer is not None and officer.officer_ID == db_assignment.officer_ID:
+            return db_assignment
+    raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not your assignment")
+
+@router.get("/workloads", response_model=List[OfficerWorkloadSummary])
+def read_officer_workloads(
+    specialty_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Every maintenance officer's open assignments and hours this week, least loaded first
+
+    Served from the officer_workload counters: one row per officer, whatever
+    the number of assignments.
+    """
+    if current_user.role == "student":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Students cannot view officer workloads")
+    return get_officer_workloads(db, specialty_id=specialty_id)
+
+@router.post("/dispatch", response_model=DispatchReport)
+def dispatch_pending_requests(
+    dry_run: bool = False,
+    specialty_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Assign pending requests to officers now (admins and hall officers)
+
+    The same pass the server runs on each submission and periodically over
+    the backlog: most urgent requests first (priority and time waited), each
+    to the least loaded available officer of its category's specialty.
+    With dry_run the plan is returned without assigning anything.
+    """
+    require_dispatcher(current_user)
+    result = dispatch(db, specialty_ids=None if specialty_id is None else [specialty_id], dry_run=dry_run)
+    return {
+        "pending": result.pending,
+        "planned": result.planned,
+        "assigned": len(result.assigned),
+        "seconds": result.seconds,
+        "decisions_per_second": result.decisions_per_second,
+        "decisions": [decision._asdict() for decision in result.assigned],
+    }
+
+@router.get("/", response_model=List[OfficerAssignmentRecord])
+def read_assignments(
+    officer_id: Optional[int] = None,
+    issue_id: Optional[int] = None,
+    open_only: bool = False,
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """List officer assignments - maintenance officers only see their own"""
+    if current_user.role == "maintenance officer":
+        officer = get_officer_by_user(db, current_user.id)
+        if officer is None:
+            return []
+        officer_id = officer.officer_ID
+    elif current_user.role not in DISPATCH_ROLES:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Students cannot view assignments")
+    return get_assignments(db, officer_id=officer_id, issue_id=issue_id, open_only=open_only, skip=skip, limit=limit)
+
+@router.get("/{assignment_id}", response_model=OfficerAssignmentRecord)
+def read_assignment(
+    assignment_id: int,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Get a specific assignment"""
+    return require_assignment_access(db, current_user, assignment_id)
+
+@router.post("/", response_model=OfficerAssignmentRecord, status_code=status.HTTP_201_CREATED)
+def create_new_assignment(
+    assignment: OfficerAssignmentCreate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Assign a maintenance officer to a request (admins and hall officers)"""
+    require_dispatcher(current_user)
+    try:
+        return create_assignment(db, assignment)
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Officer is already assigned to this request, or the officer or request does not exist"
+        )
+
+@router.put("/{assignment_id}", response_model=OfficerAssignmentRecord)
+def update_existing_assignment(
+    assignment_id: int,
+    assignment_update: OfficerAssignmentUpdate,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Update an assignment (notes, estimates, hours worked, completion)"""
+    require_assignment_access(db, current_user, assignment_id)
+    db_assignment = update_assignment(db, assignment_id, assignment_update)
+    if db_assignment is None:
+        raise HTTPException(status_code=404, detail="Assignment not found")
+    return db_assignment
+
+@router.patch("/{assignment_id}/complete", response_model=OfficerAssignmentRecord)
+def complete_existing_assignment(
+    assignment_id: int,
+    completion: AssignmentCompletion,
+    db: Session = Depends(get_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """Mark an assignment finished, optionally with its final hours"""
+    require_assignment_access(db, current_user, assignment_id)
+    db_assignment = complete_assignment(db, assignment_id, completion)
+    if db_assignment is None:
+        raise HTTPException(status_code=404, detail="Assignment not found")
+    return db_assignment
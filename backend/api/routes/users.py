@@ -1,24 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from database.database import get_db
 from schemas.schemas import User, UserCreate, UserUpdate, MessageResponse
 from crud.user_crud import (
     get_user, get_users, create_user, update_user, delete_user, get_user_by_email
 )
 from models.models import UserRole
+from crud.pagination import InvalidCursor, decode_id_cursor, next_cursor
+from api.routes.auth import hash_new_password
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/", response_model=List[User])
 def read_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     role: UserRole = None,
     db: Session = Depends(get_db)
 ):
-    """Get all users with optional filtering by role"""
-    users = get_users(db, skip=skip, limit=limit, role=role)
+    """Get all users with optional filtering by role, paginated by ``cursor`` or ``skip``"""
+    try:
+        after_id = decode_id_cursor(cursor) if cursor else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    users = get_users(db, skip=skip, limit=limit, role=role, after_id=after_id)
+    next_page = next_cursor(users, limit, "id")
+    if next_page:
+        response.headers["X-Next-Cursor"] = next_page
     return users
 
 @router.get("/{user_id}", response_model=User)
@@ -38,23 +51,26 @@ def read_user_by_email(email: str, db: Session = Depends(get_db)):
     return db_user
 
 @router.post("/", response_model=User, status_code=status.HTTP_201_CREATED)
-def create_new_user(user: UserCreate, db: Session = Depends(get_db)):
+async def create_new_user(user: UserCreate, db: Session = Depends(get_db)):
     """Create a new user"""
     # Check if user with email already exists
-    db_user = get_user_by_email(db, email=user.email)
+    db_user = await run_in_threadpool(get_user_by_email, db, email=user.email)
     if db_user:
         raise HTTPException(status_code=400, detail="Email already registered")
-    
-    return create_user(db=db, user=user)
+
+    # bcrypt runs on the hashing pool, the queries on the threadpool
+    user.password = await hash_new_password(user.password)
+    return await run_in_threadpool(create_user, db=db, user=user)
 
 @router.put("/{user_id}", response_model=User)
-def update_existing_user(
+async def update_existing_user(
     user_id: int, 
     user_update: UserUpdate, 
     db: Session = Depends(get_db)
 ):
     """Update an existing user"""
-    db_user = update_user(db, user_id=user_id, user_update=user_update)
+    user_update.password = await hash_new_password(user_update.password)
+    db_user = await run_in_threadpool(update_user, db, user_id=user_id, user_update=user_update)
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return db_user
@@ -0,0 +1,52 @@
+"""
+Helpers shared by the HTTP load benchmarks in this directory.
+
+The scripts are run directly (python benchmarks/<name>.py), which puts this
+directory on sys.path, so they import it as ``common``.
+"""
+
+import time
+
+import httpx
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def format_latencies(samples, pcts=(50, 95, 99)):
+    """'p50=1.2 p95=3.4 p99=5.6' for latency samples in ms"""
+    return " ".join(f"p{pct}={percentile(samples, pct):.1f}" for pct in pcts)
+
+
+def count(counter, key):
+    counter[key] = counter.get(key, 0) + 1
+
+
+def http_client(base_url, connections, timeout=60):
+    """AsyncClient with a connection pool sized for ``connections`` concurrent clients"""
+    limits = httpx.Limits(max_connections=connections, max_keepalive_connections=connections)
+    return httpx.AsyncClient(base_url=base_url, limits=limits, timeout=timeout)
+
+
+async def timed_request(client, method, path, errors, ok=(200,), **kwargs):
+    """Send one request and time it.
+
+    Returns (response, latency in ms), or (None, None) after counting the
+    failure in ``errors`` by status code or exception name.
+    """
+    start = time.perf_counter()
+    try:
+        response = await client.request(method, path, **kwargs)
+    except httpx.HTTPError as e:
+        count(errors, type(e).__name__)
+        return None, None
+    elapsed = (time.perf_counter() - start) * 1000
+    if response.status_code not in ok:
+        count(errors, response.status_code)
+        return None, None
+    return response, elapsed
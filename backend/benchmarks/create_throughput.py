@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Maintenance request submission throughput benchmark
+
+Many concurrent students submitting requests at once. Run it against a
+scratch database before and after a change to the create path and compare
+requests/second and latency percentiles:
+
+    python benchmarks/create_throughput.py --token <student jwt> --room-id 1 --category-id 1
+
+Pass --token several times to spread submissions over several students.
+Every successful run inserts rows; do not point it at production.
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+
+from common import format_latencies, http_client, timed_request
+
+
+async def submitter(client, tokens, payload, deadline, latencies, errors):
+    for token in tokens:
+        if time.perf_counter() >= deadline:
+            break
+        response, elapsed = await timed_request(
+            client, "POST", "/api/v1/maintenance-requests/", errors, ok=(201,),
+            json=payload, headers={"Authorization": f"Bearer {token}"},
+        )
+        if response is not None:
+            latencies.append(elapsed)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--token", action="append", required=True, help="Student bearer token (repeatable)")
+    parser.add_argument("--room-id", type=int, required=True)
+    parser.add_argument("--category-id", type=int, required=True)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=20.0)
+    args = parser.parse_args()
+
+    # student_ID is overridden server-side from the token
+    payload = {
+        "student_ID": 0,
+        "room_ID": args.room_id,
+        "category_ID": args.category_id,
+        "description": "Benchmark submission",
+    }
+    latencies, errors = [], {}
+    async with http_client(args.base_url, args.concurrency) as client:
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(
+            submitter(client, itertools.cycle(args.token), payload, deadline, latencies, errors)
+            for _ in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    print(f"📊 {len(latencies)} submissions from {args.concurrency} clients in {elapsed:.1f}s")
+    print(f"   throughput: {len(latencies) / elapsed:.1f} creates/s")
+    print(f"   latency ms: {format_latencies(latencies)}")
+    if errors:
+        print(f"   errors: {errors}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Sync vs async database path throughput benchmark
+
+Hits one endpoint with many concurrent clients and reports requests/second
+and latency percentiles. Run it twice against the same database: once with
+the server started normally and once with ASYNC_DB_ROUTERS set, e.g.
+
+    uvicorn main:app --port 8000
+    ASYNC_DB_ROUTERS=maintenance-requests uvicorn main:app --port 8001
+
+    python benchmarks/db_throughput.py --base-url http://localhost:8000 --token <jwt>
+    python benchmarks/db_throughput.py --base-url http://localhost:8001 --token <jwt>
+"""
+
+import argparse
+import asyncio
+import time
+
+from common import format_latencies, http_client, timed_request
+
+
+async def client_worker(client, path, headers, deadline, latencies, errors):
+    while time.perf_counter() < deadline:
+        response, elapsed = await timed_request(client, "GET", path, errors, headers=headers)
+        if response is not None:
+            latencies.append(elapsed)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True, help="Bearer token used for every request")
+    parser.add_argument("--path", default="/api/v1/maintenance-requests/?limit=20")
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=20.0)
+    args = parser.parse_args()
+
+    headers = {"Authorization": f"Bearer {args.token}"}
+    latencies, errors = [], {}
+    async with http_client(args.base_url, args.concurrency) as client:
+        started = time.perf_counter()
+        deadline = started + args.duration
+        await asyncio.gather(*(
+            client_worker(client, args.path, headers, deadline, latencies, errors)
+            for _ in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - started
+
+    print(f"📊 {args.base_url}{args.path} with {args.concurrency} clients for {elapsed:.1f}s")
+    print(f"   throughput: {len(latencies) / elapsed:.1f} req/s ({len(latencies)} ok)")
+    print(f"   latency ms: {format_latencies(latencies)}")
+    if errors:
+        print(f"   errors: {errors}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Dispatch throughput benchmark
+
+Times the dispatch engine over a synthetic backlog of pending requests
+(10,000 by default), twice:
+
+  plan   plan_dispatch alone, in memory: the heap scheduler's decisions/s
+  full   dispatch() against a database seeded with the same backlog:
+         loading active_requests and officer_workload, planning, and
+         applying every decision (assignments, counters, status changes)
+
+Defaults to a throwaway SQLite file; point --url at a scratch MySQL database
+to measure the real apply path. Officers get enough capacity for every
+request unless --max-active says otherwise:
+
+    python benchmarks/dispatch_throughput.py --pending 10000 --officers 200
+    python benchmarks/dispatch_throughput.py --url mysql+pymysql://user:pw@localhost/scratch
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert
+from sqlalchemy.dialects.mysql import ENUM
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import settings
+from models.models import (
+    ActiveRequests, Base, Category, Hall, HallOfficer, MaintenanceOfficer, MaintenanceRequest, OfficerWorkload, Room,
+    Specialty, Status, Student, User
+)
+from crud.officer_workload_crud import week_start
+from services.dispatch import OfficerLoad, PendingRequest, dispatch, plan_dispatch
+from services.lookup_registry import lookup_registry
+from services.topology import topology
+
+CATEGORIES = ["Electrical", "Plumbing", "Carpentry", "Welding", "General Maintenance"]
+SPECIALTIES = ["Electrical", "Plumbing", "Carpentry", "General Maintenance"]
+STATUSES = ["Pending", "Assigned", "In Progress", "Completed", "Canceled", "On Hold"]
+
+
+@compiles(ENUM, "sqlite")
+def _sqlite_enum(element, compiler, **kw):
+    # User.role is a MySQL ENUM; SQLite only needs somewhere to put it
+    return "VARCHAR(32)"
+
+
+def synthetic_backlog(pending, officers):
+    start = datetime(2025, 1, 1)
+    requests = [
+        PendingRequest(i + 1, 1 + i % len(SPECIALTIES), random.randint(1, 3), start + timedelta(seconds=random.randint(0, 86400 * 30)))
+        for i in range(pending)
+    ]
+    loads = [
+        OfficerLoad(i + 1, 1 + i % len(SPECIALTIES), random.randint(0, 2), float(random.randint(0, 20)))
+        for i in range(officers)
+    ]
+    return requests, loads
+
+
+def time_plan(requests, officers, max_active, repeats):
+    best, decisions = None, []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        decisions = plan_dispatch(requests, officers, max_active=max_active, max_hours=math.inf)
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, decisions
+
+
+def seed(engine, requests, officers):
+    print(f"🌱 Seeding {len(requests):,} pending requests and {len(officers):,} officers...")
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        # Every request belongs to one student in one room
+        conn.execute(insert(User.__table__), [
+            {"id": 1, "name": "Student", "email": "student@example.com", "password": "-", "role": "student"},
+            {"id": 2, "name": "Manager", "email": "manager@example.com", "password": "-", "role": "hall officer"},
+        ] + [
+            {"id": 1000 + o.officer_ID, "name": f"Officer {o.officer_ID}", "email": f"officer{o.officer_ID}@example.com",
+             "password": "-", "role": "maintenance officer"}
+            for o in officers
+        ])
+        conn.execute(insert(HallOfficer.__table__), [{"manager_ID": 1, "user_ID": 2}])
+        conn.execute(insert(Hall.__table__), [{"hall_ID": 1, "hall_name": "Hall", "manager_ID": 1}])
+        conn.execute(insert(Room.__table__), [{"room_ID": 1, "room_number": "1", "hall_ID": 1, "floor_number": 1}])
+        conn.execute(insert(Student.__table__), [{"student_ID": 1, "user_ID": 1, "student_number": "S1", "room_ID": 1}])
+        conn.execute(insert(Category.__table__), [{"category_name": name} for name in CATEGORIES])
+        conn.execute(insert(Status.__table__), [{"status_name": name} for name in STATUSES])
+        conn.execute(insert(Specialty.__table__), [{"specialty_name": name} for name in SPECIALTIES])
+        conn.execute(insert(MaintenanceOfficer.__table__), [
+            {"officer_ID": o.officer_ID, "user_ID": 1000 + o.officer_ID, "specialty_ID": o.specialty_ID}
+            for o in officers
+        ])
+        conn.execute(insert(OfficerWorkload.__table__), [
+            {"officer_ID": o.officer_ID, "active_assignments": 0, "total_hours_week": o.hours_this_week,
+             "week_start": week_start()}
+            for o in officers
+        ])
+        rows = [
+            {"issue_ID": r.issue_ID, "student_ID": 1, "room_ID": 1, "category_ID": r.specialty_ID,
+             "status_ID": 1, "description": "Synthetic request", "version": 1,
+             "submission_timestamp": r.submitted, "last_updated": r.submitted}
+            for r in requests
+        ]
+        conn.execute(insert(MaintenanceRequest.__table__), rows)
+        conn.execute(insert(ActiveRequests.__table__), [
+            {**row, "category_name": CATEGORIES[row["category_ID"] - 1], "status_name": "Pending",
+             "room_number": "1", "floor_number": 1, "hall_ID": 1, "hall_name": "Hall",
+             "student_number": "S1", "student_name": "Student",
+             "student_email": "student@example.com", "priority_level": r.priority_level}
+            for row, r in zip(rows, requests)
+        ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Database URL (default: temporary SQLite file)")
+    parser.add_argument("--pending", type=int, default=10_000)
+    parser.add_argument("--officers", type=int, default=200)
+    parser.add_argument("--max-active", type=int, help="Open assignments per officer (default: room for every request)")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--plan-only", action="store_true", help="Skip the database run")
+    args = parser.parse_args()
+
+    random.seed(0)
+    requests, officers = synthetic_backlog(args.pending, args.officers)
+    max_active = args.max_active or math.ceil(args.pending / args.officers) + 3
+
+    seconds, decisions = time_plan(requests, officers, max_active, args.repeats)
+    print(f"📊 plan: {len(decisions):,} decisions over {len(requests):,} pending requests in {seconds * 1000:.1f}ms "
+          f"({len(decisions) / seconds:,.0f} decisions/s)")
+    if args.plan_only:
+        return
+
+    url = args.url or f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'dispatch.db')}"
+    engine = create_engine(url)
+    seed(engine, requests, [o._replace(active_assignments=0) for o in officers])
+
+    settings.DISPATCH_MAX_ACTIVE_PER_OFFICER = max_active
+    settings.DISPATCH_MAX_HOURS_PER_WEEK = math.inf
+    db = sessionmaker(bind=engine)()
+    try:
+        lookup_registry.load(db)
+        topology.load(db)
+        result = dispatch(db)
+    finally:
+        db.close()
+    print(f"📊 full: {len(result.assigned):,} of {result.pending:,} pending requests assigned in {result.seconds:.2f}s "
+          f"({len(result.assigned) / result.seconds:,.0f} decisions/s)")
+
+
+if __name__ == "__main__":
+    main()
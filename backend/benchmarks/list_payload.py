@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Full vs sparse listing benchmark for /maintenance-requests
+
+Fetches the same page in each response shape (full nested objects,
+view=summary and an explicit fields= list) with concurrent clients, and
+reports response size and latency percentiles for each:
+
+    uvicorn main:app --port 8000
+    python benchmarks/list_payload.py --token <jwt> --limit 100
+"""
+
+import argparse
+import asyncio
+
+from common import format_latencies, http_client, timed_request
+
+
+async def client_worker(client, path, headers, requests_per_client, latencies, sizes, errors):
+    for _ in range(requests_per_client):
+        response, elapsed = await timed_request(client, "GET", path, errors, headers=headers)
+        if response is not None:
+            latencies.append(elapsed)
+            sizes.append(len(response.content))
+
+
+async def measure(client, path, headers, concurrency, requests_per_client):
+    latencies, sizes, errors = [], [], {}
+    await asyncio.gather(*(
+        client_worker(client, path, headers, requests_per_client, latencies, sizes, errors)
+        for _ in range(concurrency)
+    ))
+    return latencies, sizes, errors
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True, help="Bearer token used for every request")
+    parser.add_argument("--limit", type=int, default=100, help="Page size")
+    parser.add_argument("--fields", default="issue_ID,status_name,room_number")
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=25, help="Requests per client")
+    args = parser.parse_args()
+
+    base = f"/api/v1/maintenance-requests/?limit={args.limit}"
+    shapes = [
+        ("full", base),
+        ("view=summary", f"{base}&view=summary"),
+        (f"fields={args.fields}", f"{base}&fields={args.fields}"),
+    ]
+    headers = {"Authorization": f"Bearer {args.token}"}
+
+    print(f"📊 {args.base_url} page of {args.limit}, {args.concurrency} clients x {args.requests} requests")
+    async with http_client(args.base_url, args.concurrency) as client:
+        for label, path in shapes:
+            latencies, sizes, errors = await measure(client, path, headers, args.concurrency, args.requests)
+            size = sizes[0] if sizes else 0
+            print(f"   {label}")
+            print(f"      payload: {size:,} bytes ({size / max(args.limit, 1):,.0f} per row)")
+            print(f"      latency ms: {format_latencies(latencies, (50, 95))}")
+            if errors:
+                print(f"      errors: {errors}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Dashboard polling benchmark for conditional GETs on the request listings
+
+Simulates dashboards polling /maintenance-requests/ and /active the way
+the frontend does, sending back the last ETag as If-None-Match, while a
+writer occasionally changes a request. Reports how much of the polling
+traffic was answered with 304 and the latency of each kind of response:
+
+    uvicorn main:app --port 8000
+    python benchmarks/list_polling.py --token <jwt> --write-request-id 1
+
+Without --write-request-id nothing changes and every poll after the first
+should be a 304. The server-side counters are under "conditional_get" in
+/health/deep.
+"""
+
+import argparse
+import asyncio
+import time
+
+from common import format_latencies, http_client, timed_request
+
+
+async def poller(client, path, headers, interval, deadline, latencies, errors):
+    etag = None
+    while time.perf_counter() < deadline:
+        request_headers = dict(headers)
+        if etag:
+            request_headers["If-None-Match"] = etag
+        response, elapsed = await timed_request(client, "GET", path, errors, ok=(200, 304), headers=request_headers)
+        if response is not None:
+            latencies.setdefault(response.status_code, []).append(elapsed)
+            etag = response.headers.get("ETag", etag)
+        await asyncio.sleep(interval)
+
+
+async def writer(client, request_id, headers, interval, deadline, writes):
+    while time.perf_counter() < deadline:
+        await asyncio.sleep(interval)
+        response = await client.put(
+            f"/api/v1/maintenance-requests/{request_id}",
+            json={"description": f"Polling benchmark edit {writes[0] + 1}"},
+            headers=headers,
+        )
+        if response.status_code == 200:
+            writes[0] += 1
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--token", required=True, help="Bearer token used for every request")
+    parser.add_argument("--dashboards", type=int, default=50, help="Concurrent pollers per endpoint")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="Seconds between polls")
+    parser.add_argument("--write-request-id", type=int, help="Request to edit periodically (omit for read-only)")
+    parser.add_argument("--write-interval", type=float, default=5.0, help="Seconds between edits")
+    parser.add_argument("--duration", type=float, default=30.0)
+    args = parser.parse_args()
+
+    headers = {"Authorization": f"Bearer {args.token}"}
+    paths = ["/api/v1/maintenance-requests/", "/api/v1/maintenance-requests/active"]
+    results = {path: ({}, {}) for path in paths}
+    writes = [0]
+
+    async with http_client(args.base_url, args.dashboards * 2) as client:
+        deadline = time.perf_counter() + args.duration
+        tasks = [
+            poller(client, path, headers, args.poll_interval, deadline, *results[path])
+            for path in paths
+            for _ in range(args.dashboards)
+        ]
+        if args.write_request_id is not None:
+            tasks.append(writer(client, args.write_request_id, headers, args.write_interval, deadline, writes))
+        await asyncio.gather(*tasks)
+
+    print(f"📊 {args.dashboards} dashboards per endpoint for {args.duration:.0f}s, {writes[0]} edits")
+    for path, (latencies, errors) in results.items():
+        full, not_modified = latencies.get(200, []), latencies.get(304, [])
+        total = len(full) + len(not_modified)
+        print(f"   {path}")
+        print(f"      polls: {total}, 304s: {len(not_modified)} ({len(not_modified) / max(total, 1):.1%})")
+        print(f"      200 latency ms: {format_latencies(full, (50, 95))}")
+        print(f"      304 latency ms: {format_latencies(not_modified, (50, 95))}")
+        if errors:
+            print(f"      errors: {errors}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Login load benchmark
+
+Floods /api/v1/auth/login with concurrent logins and, at the same time,
+samples the latency of an unrelated endpoint. With bcrypt running on the
+event loop the unrelated endpoint's p99 tracks the bcrypt cost; with the
+hashing pool it should stay flat while excess logins are shed with 503s.
+
+Usage:
+    python benchmarks/login_load.py --base-url http://localhost:8000 \\
+        --email jane.student@university.edu --password student123
+"""
+
+import argparse
+import asyncio
+import time
+
+from common import count, format_latencies, http_client
+
+
+async def login_worker(client, args, deadline, outcomes):
+    payload = {"email": args.email, "password": args.password}
+    while time.perf_counter() < deadline:
+        response = await client.post("/api/v1/auth/login", json=payload)
+        count(outcomes, response.status_code)
+
+
+async def probe_worker(client, path, deadline, latencies):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        await client.get(path)
+        latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(0.01)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", default="jane.student@university.edu")
+    parser.add_argument("--password", default="student123")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=15.0)
+    parser.add_argument("--probe-path", default="/")
+    args = parser.parse_args()
+
+    async with http_client(args.base_url, args.concurrency + 5, timeout=30) as client:
+        # Baseline latency of the unrelated endpoint with no login traffic
+        baseline = []
+        await probe_worker(client, args.probe_path, time.perf_counter() + 3, baseline)
+
+        outcomes = {}
+        latencies = []
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(
+            probe_worker(client, args.probe_path, deadline, latencies),
+            *(login_worker(client, args, deadline, outcomes) for _ in range(args.concurrency)),
+        )
+
+    print(f"📊 {args.probe_path} latency (ms)")
+    print(f"   idle:  {format_latencies(baseline, (50, 99))}")
+    print(f"   load:  {format_latencies(latencies, (50, 99))}")
+    print(f"🔐 Login outcomes over {args.duration:.0f}s: {dict(sorted(outcomes.items()))}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
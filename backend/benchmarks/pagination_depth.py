@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Offset vs keyset pagination benchmark
+
+Seeds a Maintenance_Request table with synthetic rows and times fetching one
+page at increasing depths, once with OFFSET and once with a keyset cursor
+(the same ORDER BY and predicate the list endpoints use). Defaults to a
+throwaway SQLite file; point --url at a scratch MySQL database to measure
+against the real index:
+
+    python benchmarks/pagination_depth.py --rows 1000000
+    python benchmarks/pagination_depth.py --url mysql+pymysql://user:pw@localhost/scratch --rows 1000000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, select
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.models import MaintenanceRequest
+from crud.maintenance_request_crud import LIST_ORDER
+from crud.pagination import descending_keyset
+
+table = MaintenanceRequest.__table__
+
+
+def seed(engine, rows, batch_size=10000):
+    print(f"🌱 Seeding {rows:,} rows...")
+    start = datetime(2024, 1, 1)
+    # Only the request table is created, so foreign keys point at nothing
+    table.create(engine, checkfirst=True)
+    with engine.begin() as conn:
+        for offset in range(0, rows, batch_size):
+            batch = []
+            for i in range(offset, min(offset + batch_size, rows)):
+                # Coarse timestamps so plenty of rows tie and the id tiebreak matters
+                submitted = start + timedelta(minutes=i // 3)
+                batch.append({
+                    "student_ID": random.randint(1, 5000),
+                    "room_ID": random.randint(1, 2000),
+                    "category_ID": random.randint(1, 8),
+                    "status_ID": random.randint(1, 4),
+                    "description": "Synthetic request",
+                    "submission_timestamp": submitted,
+                    "last_updated": submitted,
+                })
+            conn.execute(insert(table), batch)
+
+
+def time_page(conn, statement, repeats):
+    best = None
+    rows = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        rows = conn.execute(statement).all()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1000, rows
+
+
+def run(engine, depths, page_size, repeats):
+    base = select(table.c.issue_ID, table.c.submission_timestamp).order_by(*LIST_ORDER)
+    print(f"\n{'depth':>10} {'offset ms':>12} {'keyset ms':>12}")
+    with engine.connect() as conn:
+        for depth in depths:
+            offset_ms, offset_rows = time_page(conn, base.offset(depth).limit(page_size), repeats)
+
+            # The cursor a client would hold after paging to this depth is
+            # the last row of the previous page
+            if depth == 0:
+                keyset_statement = base.limit(page_size)
+            else:
+                anchor = conn.execute(base.offset(depth - 1).limit(1)).first()
+                keyset_statement = base.where(descending_keyset(
+                    table.c.submission_timestamp, table.c.issue_ID,
+                    (anchor.submission_timestamp, anchor.issue_ID)
+                )).limit(page_size)
+            keyset_ms, keyset_rows = time_page(conn, keyset_statement, repeats)
+
+            if [r.issue_ID for r in offset_rows] != [r.issue_ID for r in keyset_rows]:
+                print(f"❌ Page mismatch at depth {depth}")
+            print(f"{depth:>10,} {offset_ms:>12.2f} {keyset_ms:>12.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="Database URL (default: temporary SQLite file)")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--depths", default="0,1000,10000,100000,500000,900000")
+    parser.add_argument("--skip-seed", action="store_true", help="Reuse rows already in --url")
+    args = parser.parse_args()
+
+    url = args.url
+    if url is None:
+        url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'pagination.db')}"
+    engine = create_engine(url)
+
+    if not args.skip_seed:
+        seed(engine, args.rows)
+
+    depths = [int(d) for d in args.depths.split(",") if int(d) < args.rows]
+    run(engine, depths, args.page_size, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
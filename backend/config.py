@@ -38,11 +38,96 @@ class Settings(BaseSettings):
     @property
     def DB_POOL_RECYCLE(self) -> int:
         return 3600  # 1 hour for local dev
+
+    # Only probe pooled connections that have sat idle longer than this
+    DB_LIVENESS_IDLE_SECONDS: int = 30
+
+    # Circuit breaker - fail fast with 503 while the database is unreachable
+    DB_BREAKER_FAILURE_THRESHOLD: int = 3
+    DB_BREAKER_RECOVERY_SECONDS: float = 2.0
+    DB_BREAKER_MAX_RECOVERY_SECONDS: float = 30.0
+    # Requests let through at a time while half-open, before one succeeds
+    DB_BREAKER_HALF_OPEN_TRIALS: int = 1
+
+    # /health serves a snapshot refreshed in the background at this interval
+    HEALTH_CHECK_INTERVAL_SECONDS: float = 5.0
+
+    # Per-request SQL instrumentation - warn when one statement shape repeats this often
+    N_PLUS_ONE_THRESHOLD: int = 5
     # JWT
     SECRET_KEY: str = os.getenv("SECRET_KEY", "your-super-secret-key-change-this-in-production")
     ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
-    
+    # Access tokens are not checked against the stored scope version, so
+    # their lifetime bounds how long scope claims can lag a room or hall change
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+
+    # Password hashing pool - bcrypt runs off the event loop in a bounded pool
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32
+
+    # Verified-token cache - entries never outlive the token's own exp claim
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    TOKEN_CACHE_TTL_SECONDS: int = 300
+
+    # Principal cache - user id, role and student/hall scope per token subject
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 120
+
+    # Upper bound on issue IDs accepted by one bulk status change
+    BULK_STATUS_MAX_IDS: int = 500
+
+    # Changes feed - page size cap, how far back a token may be re-read for
+    # late commits, and how long deletes stay visible to it
+    CHANGES_MAX_LIMIT: int = 1000
+    CHANGES_SETTLE_SECONDS: int = 5
+    CHANGES_TOMBSTONE_RETENTION_DAYS: int = 30
+
+    # Bulk import - rows per executemany batch, error rows kept in the report,
+    # request bodies held in memory before spilling to a temp file
+    IMPORT_CHUNK_SIZE: int = 1000
+    IMPORT_MAX_ERRORS: int = 1000
+    IMPORT_SPOOL_BYTES: int = 4 * 1024 * 1024
+
+    # Lookup registry - Category/Status/Specialty snapshot reload interval
+    LOOKUP_REGISTRY_TTL_SECONDS: int = 300
+
+    # Topology - Hall/Room snapshot reload interval
+    TOPOLOGY_TTL_SECONDS: int = 300
+
+    # List ETags - per-scope watermark cache (TTL bounds cross-worker staleness)
+    LIST_WATERMARK_TTL_SECONDS: int = 2
+    LIST_WATERMARK_MAX_SCOPES: int = 5000
+
+    # Event stream - per-connection buffer (overflow evicts), replay buffer
+    # for Last-Event-ID resume, keep-alive interval and client retry hint
+    EVENT_STREAM_QUEUE_SIZE: int = 100
+    EVENT_STREAM_REPLAY_SIZE: int = 1000
+    EVENT_STREAM_HEARTBEAT_SECONDS: int = 15
+    EVENT_STREAM_RETRY_MS: int = 3000
+
+    # Officer workload - how often each worker checks whether a new week of
+    # hours has started (the rollover itself runs once per week)
+    WORKLOAD_ROLLOVER_CHECK_SECONDS: int = 3600
+
+    # Dispatch - automatic assignment of pending requests to maintenance
+    # officers. New submissions are dispatched as they arrive; the whole
+    # backlog is swept every DISPATCH_INTERVAL_SECONDS.
+    DISPATCH_ENABLED: bool = True
+    DISPATCH_INTERVAL_SECONDS: int = 60
+    DISPATCH_MAX_ACTIVE_PER_OFFICER: int = 5
+    DISPATCH_MAX_HOURS_PER_WEEK: float = 40.0
+    # One priority level counts as this many hours of waiting
+    DISPATCH_PRIORITY_STEP_HOURS: float = 24.0
+    # Requests per transaction when applying a dispatch
+    DISPATCH_BATCH_SIZE: int = 500
+    # Specialty for categories with no specialty of the same name
+    DISPATCH_FALLBACK_SPECIALTY: str = "General Maintenance"
+
+    # Reference cache - serialized student/room/category/status used to build responses
+    REFERENCE_CACHE_MAX_ENTRIES: int = 20000
+    REFERENCE_CACHE_TTL_SECONDS: int = 600
+
     # CORS - Environment-aware origins
     @computed_field
     @property
@@ -107,6 +192,22 @@ class Settings(BaseSettings):
         url = f"{driver}://{self.DB_USER}:{password}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}?charset={self.DB_CHARSET}&{ssl_params}"
         print(f"🔗 DATABASE_URL: {url}")  # Debug print to verify URL
         return url
+
+    # Async database access - comma separated router names served through
+    # AsyncSession instead of the threadpool (e.g. "maintenance-requests,users")
+    ASYNC_DB_ROUTERS: str = ""
+
+    @computed_field
+    @property
+    def ASYNC_DB_ROUTERS_LIST(self) -> List[str]:
+        return [name.strip() for name in self.ASYNC_DB_ROUTERS.split(',') if name.strip()]
+
+    @computed_field
+    @property
+    def ASYNC_DATABASE_URL(self) -> str:
+        """Same database as DATABASE_URL, through the aiomysql driver"""
+        password = quote_plus(self.DB_PASSWORD)
+        return f"mysql+aiomysql://{self.DB_USER}:{password}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}?charset={self.DB_CHARSET}"
     
     class Config:
         env_file = ".env"
@@ -0,0 +1,230 @@
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional, Set
+
+from sqlalchemy import delete, exists, insert, select, update
+from sqlalchemy.orm import Session
+
+from models.models import ActiveRequests, Category, Hall, MaintenanceRequest, Room, Status, Student, User
+from services.lookup_registry import lookup_registry
+from services.topology import topology
+from crud.officer_workload_crud import request_activity_statement, request_removed_statement
+
+# active_requests holds every Maintenance_Request column under the same name
+# plus these, denormalized from the related tables. Each write path that can
+# add, change or drop an open request updates it in the same transaction,
+# without reading anything back:
+#   create        -> insert_active_statement (values already in hand)
+#   update/status -> sync_update_statements (UPDATE ... FROM the request row)
+#   delete        -> remove_active_statements
+#   import        -> materialize_missing_statement (INSERT ... SELECT)
+# rebuild_active_requests reconciles anything that slipped past them, such
+# as a student or hall renamed after its requests were materialized.
+REQUEST_COLUMNS = tuple(column.key for column in MaintenanceRequest.__table__.columns)
+
+DENORMALIZED = {
+    "category_name": Category.category_name,
+    "status_name": Status.status_name,
+    "room_number": Room.room_number,
+    "floor_number": Room.floor_number,
+    "hall_ID": Room.hall_ID,
+    "hall_name": Hall.hall_name,
+    "student_number": Student.student_number,
+    "student_name": User.name,
+    "student_email": User.email,
+}
+
+MATERIALIZED_COLUMNS = REQUEST_COLUMNS + tuple(DENORMALIZED)
+
+# Rows re-materialized per statement by a rebuild
+REBUILD_BATCH_SIZE = 1000
+
+# The active list is read newest first, like the main listing
+ACTIVE_ORDER = (ActiveRequests.submission_timestamp.desc(), ActiveRequests.issue_ID.desc())
+
+
+def active_source(issue_ids: Optional[List[int]] = None, after_id: Optional[int] = None):
+    """SELECT of what active_requests should hold, joined from the source tables.
+
+    Restricted to ``issue_ids`` or to requests above ``after_id`` when given.
+    """
+    statement = select(
+        *(getattr(MaintenanceRequest, name) for name in REQUEST_COLUMNS),
+        *(column.label(name) for name, column in DENORMALIZED.items()),
+    ).select_from(MaintenanceRequest) \
+        .join(Student, MaintenanceRequest.student_ID == Student.student_ID) \
+        .join(User, Student.user_ID == User.id) \
+        .join(Room, MaintenanceRequest.room_ID == Room.room_ID) \
+        .join(Hall, Room.hall_ID == Hall.hall_ID) \
+        .join(Category, MaintenanceRequest.category_ID == Category.category_ID) \
+        .join(Status, MaintenanceRequest.status_ID == Status.status_ID) \
+        .where(MaintenanceRequest.status_ID.in_(lookup_registry.active_status_ids()))
+    if issue_ids is not None:
+        statement = statement.where(MaintenanceRequest.issue_ID.in_(issue_ids))
+    if after_id is not None:
+        statement = statement.where(MaintenanceRequest.issue_ID > after_id)
+    return statement
+
+
+def insert_active_statement(row: dict, student: dict):
+    """INSERT for a just-created request, or None if its status is not active.
+
+    Built from the inserted values, the cached student and the in-memory
+    room, category and status, so nothing is read back.
+    """
+    if row["status_ID"] not in lookup_registry.active_status_ids():
+        return None
+    room = topology.room(row["room_ID"])
+    values = {name: row[name] for name in REQUEST_COLUMNS}
+    values.update(
+        category_name=lookup_registry.category(row["category_ID"]).category_name,
+        status_name=lookup_registry.status(row["status_ID"]).status_name,
+        room_number=room.room_number,
+        floor_number=room.floor_number,
+        hall_ID=room.hall_ID,
+        hall_name=room.hall.hall_name,
+        student_number=student["student_number"],
+        student_name=student["user"]["name"],
+        student_email=student["user"]["email"],
+    )
+    return insert(ActiveRequests).values(**values)
+
+
+def remove_active_statements(issue_id: int) -> list:
+    """Statements to run before deleting a request: its officers' workload
+    first, while active_requests still shows whether it was active"""
+    return [
+        request_removed_statement(issue_id),
+        delete(ActiveRequests).where(ActiveRequests.issue_ID == issue_id)
+        .execution_options(synchronize_session=False),
+    ]
+
+
+def materialize_missing_statement(issue_ids: Optional[List[int]] = None, after_id: Optional[int] = None):
+    """INSERT ... SELECT of the active requests (among ``issue_ids`` or above
+    ``after_id``) that have no row yet"""
+    source = active_source(issue_ids=issue_ids, after_id=after_id).where(
+        ~exists().where(ActiveRequests.issue_ID == MaintenanceRequest.issue_ID)
+    )
+    return insert(ActiveRequests.__table__).from_select(MATERIALIZED_COLUMNS, source)
+
+
+def sync_update_statements(issue_ids: List[int], values: dict) -> list:
+    """Statements that carry an UPDATE of ``values`` on these requests over to
+    active_requests; run them after it, in the same transaction.
+
+    Rows that stay active copy every request column back from
+    Maintenance_Request in one UPDATE ... FROM, which also picks up
+    server-side values such as last_updated. A status change drops the rows
+    when the new status is not active, and otherwise adds any that were not
+    active before; either way the officers assigned to requests that enter
+    or leave the active set have their workload moved first.
+    """
+    status_id = values.get("status_ID")
+    if status_id is not None and status_id not in lookup_registry.active_status_ids():
+        return [
+            request_activity_statement(issue_ids, becoming_active=False),
+            delete(ActiveRequests).where(ActiveRequests.issue_ID.in_(issue_ids))
+            .execution_options(synchronize_session=False),
+        ]
+
+    active, source = ActiveRequests.__table__, MaintenanceRequest.__table__
+    copied = {active.c[name]: source.c[name] for name in REQUEST_COLUMNS if name != "issue_ID"}
+    if status_id is not None:
+        copied[active.c.status_name] = lookup_registry.status(status_id).status_name
+    if values.get("category_ID") is not None:
+        copied[active.c.category_name] = lookup_registry.category(values["category_ID"]).category_name
+    statements = [request_activity_statement(issue_ids, becoming_active=True)] if status_id is not None else []
+    statements += [
+        update(active)
+        .where(active.c.issue_ID == source.c.issue_ID, active.c.issue_ID.in_(issue_ids))
+        .values(copied)
+    ]
+    if status_id is not None:
+        statements.append(materialize_missing_statement(issue_ids=issue_ids))
+    return statements
+
+
+def present_statement(issue_ids: List[int]):
+    return select(ActiveRequests.issue_ID).where(ActiveRequests.issue_ID.in_(issue_ids))
+
+
+def refresh_statements(source_rows: list, present_ids: Set[int]) -> list:
+    """(statement, parameters) pairs that bring the active rows of some requests
+    in line with ``source_rows`` (their active_source rows).
+
+    Rows still active are updated in place so priority_level and created_at
+    survive; the rest are deleted or inserted.
+    """
+    wanted = {row.issue_ID: dict(row._mapping) for row in source_rows}
+    gone = [issue_id for issue_id in present_ids if issue_id not in wanted]
+    changed = [values for issue_id, values in wanted.items() if issue_id in present_ids]
+    added = [values for issue_id, values in wanted.items() if issue_id not in present_ids]
+
+    statements = []
+    if gone:
+        statements.append((
+            delete(ActiveRequests).where(ActiveRequests.issue_ID.in_(gone))
+            .execution_options(synchronize_session=False),
+            None,
+        ))
+    if changed:
+        # Bulk UPDATE by primary key, one executemany
+        statements.append((update(ActiveRequests), changed))
+    if added:
+        statements.append((insert(ActiveRequests), added))
+    return statements
+
+
+def refresh_active_requests(db: Session, issue_ids: Iterable[int]) -> None:
+    """Re-materialize the active rows of ``issue_ids`` in the caller's transaction"""
+    ids = list(issue_ids)
+    if not ids:
+        return
+    source = db.execute(active_source(issue_ids=ids)).all()
+    present = set(db.execute(present_statement(ids)).scalars())
+    for statement, parameters in refresh_statements(source, present):
+        db.execute(statement, parameters)
+
+
+def active_requests_statement():
+    """The whole active list; one read of active_requests along idx_active_submitted"""
+    return select(ActiveRequests).order_by(*ACTIVE_ORDER)
+
+
+@dataclass
+class ActiveDrift:
+    """Requests whose active_requests row is missing, out of date or should not exist"""
+    missing: List[int] = field(default_factory=list)
+    stale: List[int] = field(default_factory=list)
+    extra: List[int] = field(default_factory=list)
+
+    @property
+    def issue_ids(self) -> List[int]:
+        return self.missing + self.stale + self.extra
+
+    def __bool__(self) -> bool:
+        return bool(self.missing or self.stale or self.extra)
+
+
+def verify_active_requests(db: Session) -> ActiveDrift:
+    """Compare active_requests against the source tables without changing anything"""
+    expected = {row.issue_ID: tuple(row) for row in db.execute(active_source())}
+    actual = {
+        row.issue_ID: tuple(row)
+        for row in db.execute(select(*(getattr(ActiveRequests, name) for name in MATERIALIZED_COLUMNS)))
+    }
+    return ActiveDrift(
+        missing=sorted(expected.keys() - actual.keys()),
+        stale=sorted(issue_id for issue_id in expected.keys() & actual.keys() if expected[issue_id] != actual[issue_id]),
+        extra=sorted(actual.keys() - expected.keys()),
+    )
+
+
+def rebuild_active_requests(db: Session) -> ActiveDrift:
+    """Repair every drifted row of active_requests and commit; returns what was found"""
+    drift = verify_active_requests(db)
+    ids = drift.issue_ids
+    for start in range(0, len(ids), REBUILD_BATCH_SIZE):
+        refresh_active_requests(db, ids[start:start + REBUILD_BATCH_SIZE])
+    db.commit()
+    return drift
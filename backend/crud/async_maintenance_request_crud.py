@@ -0,0 +1,222 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Tuple
+from datetime import datetime
+from models.models import MaintenanceRequest
+from schemas.schemas import MaintenanceRequestCreate, MaintenanceRequestUpdate
+from crud.maintenance_request_crud import (
+    RESPONSE_GRAPH, LIST_ORDER, maintenance_request_projection, new_maintenance_request, request_row,
+    conditional_update, publish_update, StaleVersion, HydratedRequest, hydrate, hydrate_all, in_hall, tombstone,
+    sync_cursors, changes_statements, collect_changes, MaterializedRequest, materialize_all
+)
+from crud.active_request_crud import (
+    insert_active_statement, sync_update_statements, remove_active_statements, active_requests_statement
+)
+from services.lookup_registry import lookup_registry, PENDING, COMPLETED
+from services.request_references import get_reference_async, get_references_async
+from services.topology import topology
+from services.watermark import requests_changed
+from services.event_bus import publish_request_event
+from services.dispatch import dispatcher
+from crud.pagination import descending_keyset
+
+# AsyncSession cannot lazy-load during response serialization; the shared
+# loader strategy brings in the student with the request row and the rest
+# is hydrated from the lookup registry and topology snapshot. Those reads
+# reload synchronously when a snapshot is due or misses an ID, so the async
+# path brings them up to date in the threadpool first (snapshots_ready).
+def _requests_statement():
+    return select(MaintenanceRequest).options(*RESPONSE_GRAPH)
+
+async def snapshots_ready(room_ids=(), category_ids=(), status_ids=()) -> None:
+    """Reload, off the event loop, the lookup registry or topology snapshot
+    if it is due or lacks one of these IDs; reads afterwards stay in memory"""
+    await lookup_registry.require_async(category_ids, status_ids)
+    await topology.require_async(room_ids)
+
+async def _rows_ready(rows, students=True) -> None:
+    room_ids = [row.room_ID for row in rows]
+    if students:
+        room_ids += [row.student.room_ID for row in rows if row.student is not None]
+    await snapshots_ready(
+        room_ids=room_ids,
+        category_ids=[row.category_ID for row in rows],
+        status_ids=[row.status_ID for row in rows],
+    )
+
+async def _all(db: AsyncSession, statement) -> List[HydratedRequest]:
+    result = await db.execute(statement)
+    rows = result.scalars().all()
+    await _rows_ready(rows)
+    return hydrate_all(rows)
+
+async def get_maintenance_request(db: AsyncSession, request_id: int) -> Optional[HydratedRequest]:
+    """Get a single maintenance request by ID with related data"""
+    result = await db.execute(
+        _requests_statement().where(MaintenanceRequest.issue_ID == request_id)
+    )
+    row = result.scalars().first()
+    if row is not None:
+        await _rows_ready([row])
+    return hydrate(row)
+
+async def get_maintenance_requests(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    student_id: Optional[int] = None,
+    status_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    hall_id: Optional[int] = None,
+    after: Optional[Tuple[datetime, int]] = None
+) -> List[HydratedRequest]:
+    """Get maintenance requests with optional filtering, offset or keyset paginated"""
+    await snapshots_ready()
+    statement = _requests_statement()
+
+    # Apply filters
+    if student_id is not None:
+        statement = statement.where(MaintenanceRequest.student_ID == student_id)
+    if status_id is not None:
+        statement = statement.where(MaintenanceRequest.status_ID == status_id)
+    if category_id is not None:
+        statement = statement.where(MaintenanceRequest.category_ID == category_id)
+    if hall_id is not None:
+        statement = statement.where(in_hall(hall_id))
+
+    statement = statement.order_by(*LIST_ORDER)
+    if after is not None:
+        statement = statement.where(descending_keyset(
+            MaintenanceRequest.submission_timestamp, MaintenanceRequest.issue_ID, after
+        ))
+    else:
+        statement = statement.offset(skip)
+    return await _all(db, statement.limit(limit))
+
+async def get_maintenance_request_rows(db: AsyncSession, fields: List[str], **filters) -> list:
+    """Run a sparse fieldset listing; returns rows keyed by field name"""
+    await snapshots_ready()
+    result = await db.execute(maintenance_request_projection(fields, **filters))
+    rows = result.all()
+
+    def ids(*names):
+        return [row._mapping[name] for row in rows for name in names if name in row._mapping]
+
+    # Names are filled in from the snapshots when the rows are serialized
+    await snapshots_ready(
+        room_ids=ids("room_number", "floor_number", "hall_ID", "hall_name"),
+        category_ids=ids("category_name"),
+        status_ids=ids("status_name"),
+    )
+    return rows
+
+async def create_maintenance_request(db: AsyncSession, request: MaintenanceRequestCreate) -> dict:
+    """Create a new maintenance request, answering from the inserted values and cached references"""
+    await snapshots_ready(room_ids=[request.room_ID], category_ids=[request.category_ID])
+    db_request = new_maintenance_request(request)
+    db.add(db_request)
+    await db.flush()
+    row = request_row(db_request)
+    row["student"] = await get_reference_async(db, "student", row["student_ID"])
+    await snapshots_ready(status_ids=[row["status_ID"]])
+    row["room"] = topology.room(row["room_ID"])
+    row["category"] = lookup_registry.category(row["category_ID"])
+    row["status"] = lookup_registry.status(row["status_ID"])
+    active = insert_active_statement(row, row["student"])
+    if active is not None:
+        await db.execute(active)
+    await db.commit()
+    requests_changed()
+    publish_request_event(
+        "request.created", row["issue_ID"], row["student_ID"], row["room_ID"], row["status_ID"], row["version"]
+    )
+    dispatcher.request_submitted(row["category_ID"])
+    return row
+
+async def update_maintenance_request(
+    db: AsyncSession,
+    request_id: int,
+    request_update: MaintenanceRequestUpdate,
+    expected_version: Optional[int] = None
+) -> Optional[HydratedRequest]:
+    """Conditional single-statement update; None if missing, StaleVersion on conflict"""
+    update_data = request_update.dict(exclude_unset=True)
+    await snapshots_ready(
+        room_ids=[update_data.get("room_ID")],
+        category_ids=[update_data.get("category_ID")],
+        status_ids=[update_data.get("status_ID")],
+    )
+    result = await db.execute(conditional_update(request_id, update_data, expected_version))
+    if result.rowcount:
+        for statement in sync_update_statements([request_id], update_data):
+            await db.execute(statement)
+    await db.commit()
+    requests_changed()
+
+    db_request = await get_maintenance_request(db, request_id)
+    if result.rowcount == 0 and db_request is not None:
+        raise StaleVersion(db_request)
+    if db_request is not None:
+        publish_update(db_request, update_data)
+    return db_request
+
+async def delete_maintenance_request(db: AsyncSession, request_id: int) -> bool:
+    """Delete a maintenance request, leaving a tombstone for the changes feed"""
+    await snapshots_ready()
+    db_request = await db.get(MaintenanceRequest, request_id)
+    if db_request:
+        # Read before commit expires them
+        student_id, room_id = db_request.student_ID, db_request.room_ID
+        db.add(tombstone(db_request))
+        for statement in remove_active_statements(request_id):
+            await db.execute(statement)
+        await db.delete(db_request)
+        await db.commit()
+        requests_changed()
+        publish_request_event("request.deleted", request_id, student_id, room_id)
+        return True
+    return False
+
+async def get_request_changes(
+    db: AsyncSession,
+    since: Optional[Tuple[Tuple[datetime, int], Tuple[datetime, int]]],
+    limit: int = 100,
+    student_id: Optional[int] = None,
+    hall_id: Optional[int] = None
+):
+    """Requests created, updated or deleted since a sync token; ExpiredSyncToken if too old"""
+    await snapshots_ready()
+    changed_after, deleted_after = sync_cursors(since)
+    changed, deleted = changes_statements(changed_after, deleted_after, limit, student_id, hall_id)
+    changed_rows = (await db.execute(changed)).scalars().all()
+    deleted_rows = (await db.execute(deleted)).scalars().all()
+    await _rows_ready(changed_rows)
+    return collect_changes(changed_rows, deleted_rows, changed_after, deleted_after, limit)
+
+async def get_active_requests(db: AsyncSession) -> List[MaterializedRequest]:
+    """Get all active maintenance requests, read from the active_requests table alone"""
+    await snapshots_ready()
+    rows = (await db.execute(active_requests_statement())).scalars().all()
+    await _rows_ready(rows, students=False)
+    return materialize_all(rows, await get_references_async(db, "student", (row.student_ID for row in rows)))
+
+async def get_requests_by_hall(db: AsyncSession, hall_id: int) -> List[HydratedRequest]:
+    """Get all maintenance requests for a specific hall"""
+    await snapshots_ready()
+    return await _all(db, _requests_statement().where(in_hall(hall_id)))
+
+async def get_requests_by_student(db: AsyncSession, student_id: int) -> List[HydratedRequest]:
+    """Get all maintenance requests for a specific student"""
+    return await _all(db, _requests_statement().where(MaintenanceRequest.student_ID == student_id))
+
+async def get_pending_requests(db: AsyncSession) -> List[HydratedRequest]:
+    """Get all pending maintenance requests"""
+    await snapshots_ready()
+    pending = lookup_registry.status_id(PENDING)
+    return await _all(db, _requests_statement().where(MaintenanceRequest.status_ID == pending))
+
+async def get_completed_requests(db: AsyncSession) -> List[HydratedRequest]:
+    """Get all completed maintenance requests"""
+    await snapshots_ready()
+    completed = lookup_registry.status_id(COMPLETED)
+    return await _all(db, _requests_statement().where(MaintenanceRequest.status_ID == completed))
@@ -0,0 +1,59 @@
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from models.models import User, UserRole
+from schemas.schemas import UserCreate, UserUpdate
+from services.principal import invalidate_principal
+
+async def get_user(db: AsyncSession, user_id: int) -> Optional[User]:
+    return await db.get(User, user_id)
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
+
+async def get_users(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    role: Optional[UserRole] = None,
+    after_id: Optional[int] = None
+) -> List[User]:
+    statement = select(User)
+    if role:
+        statement = statement.where(User.role == role)
+    # Keyset pagination on id when a cursor is given, offset otherwise
+    statement = statement.order_by(User.id)
+    if after_id is not None:
+        statement = statement.where(User.id > after_id)
+    else:
+        statement = statement.offset(skip)
+    result = await db.execute(statement.limit(limit))
+    return list(result.scalars().all())
+
+async def create_user(db: AsyncSession, user: UserCreate) -> User:
+    db_user = User(**user.dict())
+    db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+async def update_user(db: AsyncSession, user_id: int, user_update: UserUpdate) -> Optional[User]:
+    db_user = await get_user(db, user_id)
+    if db_user:
+        update_data = user_update.dict(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_user, field, value)
+        await db.commit()
+        await db.refresh(db_user)
+        invalidate_principal(user_id)
+    return db_user
+
+async def delete_user(db: AsyncSession, user_id: int) -> bool:
+    db_user = await get_user(db, user_id)
+    if db_user:
+        await db.delete(db_user)
+        await db.commit()
+        invalidate_principal(user_id)
+        return True
+    return False
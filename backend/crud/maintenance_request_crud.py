@@ -1,17 +1,104 @@
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_
-from typing import List, Optional
-from models.models import MaintenanceRequest, Student, Room, Category, Status
+from sqlalchemy import and_, delete, or_, select, update
+from typing import Dict, Iterator, List, Optional, Tuple
+from datetime import datetime, timedelta
+from config import settings
+from models.models import MaintenanceRequest, MaintenanceRequestTombstone, Student, User
 from schemas.schemas import MaintenanceRequestCreate, MaintenanceRequestUpdate
+from crud.pagination import ascending_keyset, descending_keyset, encode_cursor
+from services.request_references import get_reference, get_references
+from services.lookup_registry import lookup_registry, PENDING, COMPLETED
+from services.topology import topology
+from services.watermark import requests_changed
+from services.event_bus import publish_request_event
+from services.dispatch import dispatcher
+from crud.active_request_crud import (
+    insert_active_statement, sync_update_statements, remove_active_statements, active_requests_statement
+)
 
-def get_maintenance_request(db: Session, request_id: int) -> Optional[MaintenanceRequest]:
+# Loader strategy for the MaintenanceRequest response graph. Of the nested
+# objects only student.user is joined (both many-to-one, so a page of any
+# size loads in one query). Rooms and halls come from the topology snapshot
+# and category/status from the lookup registry (see HydratedRequest).
+RESPONSE_GRAPH = (
+    joinedload(MaintenanceRequest.student).joinedload(Student.user),
+)
+
+class _Hydrated:
+    """Wraps a loaded row; attributes not set on the wrapper read through to it"""
+    __slots__ = ("_row",)
+
+    def __init__(self, row):
+        self._row = row
+
+    def __getattr__(self, name):
+        return getattr(self._row, name)
+
+class HydratedStudent(_Hydrated):
+    """A loaded Student with its room from the topology snapshot"""
+    __slots__ = ("room",)
+
+    def __init__(self, row: Student):
+        super().__init__(row)
+        self.room = topology.room(row.room_ID)
+
+class HydratedRequest(_Hydrated):
+    """A loaded MaintenanceRequest with its reference data filled in from memory.
+
+    Category and status come from the lookup registry, the room (and the
+    student's room) with its hall from the topology snapshot. Every other
+    attribute reads through to the row, so it serializes as a
+    MaintenanceRequest response and route code can treat it like one.
+    """
+    __slots__ = ("category", "status", "room", "student")
+
+    def __init__(self, row: MaintenanceRequest):
+        super().__init__(row)
+        self.category = lookup_registry.category(row.category_ID)
+        self.status = lookup_registry.status(row.status_ID)
+        self.room = topology.room(row.room_ID)
+        self.student = HydratedStudent(row.student)
+
+class MaterializedRequest(_Hydrated):
+    """An active_requests row with the same nested objects as a HydratedRequest.
+
+    The row carries every request column; the student comes from the
+    reference cache instead of a join.
+    """
+    __slots__ = ("category", "status", "room", "student")
+
+    def __init__(self, row, student: dict):
+        super().__init__(row)
+        self.category = lookup_registry.category(row.category_ID)
+        self.status = lookup_registry.status(row.status_ID)
+        self.room = topology.room(row.room_ID)
+        self.student = student
+
+def hydrate(row: Optional[MaintenanceRequest]) -> Optional[HydratedRequest]:
+    return HydratedRequest(row) if row is not None else None
+
+def hydrate_all(rows: List[MaintenanceRequest]) -> List[HydratedRequest]:
+    return [HydratedRequest(row) for row in rows]
+
+def _requests_query(db: Session):
+    """Base query for maintenance requests with the full response graph loaded"""
+    return db.query(MaintenanceRequest).options(*RESPONSE_GRAPH)
+
+def _requests_statement():
+    return select(MaintenanceRequest).options(*RESPONSE_GRAPH)
+
+# Listings are ordered newest first on (submission_timestamp, issue_ID), which
+# is also the keyset used by cursor pagination
+LIST_ORDER = (MaintenanceRequest.submission_timestamp.desc(), MaintenanceRequest.issue_ID.desc())
+CURSOR_FIELDS = ("submission_timestamp", "issue_ID")
+
+def in_hall(hall_id: int):
+    """Hall scope as a room_ID IN (...) filter, so no Room join is needed"""
+    return MaintenanceRequest.room_ID.in_(topology.room_ids(hall_id))
+
+def get_maintenance_request(db: Session, request_id: int) -> Optional[HydratedRequest]:
     """Get a single maintenance request by ID with related data"""
-    return db.query(MaintenanceRequest).options(
-        joinedload(MaintenanceRequest.student),
-        joinedload(MaintenanceRequest.room),
-        joinedload(MaintenanceRequest.category),
-        joinedload(MaintenanceRequest.status)
-    ).filter(MaintenanceRequest.issue_ID == request_id).first()
+    return hydrate(_requests_query(db).filter(MaintenanceRequest.issue_ID == request_id).first())
 
 def get_maintenance_requests(
     db: Session, 
@@ -20,15 +107,16 @@ def get_maintenance_requests(
     student_id: Optional[int] = None,
     status_id: Optional[int] = None,
     category_id: Optional[int] = None,
-    hall_id: Optional[int] = None
-) -> List[MaintenanceRequest]:
-    """Get maintenance requests with optional filtering"""
-    query = db.query(MaintenanceRequest).options(
-        joinedload(MaintenanceRequest.student),
-        joinedload(MaintenanceRequest.room),
-        joinedload(MaintenanceRequest.category),
-        joinedload(MaintenanceRequest.status)
-    )
+    hall_id: Optional[int] = None,
+    after: Optional[Tuple[datetime, int]] = None
+) -> List[HydratedRequest]:
+    """Get maintenance requests with optional filtering.
+
+    Pass ``after`` (a decoded cursor) for keyset pagination; page depth then
+    costs nothing and concurrent inserts never shift the window. ``skip`` is
+    kept for offset paging and ignored when ``after`` is given.
+    """
+    query = _requests_query(db)
     
     # Apply filters
     if student_id is not None:
@@ -38,88 +126,475 @@ def get_maintenance_requests(
     if category_id is not None:
         query = query.filter(MaintenanceRequest.category_ID == category_id)
     if hall_id is not None:
-        query = query.join(Room).filter(Room.hall_ID == hall_id)
+        query = query.filter(in_hall(hall_id))
     
-    return query.offset(skip).limit(limit).all()
+    query = query.order_by(*LIST_ORDER)
+    if after is not None:
+        query = query.filter(descending_keyset(
+            MaintenanceRequest.submission_timestamp, MaintenanceRequest.issue_ID, after
+        ))
+    else:
+        query = query.offset(skip)
+    return hydrate_all(query.limit(limit).all())
+
+# Flat columns a sparse fieldset listing can ask for, keyed by response field
+# name, with the related table (if any) each one needs joined in
+PROJECTION_FIELDS = {
+    "issue_ID": (MaintenanceRequest.issue_ID, None),
+    "student_ID": (MaintenanceRequest.student_ID, None),
+    "room_ID": (MaintenanceRequest.room_ID, None),
+    "category_ID": (MaintenanceRequest.category_ID, None),
+    "status_ID": (MaintenanceRequest.status_ID, None),
+    "description": (MaintenanceRequest.description, None),
+    "availability": (MaintenanceRequest.availability, None),
+    "submission_timestamp": (MaintenanceRequest.submission_timestamp, None),
+    "last_updated": (MaintenanceRequest.last_updated, None),
+    "completion_timestamp": (MaintenanceRequest.completion_timestamp, None),
+    "estimated_cost": (MaintenanceRequest.estimated_cost, None),
+    "actual_cost": (MaintenanceRequest.actual_cost, None),
+    # Selected as IDs and filled in from the lookup registry and topology
+    "category_name": (MaintenanceRequest.category_ID, None),
+    "status_name": (MaintenanceRequest.status_ID, None),
+    "room_number": (MaintenanceRequest.room_ID, None),
+    "floor_number": (MaintenanceRequest.room_ID, None),
+    "hall_ID": (MaintenanceRequest.room_ID, None),
+    "hall_name": (MaintenanceRequest.room_ID, None),
+    "student_number": (Student.student_number, "student"),
+    "student_name": (User.name, "user"),
+}
+
+# What a dashboard row needs; served by view=summary
+SUMMARY_FIELDS = ("issue_ID", "status_name", "category_name", "hall_name", "room_number", "submission_timestamp")
+
+_ROOM_FIELDS = {
+    "room_number": lambda room: room.room_number,
+    "floor_number": lambda room: room.floor_number,
+    "hall_ID": lambda room: room.hall_ID,
+    "hall_name": lambda room: room.hall.hall_name,
+}
+
+def hydrate_projection(row) -> dict:
+    """Projection row as a dict with names resolved from the registry and topology"""
+    values = dict(row._mapping)
+    if "category_name" in values:
+        values["category_name"] = lookup_registry.category(values["category_name"]).category_name
+    if "status_name" in values:
+        values["status_name"] = lookup_registry.status(values["status_name"]).status_name
+    for name, attribute in _ROOM_FIELDS.items():
+        if name in values:
+            values[name] = attribute(topology.room(values[name]))
+    return values
+
+# Joins in dependency order: user hangs off student
+_PROJECTION_JOINS = (
+    ("student", Student, MaintenanceRequest.student_ID == Student.student_ID, ()),
+    ("user", User, Student.user_ID == User.id, ("student",)),
+)
+
+def _projection_select(names: List[str]):
+    """SELECT of the named PROJECTION_FIELDS joining only the tables they need"""
+    needed = {PROJECTION_FIELDS[name][1] for name in names} - {None}
+    for table_name, _, _, requires in _PROJECTION_JOINS:
+        if table_name in needed:
+            needed.update(requires)
 
-def create_maintenance_request(db: Session, request: MaintenanceRequestCreate) -> MaintenanceRequest:
-    """Create a new maintenance request"""
-    db_request = MaintenanceRequest(**request.dict())
+    statement = select(
+        *(PROJECTION_FIELDS[name][0].label(name) for name in names)
+    ).select_from(MaintenanceRequest)
+    for table_name, table, on_clause, _ in _PROJECTION_JOINS:
+        if table_name in needed:
+            statement = statement.join(table, on_clause)
+    return statement
+
+def maintenance_request_projection(
+    fields: List[str],
+    skip: int = 0,
+    limit: int = 100,
+    student_id: Optional[int] = None,
+    status_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    hall_id: Optional[int] = None,
+    after: Optional[Tuple[datetime, int]] = None
+):
+    """Column-level SELECT for a sparse fieldset listing.
+
+    Same filtering, ordering and pagination as get_maintenance_requests, but
+    only the requested columns are selected and only the tables they live in
+    are joined; no ORM entities are built. issue_ID and submission_timestamp
+    are always selected because they make up the page cursor.
+    """
+    names = list(dict.fromkeys(["issue_ID", "submission_timestamp", *fields]))
+    statement = _projection_select(names)
+
+    if student_id is not None:
+        statement = statement.where(MaintenanceRequest.student_ID == student_id)
+    if status_id is not None:
+        statement = statement.where(MaintenanceRequest.status_ID == status_id)
+    if category_id is not None:
+        statement = statement.where(MaintenanceRequest.category_ID == category_id)
+    if hall_id is not None:
+        statement = statement.where(in_hall(hall_id))
+
+    statement = statement.order_by(*LIST_ORDER)
+    if after is not None:
+        statement = statement.where(descending_keyset(
+            MaintenanceRequest.submission_timestamp, MaintenanceRequest.issue_ID, after
+        ))
+    else:
+        statement = statement.offset(skip)
+    return statement.limit(limit)
+
+def get_maintenance_request_rows(db: Session, fields: List[str], **filters) -> list:
+    """Run a sparse fieldset listing; returns rows keyed by field name"""
+    return db.execute(maintenance_request_projection(fields, **filters)).all()
+
+# Every flat field, in declaration order; the column set of an export
+EXPORT_FIELDS = tuple(PROJECTION_FIELDS)
+
+def stream_maintenance_requests(
+    db: Session,
+    student_id: Optional[int] = None,
+    status_id: Optional[int] = None,
+    category_id: Optional[int] = None,
+    hall_id: Optional[int] = None,
+    submitted_from: Optional[datetime] = None,
+    submitted_to: Optional[datetime] = None,
+    batch_size: int = 1000
+) -> Iterator:
+    """Yield flat export rows in issue_ID order without materializing them.
+
+    Uses a server-side cursor fetched ``batch_size`` rows at a time, so
+    memory stays flat however many rows match.
+    """
+    statement = _projection_select(list(EXPORT_FIELDS))
+    if student_id is not None:
+        statement = statement.where(MaintenanceRequest.student_ID == student_id)
+    if status_id is not None:
+        statement = statement.where(MaintenanceRequest.status_ID == status_id)
+    if category_id is not None:
+        statement = statement.where(MaintenanceRequest.category_ID == category_id)
+    if hall_id is not None:
+        statement = statement.where(in_hall(hall_id))
+    if submitted_from is not None:
+        statement = statement.where(MaintenanceRequest.submission_timestamp >= submitted_from)
+    if submitted_to is not None:
+        statement = statement.where(MaintenanceRequest.submission_timestamp < submitted_to)
+
+    statement = statement.order_by(MaintenanceRequest.issue_ID) \
+        .execution_options(stream_results=True, yield_per=batch_size)
+    yield from db.execute(statement)
+
+def new_maintenance_request(request: MaintenanceRequestCreate) -> MaintenanceRequest:
+    """Build a request row with its timestamps set client-side.
+
+    Setting them here instead of relying on the server default means the
+    inserted row is fully known after the INSERT and never needs a refresh.
+    TIMESTAMP columns keep whole seconds, so microseconds are dropped to
+    match what is stored.
+    """
+    now = datetime.now().replace(microsecond=0)
+    return MaintenanceRequest(
+        **request.dict(),
+        status_ID=lookup_registry.status_id(PENDING),
+        version=1,
+        submission_timestamp=now,
+        last_updated=now,
+    )
+
+def request_row(db_request: MaintenanceRequest) -> dict:
+    """Column values of a request row, read before commit expires them"""
+    return {column.key: getattr(db_request, column.key) for column in MaintenanceRequest.__table__.columns}
+
+def create_maintenance_request(db: Session, request: MaintenanceRequestCreate) -> dict:
+    """Create a new maintenance request.
+
+    The INSERTs into Maintenance_Request and active_requests are the only
+    statements when the student is cached: the response is assembled from
+    the inserted values plus the cached student and in-memory room,
+    category and status instead of re-selecting the row with joins.
+    """
+    db_request = new_maintenance_request(request)
     db.add(db_request)
+    db.flush()
+    row = request_row(db_request)
+    row["student"] = get_reference(db, "student", row["student_ID"])
+    row["room"] = topology.room(row["room_ID"])
+    row["category"] = lookup_registry.category(row["category_ID"])
+    row["status"] = lookup_registry.status(row["status_ID"])
+    active = insert_active_statement(row, row["student"])
+    if active is not None:
+        db.execute(active)
     db.commit()
-    db.refresh(db_request)
-    
-    # Fetch with related data
-    return get_maintenance_request(db, db_request.issue_ID)
+    requests_changed()
+    publish_request_event(
+        "request.created", row["issue_ID"], row["student_ID"], row["room_ID"], row["status_ID"], row["version"]
+    )
+    dispatcher.request_submitted(row["category_ID"])
+    return row
+
+class StaleVersion(Exception):
+    """The request changed since the version the caller based its update on"""
+
+    def __init__(self, current: HydratedRequest):
+        super().__init__(f"Maintenance request {current.issue_ID} is at version {current.version}")
+        self.current = current
+
+def conditional_update(request_id: int, values: dict, expected_version: Optional[int] = None):
+    """Single UPDATE that applies ``values`` and bumps the version.
+
+    With ``expected_version`` the row only changes if nobody else updated it
+    first; a rowcount of 0 then means either a missing row or a conflict.
+    """
+    statement = update(MaintenanceRequest).where(MaintenanceRequest.issue_ID == request_id)
+    if expected_version is not None:
+        statement = statement.where(MaintenanceRequest.version == expected_version)
+    return statement.values(**values, version=MaintenanceRequest.version + 1) \
+        .execution_options(synchronize_session=False)
+
+def publish_update(db_request, update_data: dict) -> None:
+    event_type = "request.status_changed" if "status_ID" in update_data else "request.updated"
+    publish_request_event(
+        event_type, db_request.issue_ID, db_request.student_ID, db_request.room_ID,
+        db_request.status_ID, db_request.version
+    )
 
 def update_maintenance_request(
     db: Session, 
     request_id: int, 
-    request_update: MaintenanceRequestUpdate
-) -> Optional[MaintenanceRequest]:
-    """Update an existing maintenance request"""
+    request_update: MaintenanceRequestUpdate,
+    expected_version: Optional[int] = None
+) -> Optional[HydratedRequest]:
+    """Update an existing maintenance request.
+
+    Returns None if the request does not exist and raises StaleVersion if
+    ``expected_version`` no longer matches.
+    """
+    update_data = request_update.dict(exclude_unset=True)
+    result = db.execute(conditional_update(request_id, update_data, expected_version))
+    if result.rowcount:
+        for statement in sync_update_statements([request_id], update_data):
+            db.execute(statement)
+    db.commit()
+    requests_changed()
+
+    # The re-read doubles as the response and, when nothing matched, tells
+    # a missing row apart from a version conflict
     db_request = get_maintenance_request(db, request_id)
-    if db_request:
-        update_data = request_update.dict(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(db_request, field, value)
-        db.commit()
-        db.refresh(db_request)
-        
-        # Return with fresh related data
-        return get_maintenance_request(db, request_id)
-    return None
+    if result.rowcount == 0 and db_request is not None:
+        raise StaleVersion(db_request)
+    if db_request is not None:
+        publish_update(db_request, update_data)
+    return db_request
+
+def bulk_update_status(
+    db: Session,
+    issue_ids: List[int],
+    status_id: int,
+    student_id: Optional[int] = None,
+    hall_id: Optional[int] = None
+) -> Dict[int, Tuple[str, Optional[int]]]:
+    """Move many requests to ``status_id`` with one set-based UPDATE.
+
+    ``student_id``/``hall_id`` restrict which requests may change, as
+    resolved by the caller's role scope. Returns {issue_ID: (outcome,
+    new version)} with outcome "updated", "not_found" or "forbidden". The
+    classifying SELECT locks the rows so the UPDATE changes exactly the set
+    it reported.
+    """
+    ids = list(dict.fromkeys(issue_ids))
+    rows = db.execute(
+        select(MaintenanceRequest.issue_ID, MaintenanceRequest.student_ID, MaintenanceRequest.version, MaintenanceRequest.room_ID)
+        .where(MaintenanceRequest.issue_ID.in_(ids))
+        .with_for_update()
+    ).all()
+
+    hall_rooms = set(topology.room_ids(hall_id)) if hall_id is not None else None
+    outcomes = {issue_id: ("not_found", None) for issue_id in ids}
+    eligible = []
+    for row in rows:
+        if (student_id is not None and row.student_ID != student_id) or \
+           (hall_rooms is not None and row.room_ID not in hall_rooms):
+            outcomes[row.issue_ID] = ("forbidden", None)
+        else:
+            outcomes[row.issue_ID] = ("updated", row.version + 1)
+            eligible.append(row)
+
+    if eligible:
+        values = {"status_ID": status_id}
+        if status_id == lookup_registry.status_id(COMPLETED):
+            values["completion_timestamp"] = datetime.now()
+        db.execute(
+            update(MaintenanceRequest)
+            .where(MaintenanceRequest.issue_ID.in_([row.issue_ID for row in eligible]))
+            .values(**values, version=MaintenanceRequest.version + 1)
+            .execution_options(synchronize_session=False)
+        )
+        for statement in sync_update_statements([row.issue_ID for row in eligible], values):
+            db.execute(statement)
+    db.commit()
+    if eligible:
+        requests_changed()
+    for row in eligible:
+        publish_request_event(
+            "request.status_changed", row.issue_ID, row.student_ID, row.room_ID, status_id, row.version + 1
+        )
+    return outcomes
+
+def tombstone(db_request: MaintenanceRequest) -> MaintenanceRequestTombstone:
+    """Record of a deleted request for the changes feed, added in the delete's transaction"""
+    return MaintenanceRequestTombstone(
+        issue_ID=db_request.issue_ID,
+        student_ID=db_request.student_ID,
+        room_ID=db_request.room_ID,
+        deleted_at=datetime.now().replace(microsecond=0),
+    )
 
 def delete_maintenance_request(db: Session, request_id: int) -> bool:
-    """Delete a maintenance request"""
-    db_request = get_maintenance_request(db, request_id)
+    """Delete a maintenance request, leaving a tombstone for the changes feed"""
+    db_request = db.get(MaintenanceRequest, request_id)
     if db_request:
+        # Read before commit expires them
+        student_id, room_id = db_request.student_ID, db_request.room_ID
+        db.add(tombstone(db_request))
+        for statement in remove_active_statements(request_id):
+            db.execute(statement)
         db.delete(db_request)
         db.commit()
+        requests_changed()
+        publish_request_event("request.deleted", request_id, student_id, room_id)
         return True
     return False
 
-def get_active_requests(db: Session) -> List[MaintenanceRequest]:
-    """Get all active maintenance requests (not completed)"""
-    return db.query(MaintenanceRequest).options(
-        joinedload(MaintenanceRequest.student),
-        joinedload(MaintenanceRequest.room),
-        joinedload(MaintenanceRequest.category),
-        joinedload(MaintenanceRequest.status)
-    ).filter(MaintenanceRequest.status_ID != 4).all()  # Assuming status_ID 4 is "Completed"
+class ExpiredSyncToken(Exception):
+    """The token predates the tombstone retention window; the client must resync"""
+
+# Start of time for a first sync
+_SYNC_EPOCH = (datetime(1970, 1, 1), 0)
 
-def get_requests_by_hall(db: Session, hall_id: int) -> List[MaintenanceRequest]:
+def _settled_horizon() -> datetime:
+    """Changes stamped before this are assumed committed.
+
+    Timestamps are taken before commit (and have whole-second resolution),
+    so a token never moves past the last CHANGES_SETTLE_SECONDS; rows in
+    that window are sent again on the next call rather than missed.
+    """
+    return datetime.now().replace(microsecond=0) - timedelta(seconds=settings.CHANGES_SETTLE_SECONDS)
+
+def sync_cursors(since: Optional[Tuple[Tuple[datetime, int], Tuple[datetime, int]]]):
+    """(changed cursor, deleted cursor) to read from, given a decoded token or None"""
+    if since is None:
+        # A first sync gets every request but only deletes from now on
+        return _SYNC_EPOCH, (_settled_horizon(), 0)
+    changed_after, deleted_after = since
+    if deleted_after[0] < datetime.now() - timedelta(days=settings.CHANGES_TOMBSTONE_RETENTION_DAYS):
+        raise ExpiredSyncToken()
+    return changed_after, deleted_after
+
+def changes_statements(
+    changed_after: Tuple[datetime, int],
+    deleted_after: Tuple[datetime, int],
+    limit: int,
+    student_id: Optional[int] = None,
+    hall_id: Optional[int] = None
+):
+    """SELECTs for the next page of changed requests and of tombstones.
+
+    Both walk their (timestamp, issue_ID) index oldest first and fetch one
+    row past ``limit`` to tell whether more remain.
+    """
+    changed = _requests_statement()
+    deleted = select(MaintenanceRequestTombstone)
+    if student_id is not None:
+        changed = changed.where(MaintenanceRequest.student_ID == student_id)
+        deleted = deleted.where(MaintenanceRequestTombstone.student_ID == student_id)
+    if hall_id is not None:
+        changed = changed.where(in_hall(hall_id))
+        deleted = deleted.where(MaintenanceRequestTombstone.room_ID.in_(topology.room_ids(hall_id)))
+    if changed_after != _SYNC_EPOCH:
+        changed = changed.where(ascending_keyset(
+            MaintenanceRequest.last_updated, MaintenanceRequest.issue_ID, changed_after
+        ))
+    deleted = deleted.where(ascending_keyset(
+        MaintenanceRequestTombstone.deleted_at, MaintenanceRequestTombstone.issue_ID, deleted_after
+    ))
+    changed = changed.order_by(MaintenanceRequest.last_updated, MaintenanceRequest.issue_ID).limit(limit + 1)
+    deleted = deleted.order_by(MaintenanceRequestTombstone.deleted_at, MaintenanceRequestTombstone.issue_ID) \
+        .limit(limit + 1)
+    return changed, deleted
+
+def _advance(rows: list, cursor: Tuple[datetime, int], limit: int, timestamp: str, horizon: datetime):
+    """Trim to ``limit`` and move the cursor past what was returned"""
+    if len(rows) > limit:
+        rows = rows[:limit]
+        return rows, (getattr(rows[-1], timestamp), rows[-1].issue_ID), True
+    # Everything after the cursor was read, so it can jump to the settled
+    # horizon; an idle token still advances and never ages out
+    return rows, max(cursor, (horizon, 0)), False
+
+def collect_changes(changed: list, deleted: list, changed_after, deleted_after, limit: int):
+    """(changed requests, tombstones, next token, has_more) from one page of rows"""
+    horizon = _settled_horizon()
+    changed, changed_after, more_changed = _advance(changed, changed_after, limit, "last_updated", horizon)
+    deleted, deleted_after, more_deleted = _advance(deleted, deleted_after, limit, "deleted_at", horizon)
+    token = encode_cursor(*changed_after, *deleted_after)
+    return hydrate_all(changed), deleted, token, more_changed or more_deleted
+
+def get_request_changes(
+    db: Session,
+    since: Optional[Tuple[Tuple[datetime, int], Tuple[datetime, int]]],
+    limit: int = 100,
+    student_id: Optional[int] = None,
+    hall_id: Optional[int] = None
+):
+    """Requests created, updated or deleted since a sync token.
+
+    Raises ExpiredSyncToken when deletes older than the tombstone retention
+    could have been missed.
+    """
+    changed_after, deleted_after = sync_cursors(since)
+    changed, deleted = changes_statements(changed_after, deleted_after, limit, student_id, hall_id)
+    return collect_changes(
+        db.execute(changed).scalars().all(),
+        db.execute(deleted).scalars().all(),
+        changed_after, deleted_after, limit
+    )
+
+def prune_tombstones(db: Session, older_than_days: Optional[int] = None) -> int:
+    """Drop tombstones past the retention window; returns how many"""
+    days = settings.CHANGES_TOMBSTONE_RETENTION_DAYS if older_than_days is None else older_than_days
+    result = db.execute(
+        delete(MaintenanceRequestTombstone)
+        .where(MaintenanceRequestTombstone.deleted_at < datetime.now() - timedelta(days=days))
+    )
+    db.commit()
+    return result.rowcount
+
+def materialize_all(rows: list, students: Dict[int, dict]) -> List[MaterializedRequest]:
+    return [MaterializedRequest(row, students[row.student_ID]) for row in rows]
+
+def get_active_requests(db: Session) -> List[MaterializedRequest]:
+    """Get all active maintenance requests (pending, assigned, in progress, under review).
+
+    Read from the active_requests table alone; students are filled in from
+    the reference cache, loading any misses in one query.
+    """
+    rows = db.execute(active_requests_statement()).scalars().all()
+    return materialize_all(rows, get_references(db, "student", (row.student_ID for row in rows)))
+
+def get_requests_by_hall(db: Session, hall_id: int) -> List[HydratedRequest]:
     """Get all maintenance requests for a specific hall"""
-    return db.query(MaintenanceRequest).options(
-        joinedload(MaintenanceRequest.student),
-        joinedload(MaintenanceRequest.room),
-        joinedload(MaintenanceRequest.category),
-        joinedload(MaintenanceRequest.status)
-    ).join(Room).filter(Room.hall_ID == hall_id).all()
-
-def get_requests_by_student(db: Session, student_id: int) -> List[MaintenanceRequest]:
+    return hydrate_all(_requests_query(db).filter(in_hall(hall_id)).all())
+
+def get_requests_by_student(db: Session, student_id: int) -> List[HydratedRequest]:
     """Get all maintenance requests for a specific student"""
-    return db.query(MaintenanceRequest).options(
-        joinedload(MaintenanceRequest.student),
-        joinedload(MaintenanceRequest.room),
-        joinedload(MaintenanceRequest.category),
-        joinedload(MaintenanceRequest.status)
-    ).filter(MaintenanceRequest.student_ID == student_id).all()
-
-def get_pending_requests(db: Session) -> List[MaintenanceRequest]:
+    return hydrate_all(_requests_query(db).filter(MaintenanceRequest.student_ID == student_id).all())
+
+def get_pending_requests(db: Session) -> List[HydratedRequest]:
     """Get all pending maintenance requests"""
-    return db.query(MaintenanceRequest).options(
-        joinedload(MaintenanceRequest.student),
-        joinedload(MaintenanceRequest.room),
-        joinedload(MaintenanceRequest.category),
-        joinedload(MaintenanceRequest.status)
-    ).filter(MaintenanceRequest.status_ID == 1).all()  # Assuming status_ID 1 is "Pending"
-
-def get_completed_requests(db: Session) -> List[MaintenanceRequest]:
+    pending = lookup_registry.status_id(PENDING)
+    return hydrate_all(_requests_query(db).filter(MaintenanceRequest.status_ID == pending).all())
+
+def get_completed_requests(db: Session) -> List[HydratedRequest]:
     """Get all completed maintenance requests"""
-    return db.query(MaintenanceRequest).options(
-        joinedload(MaintenanceRequest.student),
-        joinedload(MaintenanceRequest.room),
-        joinedload(MaintenanceRequest.category),
-        joinedload(MaintenanceRequest.status)
-    ).filter(MaintenanceRequest.status_ID == 4).all()  # Assuming status_ID 4 is "Completed"
+    completed = lookup_registry.status_id(COMPLETED)
+    return hydrate_all(_requests_query(db).filter(MaintenanceRequest.status_ID == completed).all())
@@ -0,0 +1,136 @@
+from collections import Counter
+from datetime import datetime
+from decimal import Decimal
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.orm import Session
+
+from models.models import MaintenanceOfficer, OfficerAssignment, OfficerWorkload
+from schemas.schemas import AssignmentCompletion, OfficerAssignmentCreate, OfficerAssignmentUpdate
+from crud.officer_workload_crud import adjust_workload_statement, new_workload, ZERO_HOURS
+
+def get_assignment(db: Session, assignment_id: int) -> Optional[OfficerAssignment]:
+    """Get a single officer assignment by ID"""
+    return db.get(OfficerAssignment, assignment_id)
+
+def get_assignments(
+    db: Session,
+    officer_id: Optional[int] = None,
+    issue_id: Optional[int] = None,
+    open_only: bool = False,
+    skip: int = 0,
+    limit: int = 100
+) -> List[OfficerAssignment]:
+    """Get officer assignments, newest first, with optional filtering"""
+    statement = select(OfficerAssignment)
+    if officer_id is not None:
+        statement = statement.where(OfficerAssignment.officer_ID == officer_id)
+    if issue_id is not None:
+        statement = statement.where(OfficerAssignment.issue_ID == issue_id)
+    if open_only:
+        statement = statement.where(OfficerAssignment.actual_completion_date.is_(None))
+    statement = statement.order_by(OfficerAssignment.assignment_ID.desc()).offset(skip).limit(limit)
+    return db.execute(statement).scalars().all()
+
+def get_officer_by_user(db: Session, user_id: int) -> Optional[MaintenanceOfficer]:
+    return db.execute(select(MaintenanceOfficer).where(MaintenanceOfficer.user_ID == user_id)).scalars().first()
+
+def open_assignment(db: Session, issue_id: int, officer_id: int, **values) -> OfficerAssignment:
+    """Add an assignment and count it against the officer, without committing"""
+    db_assignment = OfficerAssignment(
+        issue_ID=issue_id, officer_ID=officer_id, hours_at_week_start=ZERO_HOURS, **values
+    )
+    db.add(db_assignment)
+    db.flush()
+    result = db.execute(adjust_workload_statement(officer_id, issue_id, opened=1))
+    if result.rowcount == 0:
+        # First assignment of an officer with no workload row yet; the
+        # recount includes the one just flushed
+        db.add(new_workload(db, officer_id))
+    return db_assignment
+
+def open_assignments(db: Session, pairs: Sequence[Tuple[int, int]]) -> None:
+    """open_assignment for many (issue_ID, officer_ID) pairs at once, without committing.
+
+    One executemany INSERT and one executemany UPDATE of the officers'
+    counters. Every request must be active (the dispatcher only assigns
+    Pending ones), so each new assignment counts without checking.
+    """
+    if not pairs:
+        return
+    db.execute(
+        insert(OfficerAssignment),
+        [{"issue_ID": issue_id, "officer_ID": officer_id, "hours_at_week_start": ZERO_HOURS} for issue_id, officer_id in pairs],
+    )
+    opened = Counter(officer_id for _, officer_id in pairs)
+    tracked = set(db.execute(
+        select(OfficerWorkload.officer_ID).where(OfficerWorkload.officer_ID.in_(list(opened)))
+    ).scalars())
+    table = OfficerWorkload.__table__
+    if tracked:
+        db.execute(
+            update(table).where(table.c.officer_ID == bindparam("b_officer_ID"))
+            .values(active_assignments=table.c.active_assignments + bindparam("b_opened")),
+            [{"b_officer_ID": officer_id, "b_opened": opened[officer_id]} for officer_id in tracked],
+        )
+    for officer_id in opened.keys() - tracked:
+        db.add(new_workload(db, officer_id))
+
+def create_assignment(db: Session, assignment: OfficerAssignmentCreate) -> OfficerAssignment:
+    """Assign an officer to a maintenance request"""
+    values = assignment.dict()
+    db_assignment = open_assignment(db, values.pop("issue_ID"), values.pop("officer_ID"), **values)
+    db.commit()
+    db.refresh(db_assignment)
+    return db_assignment
+
+def update_assignment(
+    db: Session,
+    assignment_id: int,
+    assignment_update: OfficerAssignmentUpdate
+) -> Optional[OfficerAssignment]:
+    """Update an assignment, moving its officer's workload by the difference.
+
+    Setting actual_completion_date takes the assignment off the officer's
+    active count (clearing it puts it back); a new hours_worked adds the
+    change to this week's hours.
+    """
+    db_assignment = db.execute(
+        select(OfficerAssignment).where(OfficerAssignment.assignment_ID == assignment_id)
+        .with_for_update().execution_options(populate_existing=True)
+    ).scalars().first()
+    if db_assignment is None:
+        return None
+
+    update_data = assignment_update.dict(exclude_unset=True)
+    opened = 0
+    if "actual_completion_date" in update_data:
+        was_open = db_assignment.actual_completion_date is None
+        opened = int(update_data["actual_completion_date"] is None) - int(was_open)
+    hours = ZERO_HOURS
+    if "hours_worked" in update_data:
+        hours = Decimal(update_data["hours_worked"] or 0) - Decimal(db_assignment.hours_worked or 0)
+
+    for field, value in update_data.items():
+        setattr(db_assignment, field, value)
+    if opened or hours:
+        db.flush()
+        result = db.execute(adjust_workload_statement(db_assignment.officer_ID, db_assignment.issue_ID, opened, hours))
+        if result.rowcount == 0:
+            # No workload row to move (legacy data, or deleted since the
+            # last rebuild); the recount includes the change just flushed
+            db.add(new_workload(db, db_assignment.officer_ID))
+    db.commit()
+    db.refresh(db_assignment)
+    return db_assignment
+
+def complete_assignment(
+    db: Session,
+    assignment_id: int,
+    completion: AssignmentCompletion
+) -> Optional[OfficerAssignment]:
+    """Mark an assignment finished now, optionally recording its final hours"""
+    values = {"actual_completion_date": datetime.now().replace(microsecond=0)}
+    values.update(completion.dict(exclude_unset=True))
+    return update_assignment(db, assignment_id, OfficerAssignmentUpdate(**values))
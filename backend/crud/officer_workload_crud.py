@@ -0,0 +1,245 @@
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, bindparam, case, exists, func, or_, select, update
+from sqlalchemy.orm import Session
+
+from models.models import (
+    ActiveRequests, MaintenanceOfficer, MaintenanceRequest, OfficerAssignment, OfficerWorkload, User
+)
+from services.lookup_registry import lookup_registry
+
+# officer_workload holds one row of running counters per maintenance officer.
+# Every write that moves them applies a delta in its own transaction, so a
+# dispatcher reads O(officers) rows instead of aggregating assignments:
+#   active_assignments  assignments not yet completed whose request is
+#                       active (has an active_requests row)
+#   total_hours_week    hours logged since week_start: each assignment adds
+#                       hours_worked - hours_at_week_start
+# roll_over_week starts a new week; verify_workloads/rebuild_workloads
+# recompute both counters from Officer_Assignment and Maintenance_Request.
+
+ZERO_HOURS = Decimal("0.00")
+
+
+def week_start(now: Optional[datetime] = None) -> date:
+    """Monday of the week containing ``now``"""
+    today = (now or datetime.now()).date()
+    return today - timedelta(days=today.weekday())
+
+
+def _hours_this_week():
+    return func.coalesce(OfficerAssignment.hours_worked, 0) - OfficerAssignment.hours_at_week_start
+
+
+def _active_count(issue_id: int):
+    """1 if the request is active, else 0, as a scalar subquery"""
+    return select(func.count()).select_from(ActiveRequests) \
+        .where(ActiveRequests.issue_ID == issue_id).scalar_subquery()
+
+
+def adjust_workload_statement(officer_id: int, issue_id: int, opened: int = 0, hours=ZERO_HOURS):
+    """Apply one assignment's change to its officer's counters.
+
+    ``opened`` is +1 when the assignment stops being complete, -1 when it
+    is completed; it only counts while the request is active, which the
+    statement checks itself. ``hours`` is the change in hours_worked.
+    """
+    values = {"total_hours_week": OfficerWorkload.total_hours_week + hours}
+    if opened:
+        values["active_assignments"] = OfficerWorkload.active_assignments + opened * _active_count(issue_id)
+    return update(OfficerWorkload).where(OfficerWorkload.officer_ID == officer_id).values(**values) \
+        .execution_options(synchronize_session=False)
+
+
+def request_activity_statement(issue_ids: List[int], becoming_active: bool):
+    """Move active_assignments for the open assignments of requests entering
+    (or leaving) the active set.
+
+    Must run before active_requests itself changes: membership there is
+    what tells which of ``issue_ids`` were active until now.
+    """
+    was_active = exists().where(ActiveRequests.issue_ID == OfficerAssignment.issue_ID)
+    moving = and_(
+        OfficerAssignment.issue_ID.in_(issue_ids),
+        OfficerAssignment.actual_completion_date.is_(None),
+        ~was_active if becoming_active else was_active,
+    )
+    moved = select(func.count()).select_from(OfficerAssignment) \
+        .where(OfficerAssignment.officer_ID == OfficerWorkload.officer_ID, moving).scalar_subquery()
+    return update(OfficerWorkload) \
+        .where(OfficerWorkload.officer_ID.in_(select(OfficerAssignment.officer_ID).where(moving))) \
+        .values(active_assignments=OfficerWorkload.active_assignments + (moved if becoming_active else -moved)) \
+        .execution_options(synchronize_session=False)
+
+
+def request_removed_statement(issue_id: int):
+    """Take a request's assignments off their officers' counters before it is
+    deleted (its assignments go with it)"""
+    mine = and_(OfficerAssignment.officer_ID == OfficerWorkload.officer_ID, OfficerAssignment.issue_ID == issue_id)
+    still_open = select(func.count()).select_from(OfficerAssignment).where(
+        mine,
+        OfficerAssignment.actual_completion_date.is_(None),
+        exists().where(ActiveRequests.issue_ID == OfficerAssignment.issue_ID),
+    ).scalar_subquery()
+    hours = select(func.coalesce(func.sum(_hours_this_week()), 0)).where(mine).scalar_subquery()
+    return update(OfficerWorkload) \
+        .where(OfficerWorkload.officer_ID.in_(
+            select(OfficerAssignment.officer_ID).where(OfficerAssignment.issue_ID == issue_id)
+        )) \
+        .values(
+            active_assignments=OfficerWorkload.active_assignments - still_open,
+            total_hours_week=OfficerWorkload.total_hours_week - hours,
+        ) \
+        .execution_options(synchronize_session=False)
+
+
+def _recount_statement(officer_ids: Optional[List[int]] = None):
+    """(officer_ID, active_assignments, total_hours_week) recomputed from the
+    source tables, for every officer with at least one assignment"""
+    is_open = and_(
+        OfficerAssignment.actual_completion_date.is_(None),
+        MaintenanceRequest.status_ID.in_(lookup_registry.active_status_ids()),
+    )
+    statement = select(
+        OfficerAssignment.officer_ID,
+        func.sum(case((is_open, 1), else_=0)),
+        func.coalesce(func.sum(_hours_this_week()), 0),
+    ).join(MaintenanceRequest, OfficerAssignment.issue_ID == MaintenanceRequest.issue_ID) \
+        .group_by(OfficerAssignment.officer_ID)
+    if officer_ids is not None:
+        statement = statement.where(OfficerAssignment.officer_ID.in_(officer_ids))
+    return statement
+
+
+def _counts(rows) -> Dict[int, Tuple[int, Decimal]]:
+    return {
+        officer_id: (int(active or 0), Decimal(str(hours or 0)).quantize(ZERO_HOURS))
+        for officer_id, active, hours in rows
+    }
+
+
+def new_workload(db: Session, officer_id: int) -> OfficerWorkload:
+    """Workload row for an officer who has none yet, counted from scratch"""
+    active, hours = _counts(db.execute(_recount_statement([officer_id]))).get(officer_id, (0, ZERO_HOURS))
+    return OfficerWorkload(
+        officer_ID=officer_id,
+        active_assignments=active,
+        total_hours_week=hours,
+        week_start=week_start(),
+    )
+
+
+@dataclass
+class WorkloadDrift:
+    """Officers whose stored counters differ from a recount.
+
+    ``wrong`` maps officer_ID to ((stored active, stored hours),
+    (expected active, expected hours)); ``missing`` officers have no row.
+    """
+    wrong: Dict[int, Tuple[Tuple[int, Decimal], Tuple[int, Decimal]]] = field(default_factory=dict)
+    missing: List[int] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.wrong or self.missing)
+
+
+def verify_workloads(db: Session) -> WorkloadDrift:
+    """Recount every officer's workload and compare it with the stored counters"""
+    expected = _counts(db.execute(_recount_statement()))
+    stored = _counts(db.execute(
+        select(OfficerWorkload.officer_ID, OfficerWorkload.active_assignments, OfficerWorkload.total_hours_week)
+    ))
+    drift = WorkloadDrift()
+    for officer_id in db.execute(select(MaintenanceOfficer.officer_ID)).scalars():
+        want = expected.get(officer_id, (0, ZERO_HOURS))
+        if officer_id not in stored:
+            drift.missing.append(officer_id)
+        elif stored[officer_id] != want:
+            drift.wrong[officer_id] = (stored[officer_id], want)
+    return drift
+
+
+def rebuild_workloads(db: Session) -> WorkloadDrift:
+    """Overwrite drifted counters with a recount, add missing rows, and commit"""
+    drift = verify_workloads(db)
+    if drift.wrong:
+        table = OfficerWorkload.__table__
+        db.execute(
+            update(table).where(table.c.officer_ID == bindparam("b_officer_ID")).values(
+                active_assignments=bindparam("b_active"), total_hours_week=bindparam("b_hours")
+            ),
+            [
+                {"b_officer_ID": officer_id, "b_active": active, "b_hours": hours}
+                for officer_id, (_, (active, hours)) in drift.wrong.items()
+            ],
+        )
+    for officer_id in drift.missing:
+        db.add(new_workload(db, officer_id))
+    db.commit()
+    return drift
+
+
+def roll_over_week(db: Session, now: Optional[datetime] = None) -> int:
+    """Start a new week for every officer still counting an earlier one.
+
+    Zeroes total_hours_week and moves each of their assignments'
+    hours_at_week_start up to its current hours_worked. Idempotent, so it
+    is safe to run often and from several processes; returns how many
+    officers were rolled over.
+    """
+    current = week_start(now)
+    behind = db.execute(
+        select(OfficerWorkload.officer_ID)
+        .where(or_(OfficerWorkload.week_start.is_(None), OfficerWorkload.week_start < current))
+        .with_for_update()
+    ).scalars().all()
+    if behind:
+        db.execute(
+            update(OfficerAssignment)
+            .where(OfficerAssignment.officer_ID.in_(behind))
+            .values(hours_at_week_start=func.coalesce(OfficerAssignment.hours_worked, 0))
+            .execution_options(synchronize_session=False)
+        )
+        db.execute(
+            update(OfficerWorkload)
+            .where(OfficerWorkload.officer_ID.in_(behind))
+            .values(total_hours_week=0, week_start=current)
+            .execution_options(synchronize_session=False)
+        )
+    db.commit()
+    return len(behind)
+
+
+def get_officer_workloads(db: Session, specialty_id: Optional[int] = None) -> List[dict]:
+    """Every officer's counters with name and specialty, least loaded first.
+
+    One read of officer_workload joined to its officer; hours still counted
+    against a week that has ended read as zero until the rollover runs.
+    """
+    statement = select(
+        OfficerWorkload, MaintenanceOfficer.specialty_ID, User.name
+    ).join(MaintenanceOfficer, OfficerWorkload.officer_ID == MaintenanceOfficer.officer_ID) \
+        .join(User, MaintenanceOfficer.user_ID == User.id) \
+        .order_by(OfficerWorkload.active_assignments, OfficerWorkload.total_hours_week, OfficerWorkload.officer_ID)
+    if specialty_id is not None:
+        statement = statement.where(MaintenanceOfficer.specialty_ID == specialty_id)
+
+    current = week_start()
+    workloads = []
+    for workload, officer_specialty, name in db.execute(statement):
+        stale = workload.week_start is None or workload.week_start < current
+        workloads.append({
+            "officer_ID": workload.officer_ID,
+            "officer_name": name,
+            "specialty_ID": officer_specialty,
+            "specialty_name": lookup_registry.specialty(officer_specialty).specialty_name,
+            "active_assignments": workload.active_assignments or 0,
+            "total_hours_week": ZERO_HOURS if stale else workload.total_hours_week,
+            "availability_status": workload.availability_status,
+            "week_start": current if stale else workload.week_start,
+            "last_updated": workload.last_updated,
+        })
+    return workloads
@@ -0,0 +1,86 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from sqlalchemy import tuple_
+
+
+class InvalidCursor(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def encode_cursor(*values: Any) -> str:
+    """Encode keyset values into an opaque, URL-safe cursor"""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+    if not isinstance(values, list):
+        raise InvalidCursor(f"Invalid cursor: {cursor}")
+    return values
+
+
+def decode_request_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a (submission_timestamp, issue_ID) maintenance request cursor"""
+    values = decode_cursor(cursor)
+    try:
+        timestamp, issue_id = values
+        return datetime.fromisoformat(timestamp), int(issue_id)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+def decode_id_cursor(cursor: str) -> int:
+    """Decode a single-id cursor"""
+    values = decode_cursor(cursor)
+    try:
+        (value,) = values
+        return int(value)
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid cursor: {cursor}") from e
+
+
+def decode_sync_token(token: str) -> Tuple[Tuple[datetime, int], Tuple[datetime, int]]:
+    """Decode a changes feed token: (changed cursor, deleted cursor)"""
+    values = decode_cursor(token)
+    try:
+        changed_at, changed_id, deleted_at, deleted_id = values
+        return (
+            (datetime.fromisoformat(changed_at), int(changed_id)),
+            (datetime.fromisoformat(deleted_at), int(deleted_id)),
+        )
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Invalid sync token: {token}") from e
+
+
+def ascending_keyset(timestamp_column, id_column, after: Tuple[datetime, int]):
+    """Rows strictly after ``after`` in (timestamp ASC, id ASC) order"""
+    timestamp, row_id = after
+    return tuple_(timestamp_column, id_column) > tuple_(timestamp, row_id)
+
+
+def descending_keyset(timestamp_column, id_column, after: Tuple[datetime, int]):
+    """Rows strictly after ``after`` in (timestamp DESC, id DESC) order.
+
+    A row-value comparison lets MySQL (and SQLite) turn this into a single
+    range scan on the (timestamp, id) index; the equivalent OR expansion
+    falls back to filtering the whole index.
+    """
+    timestamp, row_id = after
+    return tuple_(timestamp_column, id_column) < tuple_(timestamp, row_id)
+
+
+def next_cursor(rows: list, limit: int, *attributes: str) -> Optional[str]:
+    """Cursor for the page after ``rows``, or None when this was the last page"""
+    if limit <= 0 or len(rows) < limit:
+        return None
+    last = rows[-1]
+    return encode_cursor(*(getattr(last, attribute) for attribute in attributes))
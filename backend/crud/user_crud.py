@@ -3,6 +3,7 @@ from sqlalchemy import and_, or_
 from typing import List, Optional
 from models.models import User, UserRole
 from schemas.schemas import UserCreate, UserUpdate
+from services.principal import invalidate_principal
 
 def get_user(db: Session, user_id: int) -> Optional[User]:
     return db.query(User).filter(User.id == user_id).first()
@@ -10,11 +11,23 @@ def get_user(db: Session, user_id: int) -> Optional[User]:
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
     return db.query(User).filter(User.email == email).first()
 
-def get_users(db: Session, skip: int = 0, limit: int = 100, role: Optional[UserRole] = None) -> List[User]:
+def get_users(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    role: Optional[UserRole] = None,
+    after_id: Optional[int] = None
+) -> List[User]:
     query = db.query(User)
     if role:
         query = query.filter(User.role == role)
-    return query.offset(skip).limit(limit).all()
+    # Keyset pagination on id when a cursor is given, offset otherwise
+    query = query.order_by(User.id)
+    if after_id is not None:
+        query = query.filter(User.id > after_id)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
 
 def create_user(db: Session, user: UserCreate) -> User:
     db_user = User(**user.dict())
@@ -31,6 +44,7 @@ def update_user(db: Session, user_id: int, user_update: UserUpdate) -> Optional[
             setattr(db_user, field, value)
         db.commit()
         db.refresh(db_user)
+        invalidate_principal(user_id)
     return db_user
 
 def delete_user(db: Session, user_id: int) -> bool:
@@ -38,5 +52,6 @@ def delete_user(db: Session, user_id: int) -> bool:
     if db_user:
         db.delete(db_user)
         db.commit()
+        invalidate_principal(user_id)
         return True
     return False
\ No newline at end of file
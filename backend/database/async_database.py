@@ -0,0 +1,74 @@
+from sqlalchemy import event
+from sqlalchemy.exc import DisconnectionError, OperationalError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from starlette.exceptions import HTTPException
+import logging
+from config import settings
+from database.instrumentation import install_query_instrumentation
+from database.database import (
+    mark_new_connection, mark_connection_returned, ping_connection,
+    db_circuit_breaker, DatabaseUnavailable
+)
+
+logger = logging.getLogger(__name__)
+
+# The async engine is created on first use so the aiomysql driver is only
+# required when a router is actually switched to the async path.
+_async_engine = None
+_AsyncSessionLocal = None
+
+def get_async_engine():
+    """Return the shared async engine, creating it on first use"""
+    global _async_engine, _AsyncSessionLocal
+    if _async_engine is None:
+        _async_engine = create_async_engine(
+            settings.ASYNC_DATABASE_URL,
+            echo=False,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+            pool_timeout=20,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            connect_args={"connect_timeout": settings.DB_CONNECTION_TIMEOUT},
+        )
+        # Same idle-aware liveness probing as the sync engine
+        event.listen(_async_engine.sync_engine, "connect", mark_new_connection)
+        event.listen(_async_engine.sync_engine, "checkin", mark_connection_returned)
+        event.listen(_async_engine.sync_engine, "checkout", ping_connection)
+        install_query_instrumentation(_async_engine.sync_engine)
+        # Sessions never expire attributes on commit, so nothing lazy-loads
+        # (and blocks) after a write
+        _AsyncSessionLocal = async_sessionmaker(_async_engine, expire_on_commit=False, autoflush=False)
+        logger.info("Async database engine created")
+    return _async_engine
+
+async def get_async_db():
+    """Dependency yielding an AsyncSession"""
+    if not db_circuit_breaker.allow_request():
+        raise DatabaseUnavailable()
+
+    get_async_engine()
+    async with _AsyncSessionLocal() as db:
+        try:
+            yield db
+        except (DisconnectionError, OperationalError) as e:
+            logger.error(f"Database connection error: {e}")
+            db_circuit_breaker.record_failure()
+            raise DatabaseUnavailable() from e
+        except HTTPException:
+            db_circuit_breaker.record_success()
+            raise
+        except SQLAlchemyError as e:
+            logger.error(f"SQLAlchemy error: {e}")
+            db_circuit_breaker.release()
+            await db.rollback()
+            raise e
+        except Exception:
+            db_circuit_breaker.release()
+            raise
+        else:
+            db_circuit_breaker.record_success()
+
+async def dispose_async_engine():
+    """Close pooled async connections on shutdown"""
+    if _async_engine is not None:
+        await _async_engine.dispose()
@@ -0,0 +1,131 @@
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Process-wide circuit breaker guarding access to the database.
+
+    closed:    requests flow normally; consecutive failures are counted.
+    open:      requests fail fast; a background thread probes the database
+               with exponential backoff until it answers again.
+    half_open: the probe succeeded; up to ``half_open_trials`` requests at a
+               time are let through and the rest still fail fast. The
+               first success closes the circuit, the first failure
+               re-opens it.
+    """
+
+    def __init__(
+        self,
+        probe: Callable[[], bool],
+        failure_threshold: int = 3,
+        recovery_seconds: float = 2.0,
+        max_recovery_seconds: float = 30.0,
+        half_open_trials: int = 1,
+        name: str = "database",
+    ):
+        self.probe = probe
+        self.failure_threshold = failure_threshold
+        self.recovery_seconds = recovery_seconds
+        self.max_recovery_seconds = max_recovery_seconds
+        self.half_open_trials = half_open_trials
+        self.name = name
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._trials = 0
+        self._opened_at: Optional[float] = None
+        self._probe_thread: Optional[threading.Thread] = None
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        return self._state
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._state == OPEN or (
+                self._state == HALF_OPEN and self._trials >= self.half_open_trials
+            ):
+                self.rejected += 1
+                return False
+            if self._state == HALF_OPEN:
+                self._trials += 1
+            return True
+
+    def release(self) -> None:
+        """End an admitted request that neither succeeded nor failed against
+        the database, freeing its half-open trial slot"""
+        with self._lock:
+            if self._state == HALF_OPEN and self._trials > 0:
+                self._trials -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            if self._state == HALF_OPEN:
+                self._state = CLOSED
+                self._trials = 0
+                self._opened_at = None
+                logger.info(f"Circuit '{self.name}' closed, {self.name} recovered")
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or (
+                self._state == CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._trip()
+
+    def _trip(self) -> None:
+        """Open the circuit and start probing for recovery (lock held)"""
+        self._state = OPEN
+        self._trials = 0
+        self._opened_at = time.time()
+        self.times_opened += 1
+        logger.error(f"Circuit '{self.name}' opened after {self._failures} consecutive failures")
+        if self._probe_thread is None:
+            self._probe_thread = threading.Thread(
+                target=self._probe_until_recovered,
+                name=f"{self.name}-circuit-probe",
+                daemon=True,
+            )
+            self._probe_thread.start()
+
+    def _probe_until_recovered(self) -> None:
+        delay = self.recovery_seconds
+        while True:
+            time.sleep(delay)
+            try:
+                healthy = self.probe()
+            except Exception as e:
+                logger.warning(f"Circuit '{self.name}' probe raised: {e}")
+                healthy = False
+            if healthy:
+                with self._lock:
+                    self._state = HALF_OPEN
+                    self._failures = 0
+                    self._trials = 0
+                    self._probe_thread = None
+                logger.info(f"Circuit '{self.name}' half-open, letting trial requests through")
+                return
+            delay = min(delay * 2, self.max_recovery_seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "state": self._state,
+                "consecutive_failures": self._failures,
+                "half_open_trials": self._trials,
+                "opened_at": self._opened_at,
+                "times_opened": self.times_opened,
+                "rejected": self.rejected,
+            }
@@ -3,8 +3,13 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.exc import DisconnectionError, OperationalError, SQLAlchemyError
 from sqlalchemy.pool import StaticPool
+from starlette.exceptions import HTTPException
 import logging
+import threading
+import time
 from config import settings
+from database.circuit_breaker import CircuitBreaker
+from database.instrumentation import install_query_instrumentation
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -15,7 +20,7 @@ def get_engine_config():
     """Get database engine configuration based on environment"""    
     base_config = {
         "echo": False,  # Changed from settings.DEBUG to False to reduce SQL logging
-        "pool_pre_ping": True,
+        "pool_pre_ping": False,  # Liveness is handled by the idle-aware checkout probe below
         "pool_recycle": settings.DB_POOL_RECYCLE,
         "pool_timeout": 20,
         "max_overflow": settings.DB_MAX_OVERFLOW,
@@ -59,6 +64,9 @@ def get_engine_config():
 engine_config = get_engine_config()
 engine = create_engine(settings.DATABASE_URL, **engine_config)
 
+# Attribute statement counts and DB time to the current request
+install_query_instrumentation(engine)
+
 # Add connection event listeners for better error handling
 @event.listens_for(engine, "connect")
 def set_sqlite_pragma(dbapi_connection, connection_record):
@@ -73,57 +81,112 @@ def set_sqlite_pragma(dbapi_connection, connection_record):
         except Exception as e:
             logger.warning(f"Could not set MySQL session variables: {e}")
 
+# Connection liveness: a connection is only probed on checkout when it has
+# been idle in the pool longer than DB_LIVENESS_IDLE_SECONDS. Connections
+# returned moments ago are handed out without a round trip.
+class LivenessStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.probes_issued = 0
+        self.probes_saved = 0
+        self.probe_failures = 0
+
+    def record(self, probed: bool, failed: bool = False):
+        with self._lock:
+            if probed:
+                self.probes_issued += 1
+            else:
+                self.probes_saved += 1
+            if failed:
+                self.probe_failures += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "idle_threshold_seconds": settings.DB_LIVENESS_IDLE_SECONDS,
+                "probes_issued": self.probes_issued,
+                "probes_saved": self.probes_saved,
+                "probe_failures": self.probe_failures,
+            }
+
+liveness_stats = LivenessStats()
+
+@event.listens_for(engine, "connect")
+def mark_new_connection(dbapi_connection, connection_record):
+    """A freshly opened connection is known to be alive"""
+    connection_record.info["last_used"] = time.monotonic()
+
+@event.listens_for(engine, "checkin")
+def mark_connection_returned(dbapi_connection, connection_record):
+    """Remember when the connection was last in use"""
+    connection_record.info["last_used"] = time.monotonic()
+
 @event.listens_for(engine, "checkout")
 def ping_connection(dbapi_connection, connection_record, connection_proxy):
-    """Test connections before use"""
+    """Test connections that have been idle for too long before use"""
+    last_used = connection_record.info.get("last_used")
+    if last_used is not None and time.monotonic() - last_used < settings.DB_LIVENESS_IDLE_SECONDS:
+        liveness_stats.record(probed=False)
+        return
+
     try:
         dbapi_connection.ping(reconnect=False)
+        liveness_stats.record(probed=True)
     except Exception:
-        # Connection is invalid, invalidate it
+        # Connection is invalid, invalidate it so the pool opens a new one
+        liveness_stats.record(probed=True, failed=True)
         logger.warning("Database connection failed ping test, invalidating")
         raise DisconnectionError()
 
+def get_liveness_stats() -> dict:
+    """Counters of liveness probes issued versus skipped"""
+    return liveness_stats.snapshot()
+
 # Create SessionLocal class with better error handling
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Create Base class
 Base = declarative_base()
 
+class DatabaseUnavailable(Exception):
+    """Raised instead of touching the database while the circuit is open"""
+
 # Improved dependency to get database session
 def get_db():
+    # Fail fast while the database is known to be down instead of sleeping
+    # and retrying inside the request
+    if not db_circuit_breaker.allow_request():
+        raise DatabaseUnavailable()
+
     db = SessionLocal()
     try:
-        # Test the connection
-        db.execute(text("SELECT 1"))
+        # Liveness is checked on checkout, so no extra round trip here
         yield db
     except (DisconnectionError, OperationalError) as e:
         logger.error(f"Database connection error: {e}")
+        db_circuit_breaker.record_failure()
+        try:
+            db.rollback()
+        except Exception:
+            pass
+        raise DatabaseUnavailable() from e
+    except HTTPException:
+        # 404/403/412 and friends from the route; the database answered
+        db_circuit_breaker.record_success()
         db.rollback()
-        db.close()
-        
-        # Try to create a new session with exponential backoff
-        import time
-        for attempt in range(3):
-            try:
-                time.sleep(2 ** attempt)  # 0, 2, 4 seconds
-                db = SessionLocal()
-                db.execute(text("SELECT 1"))
-                logger.info(f"Database reconnected on attempt {attempt + 1}")
-                yield db
-                break
-            except Exception as retry_e:
-                if attempt == 2:  # Last attempt
-                    logger.error(f"All database reconnection attempts failed: {retry_e}")
-                    raise retry_e
-                db.close()
+        raise
     except SQLAlchemyError as e:
         logger.error(f"SQLAlchemy error: {e}")
+        db_circuit_breaker.release()
         db.rollback()
         raise e
     except Exception as e:
         logger.error(f"Unexpected database error: {e}")
+        db_circuit_breaker.release()
         db.rollback()
         raise e
+    else:
+        db_circuit_breaker.record_success()
     finally:
         try:
             db.close()
@@ -141,3 +204,13 @@ def check_database_health():
     except Exception as e:
         logger.error(f"Database health check failed: {e}")
         return False
+
+# Process-wide breaker; while open, a background thread probes with
+# check_database_health until the database answers again
+db_circuit_breaker = CircuitBreaker(
+    probe=check_database_health,
+    failure_threshold=settings.DB_BREAKER_FAILURE_THRESHOLD,
+    recovery_seconds=settings.DB_BREAKER_RECOVERY_SECONDS,
+    max_recovery_seconds=settings.DB_BREAKER_MAX_RECOVERY_SECONDS,
+    half_open_trials=settings.DB_BREAKER_HALF_OPEN_TRIALS,
+)
@@ -0,0 +1,102 @@
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    """Statement count, DB time and statement shapes seen during one request"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter = Counter()
+
+    def record(self, statement: str, duration: float) -> None:
+        with self._lock:
+            self.count += 1
+            self.duration += duration
+            # Statements are parameterized, so the SQL text is the shape
+            self.shapes[statement] += 1
+
+    def repeated_shapes(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed at least ``threshold`` times (likely N+1)"""
+        with self._lock:
+            return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.2f};desc="{self.count} queries"'
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def begin_request_stats():
+    """Start attributing statements in this context to a fresh QueryStats"""
+    stats = QueryStats()
+    return stats, _current_stats.set(stats)
+
+
+def end_request_stats(token) -> None:
+    _current_stats.reset(token)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context rather than the connection, so a
+    # statement that raises (no after_cursor_execute) leaves nothing behind
+    if context is not None:
+        context._query_start_time = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    started = getattr(context, "_query_start_time", None)
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - started if started is not None else 0.0)
+
+
+def install_query_instrumentation(engine) -> None:
+    """Attribute every statement run on ``engine`` to the current request"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def report_repeated_statements(stats: QueryStats, path: str, threshold: int) -> None:
+    """Log statement shapes repeated often enough to look like an N+1"""
+    for shape, n in stats.repeated_shapes(threshold):
+        compact = " ".join(shape.split())
+        logger.warning(f"Possible N+1 on {path}: statement ran {n} times: {compact[:200]}")
+
+
+@contextmanager
+def assert_max_queries(max_queries: int, bind):
+    """Fail if more than ``max_queries`` statements run on ``bind`` inside the block.
+
+    Listens on the engine directly rather than the request context, so it
+    also counts statements issued from TestClient's worker threads:
+
+        with assert_max_queries(2, engine):
+            client.get("/api/v1/maintenance-requests/", headers=auth)
+    """
+    stats = QueryStats()
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        stats.record(statement, 0.0)
+
+    event.listen(bind, "before_cursor_execute", count)
+    try:
+        yield stats
+    finally:
+        event.remove(bind, "before_cursor_execute", count)
+
+    if stats.count > max_queries:
+        shapes = "\n".join(f"  {n}x {' '.join(shape.split())[:150]}" for shape, n in stats.shapes.most_common())
+        raise AssertionError(f"Expected at most {max_queries} queries, got {stats.count}:\n{shapes}")
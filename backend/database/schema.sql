@@ -6,6 +6,9 @@ SET FOREIGN_KEY_CHECKS = 0;
 
 -- Drop tables if they exist (for clean setup) - in correct dependency order
 DROP TABLE IF EXISTS Audit_Log;
+DROP VIEW IF EXISTS officer_workload;
+DROP TABLE IF EXISTS officer_workload;
+DROP TABLE IF EXISTS active_requests;
 DROP TABLE IF EXISTS Officer_Assignment;
 DROP TABLE IF EXISTS Maintenance_Request;
 DROP TABLE IF EXISTS Student;
@@ -56,6 +59,9 @@ CREATE TABLE User (
     phone_number VARCHAR(20),
     password VARCHAR(255) NOT NULL,
     role ENUM('student', 'hall officer', 'maintenance officer', 'admin') NOT NULL,
+    -- Bumped whenever the user's room or hall changes; access tokens minted
+    -- at an older version must be refreshed
+    scope_version INT NOT NULL DEFAULT 0,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
 );
@@ -139,13 +145,60 @@ CREATE TABLE Maintenance_Request (
     completion_timestamp TIMESTAMP NULL,
     estimated_cost DECIMAL(10,2),
     actual_cost DECIMAL(10,2),
+    version INT NOT NULL DEFAULT 1,
     FOREIGN KEY (student_ID) REFERENCES Student(student_ID) ON DELETE RESTRICT,
     FOREIGN KEY (room_ID) REFERENCES Room(room_ID) ON DELETE RESTRICT,
     FOREIGN KEY (category_ID) REFERENCES Category(category_ID) ON DELETE RESTRICT,
     FOREIGN KEY (status_ID) REFERENCES Status(status_ID) ON DELETE RESTRICT,
     INDEX idx_status (status_ID),
     INDEX idx_category (category_ID),
-    INDEX idx_submission_date (submission_timestamp)
+    INDEX idx_submission_date (submission_timestamp, issue_ID),
+    INDEX idx_request_last_updated (last_updated, issue_ID)
+);
+
+-- Create Maintenance_Request_Tombstone table (deleted requests, for the changes feed)
+CREATE TABLE Maintenance_Request_Tombstone (
+    issue_ID INT PRIMARY KEY,
+    student_ID INT NOT NULL,
+    room_ID INT NOT NULL,
+    deleted_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_tombstone_deleted (deleted_at, issue_ID)
+);
+
+-- Create active_requests table: open requests (Pending, Assigned, In Progress,
+-- Under Review) copied with their related names, kept in step by the
+-- application on every request write. Replaces the active_requests view;
+-- `python run.py --verify-active` / `--rebuild-active` reconcile drift.
+CREATE TABLE active_requests (
+    issue_ID INT PRIMARY KEY,
+    student_ID INT NOT NULL,
+    room_ID INT NOT NULL,
+    category_ID INT NOT NULL,
+    status_ID INT NOT NULL,
+    description TEXT NOT NULL,
+    availability TEXT,
+    submission_timestamp TIMESTAMP NULL,
+    last_updated TIMESTAMP NULL,
+    completion_timestamp TIMESTAMP NULL,
+    estimated_cost DECIMAL(10,2),
+    actual_cost DECIMAL(10,2),
+    version INT NOT NULL DEFAULT 1,
+    category_name VARCHAR(50) NOT NULL,
+    status_name VARCHAR(50) NOT NULL,
+    room_number VARCHAR(10) NOT NULL,
+    floor_number INT,
+    hall_ID INT NOT NULL,
+    hall_name VARCHAR(100) NOT NULL,
+    student_number VARCHAR(20),
+    student_name VARCHAR(100) NOT NULL,
+    student_email VARCHAR(100) NOT NULL,
+    priority_level INT DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (issue_ID) REFERENCES Maintenance_Request(issue_ID) ON DELETE CASCADE,
+    INDEX idx_active_submitted (submission_timestamp, issue_ID),
+    INDEX idx_active_hall (hall_ID, submission_timestamp),
+    INDEX idx_active_student (student_ID, submission_timestamp),
+    INDEX idx_active_priority (priority_level, submission_timestamp)
 );
 
 -- Create Officer_Assignment associative table (normalized)
@@ -158,6 +211,8 @@ CREATE TABLE Officer_Assignment (
     actual_completion_date TIMESTAMP NULL,
     notes TEXT,
     hours_worked DECIMAL(5,2),
+    -- hours_worked as of the officer's last weekly rollover
+    hours_at_week_start DECIMAL(5,2) NOT NULL DEFAULT 0,
     FOREIGN KEY (issue_ID) REFERENCES Maintenance_Request(issue_ID) ON DELETE CASCADE,
     FOREIGN KEY (officer_ID) REFERENCES Maintenance_Officer(officer_ID) ON DELETE CASCADE,
     INDEX idx_assignment_date (assignment_date),
@@ -166,6 +221,20 @@ CREATE TABLE Officer_Assignment (
     UNIQUE KEY unique_active_assignment (issue_ID, officer_ID)
 );
 
+-- Running workload counters, one row per officer, kept in step by the
+-- assignment and request write paths (python run.py --verify-workload)
+CREATE TABLE officer_workload (
+    workload_id INT PRIMARY KEY AUTO_INCREMENT,
+    officer_ID INT NOT NULL UNIQUE,
+    active_assignments INT DEFAULT 0,
+    total_hours_week DECIMAL(5,2) DEFAULT 0.00,
+    availability_status VARCHAR(20) DEFAULT 'available',
+    week_start DATE,
+    last_updated TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    FOREIGN KEY (officer_ID) REFERENCES Maintenance_Officer(officer_ID) ON DELETE CASCADE,
+    INDEX idx_workload_load (active_assignments, total_hours_week)
+);
+
 -- Create Audit_Log table
 CREATE TABLE Audit_Log (
     log_ID INT PRIMARY KEY AUTO_INCREMENT,
@@ -186,7 +255,7 @@ CREATE TABLE Audit_Log (
 
 -- Create indexes for better performance
 CREATE INDEX idx_student_room ON Student(room_ID);
-CREATE INDEX idx_request_student ON Maintenance_Request(student_ID);
+CREATE INDEX idx_request_student ON Maintenance_Request(student_ID, submission_timestamp, issue_ID);
 CREATE INDEX idx_request_room ON Maintenance_Request(room_ID);
 CREATE INDEX idx_user_role ON User(role);
 CREATE INDEX idx_user_email ON User(email);
@@ -323,53 +392,16 @@ INSERT INTO Maintenance_Officer (user_ID, specialty_ID, employee_number, hire_da
 (4, 1, 'EMP001', '2024-01-15'),  -- Bob MaintenanceOfficer (user_ID 4)
 (5, 3, 'EMP002', '2024-02-01');  -- Sarah MaintenanceOfficer (user_ID 5)
 
+INSERT INTO officer_workload (officer_ID, week_start)
+SELECT officer_ID, DATE_SUB(CURDATE(), INTERVAL WEEKDAY(CURDATE()) DAY) FROM Maintenance_Officer;
+
 INSERT INTO Student (user_ID, student_number, room_ID, enrollment_date) VALUES 
 (3, 'STU2024001', 1, '2024-08-15');  -- Jane Student (user_ID 3)
 
 -- Drop existing views if they exist
-DROP VIEW IF EXISTS active_requests;
-DROP VIEW IF EXISTS officer_workload;
 DROP VIEW IF EXISTS room_maintenance_history;
 
 -- Views for common queries (updated for normalized schema)
-CREATE VIEW active_requests AS
-SELECT 
-    mr.issue_ID,
-    c.category_name,
-    s.status_name,
-    r.room_number,
-    h.hall_name,
-    u.name as student_name,
-    u.email as student_email,
-    mr.submission_timestamp,
-    mr.description,
-    mr.estimated_cost
-FROM Maintenance_Request mr
-JOIN Student st ON mr.student_ID = st.student_ID
-JOIN User u ON st.user_ID = u.id
-JOIN Room r ON mr.room_ID = r.room_ID
-JOIN Hall h ON r.hall_ID = h.hall_ID
-JOIN Category c ON mr.category_ID = c.category_ID
-JOIN Status s ON mr.status_ID = s.status_ID
-WHERE s.status_name IN ('Pending', 'Assigned', 'In Progress');
-
-CREATE VIEW officer_workload AS
-SELECT 
-    mo.officer_ID,
-    u.name as officer_name,
-    u.email as officer_email,
-    sp.specialty_name,
-    COUNT(oa.assignment_ID) as active_assignments,
-    SUM(oa.hours_worked) as total_hours_worked
-FROM Maintenance_Officer mo
-JOIN User u ON mo.user_ID = u.id
-JOIN Specialty sp ON mo.specialty_ID = sp.specialty_ID
-LEFT JOIN Officer_Assignment oa ON mo.officer_ID = oa.officer_ID
-LEFT JOIN Maintenance_Request mr ON oa.issue_ID = mr.issue_ID
-LEFT JOIN Status s ON mr.status_ID = s.status_ID
-WHERE s.status_name IN ('Pending', 'Assigned', 'In Progress') OR s.status_name IS NULL
-GROUP BY mo.officer_ID, u.name, u.email, sp.specialty_name;
-
 CREATE VIEW room_maintenance_history AS
 SELECT 
     r.room_number,
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Bulk import maintenance requests from a CSV or NDJSON file
+
+Backfills requests recorded on paper or in spreadsheets during an outage.
+Columns follow MaintenanceRequestCreate; the student may be given as
+student_number, the category as category_name, the room defaults to the
+student's room and submission_timestamp keeps the original time.
+
+    python import_requests.py requests.csv
+    python import_requests.py requests.ndjson --chunk-size 5000
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from services.request_importer import IMPORT_FORMATS, import_maintenance_requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="CSV or NDJSON file")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="Defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, help="Rows per INSERT batch")
+    args = parser.parse_args()
+
+    import_format = args.format
+    if import_format is None:
+        extension = os.path.splitext(args.path)[1].lstrip(".").lower()
+        import_format = "ndjson" if extension in ("ndjson", "jsonl") else "csv"
+
+    print(f"📥 Importing {args.path} as {import_format}...")
+    with open(args.path, "rb") as source:
+        summary = import_maintenance_requests(source, import_format, chunk_size=args.chunk_size)
+
+    print(f"✅ Imported {summary.imported} of {summary.total} rows")
+    if summary.failed:
+        print(f"❌ {summary.failed} rows failed:")
+        for error in summary.errors:
+            print(f"   row {error['row']}: {'; '.join(error['errors'])}")
+        if summary.errors_truncated:
+            print("   (further errors omitted)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,23 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from fastapi.concurrency import run_in_threadpool
+import asyncio
 import logging
 import os
 from config import settings
-from api.routes import users, maintenance_requests, auth
-from database.database import check_database_health
+from api.routes import users, maintenance_requests, auth, async_users, async_maintenance_requests, officer_assignments
+from database.database import check_database_health, DatabaseUnavailable
+from database.async_database import dispose_async_engine
+from database.instrumentation import begin_request_stats, end_request_stats, report_repeated_statements
+from services.password_hasher import password_pool
+from services.health_monitor import health_monitor
+from services.lookup_registry import lookup_registry
+from services.topology import topology
+from services.event_bus import event_bus
+from services.workload_rollover import workload_rollover
+from services.dispatch import dispatcher
 
 # Configure logging
 logging.basicConfig(
@@ -42,10 +53,57 @@ app.add_middleware(
     allow_headers=["*"],
     expose_headers=["*"],
 )
+@app.middleware("http")
+async def sql_instrumentation(request: Request, call_next):
+    """Report per-request statement count and DB time, and flag likely N+1s"""
+    stats, token = begin_request_stats()
+    try:
+        response = await call_next(request)
+    finally:
+        end_request_stats(token)
+    if "content-length" in response.headers or response.status_code in (204, 304):
+        response.headers["Server-Timing"] = stats.server_timing()
+        report_repeated_statements(stats, request.url.path, settings.N_PLUS_ONE_THRESHOLD)
+    else:
+        # Streamed bodies (/export, /events) run their statements after the
+        # headers are sent, so there is no Server-Timing to report; still
+        # check for N+1s once the stream ends
+        response.body_iterator = _report_after_stream(response.body_iterator, stats, request.url.path)
+    return response
+
+async def _report_after_stream(body, stats, path):
+    try:
+        async for chunk in body:
+            yield chunk
+    finally:
+        report_repeated_statements(stats, path, settings.N_PLUS_ONE_THRESHOLD)
+
+# Routers that can be switched to the AsyncSession path via ASYNC_DB_ROUTERS.
+# Async routers are mounted first so their paths take precedence; anything
+# they don't override keeps being served by the sync router.
+ASYNC_ROUTERS = {
+    "maintenance-requests": async_maintenance_requests.router,
+    "users": async_users.router,
+}
+for router_name in settings.ASYNC_DB_ROUTERS_LIST:
+    if router_name not in ASYNC_ROUTERS:
+        raise ValueError(f"Unknown router in ASYNC_DB_ROUTERS: {router_name}")
+    logger.info(f"⚡ Serving /{router_name} through the async database path")
+    app.include_router(ASYNC_ROUTERS[router_name], prefix="/api/v1")
+
 # Include routers
 app.include_router(auth.router, prefix="/api/v1")
 app.include_router(users.router, prefix="/api/v1")
 app.include_router(maintenance_requests.router, prefix="/api/v1")
+app.include_router(officer_assignments.router, prefix="/api/v1")
+
+@app.exception_handler(DatabaseUnavailable)
+async def database_unavailable_handler(request, exc):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "Database temporarily unavailable, please retry shortly"},
+        headers={"Retry-After": str(int(settings.DB_BREAKER_RECOVERY_SECONDS) or 1)},
+    )
 
 # Global exception handler
 @app.exception_handler(Exception)
@@ -99,10 +157,36 @@ async def startup_event():
         else:
             logger.warning("Application will start but database features may not work")
 
+    # Warm the in-process snapshots so the first requests don't pay for them
+    for snapshot in (lookup_registry, topology):
+        try:
+            await run_in_threadpool(snapshot.load)
+        except Exception as e:
+            logger.warning(f"⚠️ {snapshot.name} not loaded at startup, will load on first use: {e}")
+
+    # Sync routes publish request events from the threadpool; deliver them here
+    event_bus.bind(asyncio.get_running_loop())
+
+    # Keep /health answering from a background-refreshed snapshot
+    health_monitor.start()
+
+    # Zero officers' weekly hours when a new week starts
+    workload_rollover.start()
+
+    # Assign new submissions and sweep the pending backlog
+    if settings.DISPATCH_ENABLED:
+        dispatcher.start()
+
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown"""
     logger.info("🛑 Shutting down application")
+    event_bus.close()
+    await health_monitor.stop()
+    await workload_rollover.stop()
+    await dispatcher.stop()
+    password_pool.shutdown()
+    await dispose_async_engine()
 
 @app.get("/")
 async def root():
@@ -113,16 +197,14 @@ async def root():
         "docs": "/docs" if settings.ENVIRONMENT != "production" else "Documentation disabled in production"
     }
 
-@app.get("/health")
-async def health_check():
-    """Health check endpoint for monitoring"""
-    db_healthy = check_database_health()
+def build_health_response(snapshot: dict):
+    db_healthy = snapshot.get("database") == "connected"
     
     health_status = {
         "status": "healthy" if db_healthy else "unhealthy",
         "environment": settings.ENVIRONMENT,
         "version": settings.VERSION,
-        "database": "connected" if db_healthy else "disconnected"
+        **snapshot
     }
     
     if not db_healthy and settings.ENVIRONMENT == "production":
@@ -130,6 +212,20 @@ async def health_check():
     
     return health_status
 
+@app.get("/health")
+async def health_check():
+    """Health check endpoint for monitoring - served from the cached snapshot, no DB round trip"""
+    snapshot = health_monitor.snapshot
+    if snapshot.get("checked_at") is None:
+        # No background refresh has completed yet
+        snapshot = await health_monitor.refresh()
+    return build_health_response(snapshot)
+
+@app.get("/health/deep")
+async def deep_health_check():
+    """Force a live database probe and refresh the cached snapshot"""
+    return build_health_response(await health_monitor.refresh())
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
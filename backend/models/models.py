@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, DECIMAL, Date, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, DECIMAL, Date, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -80,6 +80,8 @@ class User(Base):
     phone_number = Column(String(20))
     password = Column(String(255))
     role = Column(MySQL_ENUM('student', 'hall officer', 'maintenance officer', 'admin', name='userrole'), nullable=False)
+    # Bumped with every room or hall change (see services.principal)
+    scope_version = Column(Integer, nullable=False, default=0)
     created_at = Column(DateTime, default=func.current_timestamp())
     updated_at = Column(DateTime, default=func.current_timestamp(), onupdate=func.current_timestamp())
     
@@ -188,26 +190,87 @@ class MaintenanceRequest(Base):
     completion_timestamp = Column(DateTime)
     estimated_cost = Column(DECIMAL(10, 2))
     actual_cost = Column(DECIMAL(10, 2))
+    # Bumped by every update; guards against lost updates (see If-Match)
+    version = Column(Integer, nullable=False, default=1, server_default="1")
     
     # Relationships
     student = relationship("Student", back_populates="maintenance_requests")
     room = relationship("Room", back_populates="maintenance_requests")
     category = relationship("Category", back_populates="maintenance_requests")
     status = relationship("Status", back_populates="maintenance_requests")
-    assignments = relationship("OfficerAssignment", back_populates="issue")
+    # Officer_Assignment rows go with the request (ON DELETE CASCADE) rather
+    # than being loaded and orphaned by the ORM
+    assignments = relationship("OfficerAssignment", back_populates="issue", passive_deletes=True)
     audit_logs = relationship("AuditLog", back_populates="issue")
 
+    # Keyset pagination walks (submission_timestamp, issue_ID) newest first,
+    # globally and per student; the changes feed walks (last_updated, issue_ID)
+    __table_args__ = (
+        Index('idx_submission_date', 'submission_timestamp', 'issue_ID'),
+        Index('idx_request_student', 'student_ID', 'submission_timestamp', 'issue_ID'),
+        Index('idx_request_last_updated', 'last_updated', 'issue_ID'),
+    )
+
+class MaintenanceRequestTombstone(Base):
+    """Left behind by a deleted request so the changes feed can report the delete"""
+    __tablename__ = "Maintenance_Request_Tombstone"
+
+    issue_ID = Column(Integer, primary_key=True, autoincrement=False)
+    # Kept for role scoping once the request itself is gone
+    student_ID = Column(Integer, nullable=False)
+    room_ID = Column(Integer, nullable=False)
+    deleted_at = Column(DateTime, nullable=False, default=func.current_timestamp())
+
+    __table_args__ = (
+        Index('idx_tombstone_deleted', 'deleted_at', 'issue_ID'),
+    )
+
 class ActiveRequests(Base):
+    """Materialized copy of every open maintenance request.
+
+    Holds the request's own columns plus its hall, room, category, status
+    and student names, so the active list is one indexed read. Kept in step
+    by the request write paths (see crud.active_request_crud); only
+    priority_level and created_at belong to this table.
+    """
     __tablename__ = "active_requests"
     
-    request_id = Column(Integer, primary_key=True, autoincrement=True)
-    issue_ID = Column(Integer, ForeignKey("Maintenance_Request.issue_ID", ondelete="CASCADE"), nullable=False)
+    issue_ID = Column(Integer, ForeignKey("Maintenance_Request.issue_ID", ondelete="CASCADE"), primary_key=True)
+    student_ID = Column(Integer, nullable=False)
+    room_ID = Column(Integer, nullable=False)
+    category_ID = Column(Integer, nullable=False)
+    status_ID = Column(Integer, nullable=False)
+    description = Column(Text, nullable=False)
+    availability = Column(Text)
+    submission_timestamp = Column(DateTime)
+    last_updated = Column(DateTime)
+    completion_timestamp = Column(DateTime)
+    estimated_cost = Column(DECIMAL(10, 2))
+    actual_cost = Column(DECIMAL(10, 2))
+    version = Column(Integer, nullable=False, default=1)
+    # Denormalized from the related tables
+    category_name = Column(String(50), nullable=False)
+    status_name = Column(String(50), nullable=False)
+    room_number = Column(String(10), nullable=False)
+    floor_number = Column(Integer)
+    hall_ID = Column(Integer, nullable=False)
+    hall_name = Column(String(100), nullable=False)
+    student_number = Column(String(20))
+    student_name = Column(String(100), nullable=False)
+    student_email = Column(String(100), nullable=False)
     priority_level = Column(Integer, default=1)
     created_at = Column(DateTime, default=func.current_timestamp())
     
     # Relationships
     maintenance_request = relationship("MaintenanceRequest")
 
+    __table_args__ = (
+        Index('idx_active_submitted', 'submission_timestamp', 'issue_ID'),
+        Index('idx_active_hall', 'hall_ID', 'submission_timestamp'),
+        Index('idx_active_student', 'student_ID', 'submission_timestamp'),
+        Index('idx_active_priority', 'priority_level', 'submission_timestamp'),
+    )
+
 class OfficerAssignment(Base):
     __tablename__ = "Officer_Assignment"
     assignment_ID = Column(Integer, primary_key=True, autoincrement=True)
@@ -218,6 +281,9 @@ class OfficerAssignment(Base):
     actual_completion_date = Column(DateTime)
     notes = Column(Text)
     hours_worked = Column(DECIMAL(5, 2))
+    # hours_worked as of the officer's last weekly rollover; the difference
+    # is what this assignment adds to officer_workload.total_hours_week
+    hours_at_week_start = Column(DECIMAL(5, 2), nullable=False, default=0)
     
     __table_args__ = (UniqueConstraint('issue_ID', 'officer_ID', name='unique_active_assignment'),)
     
@@ -226,6 +292,8 @@ class OfficerAssignment(Base):
     officer = relationship("MaintenanceOfficer", back_populates="assignments")
 
 class OfficerWorkload(Base):
+    """Running per-officer counters, kept in step by the assignment and request
+    write paths (see crud.officer_workload_crud)"""
     __tablename__ = "officer_workload"
     
     workload_id = Column(Integer, primary_key=True, autoincrement=True)
@@ -233,8 +301,12 @@ class OfficerWorkload(Base):
     active_assignments = Column(Integer, default=0)
     total_hours_week = Column(DECIMAL(5, 2), default=0.00)
     availability_status = Column(String(20), default="available")
+    # Monday of the week total_hours_week counts from
+    week_start = Column(Date)
     last_updated = Column(DateTime, default=func.current_timestamp(), onupdate=func.current_timestamp())
     
+    __table_args__ = (Index('idx_workload_load', 'active_assignments', 'total_hours_week'),)
+    
     # Relationships
     officer = relationship("MaintenanceOfficer", back_populates="workload")
 
@@ -48,6 +48,110 @@ def create_tables():
         print(f"❌ Failed to create tables: {e}")
         return False
 
+def prune_tombstones():
+    """Delete maintenance request tombstones older than the changes feed retention"""
+    try:
+        from database.database import SessionLocal
+        from crud.maintenance_request_crud import prune_tombstones as prune
+        from config import settings
+
+        db = SessionLocal()
+        try:
+            removed = prune(db)
+        finally:
+            db.close()
+        print(f"✅ Pruned {removed} tombstones older than {settings.CHANGES_TOMBSTONE_RETENTION_DAYS} days")
+        return True
+    except Exception as e:
+        print(f"❌ Failed to prune tombstones: {e}")
+        return False
+
+def reconcile_active_requests(rebuild=False):
+    """Compare the active_requests table with Maintenance_Request, repairing drift if ``rebuild``"""
+    try:
+        from database.database import SessionLocal
+        from crud.active_request_crud import verify_active_requests, rebuild_active_requests
+
+        db = SessionLocal()
+        try:
+            drift = rebuild_active_requests(db) if rebuild else verify_active_requests(db)
+        finally:
+            db.close()
+        if not drift:
+            print("✅ active_requests is in step with Maintenance_Request")
+            return True
+        print(f"⚠️  active_requests drift: {len(drift.missing)} missing, {len(drift.stale)} stale, {len(drift.extra)} extra")
+        if rebuild:
+            print(f"✅ Repaired {len(drift.issue_ids)} rows")
+            return True
+        print("   Run with --rebuild-active to repair")
+        return False
+    except Exception as e:
+        print(f"❌ Failed to check active_requests: {e}")
+        return False
+
+def reconcile_workloads(rebuild=False):
+    """Recount officer workloads and compare them with the stored counters, repairing drift if ``rebuild``"""
+    try:
+        from database.database import SessionLocal
+        from crud.officer_workload_crud import verify_workloads, rebuild_workloads
+
+        db = SessionLocal()
+        try:
+            drift = rebuild_workloads(db) if rebuild else verify_workloads(db)
+        finally:
+            db.close()
+        if not drift:
+            print("✅ officer_workload counters match Officer_Assignment")
+            return True
+        print(f"⚠️  officer_workload drift: {len(drift.wrong)} officers off, {len(drift.missing)} without a row")
+        for officer_id, (stored, expected) in sorted(drift.wrong.items()):
+            print(f"   officer {officer_id}: stored {stored[0]} open / {stored[1]}h, expected {expected[0]} open / {expected[1]}h")
+        if rebuild:
+            print(f"✅ Repaired {len(drift.wrong) + len(drift.missing)} officers")
+            return True
+        print("   Run with --rebuild-workload to repair")
+        return False
+    except Exception as e:
+        print(f"❌ Failed to check officer workloads: {e}")
+        return False
+
+def roll_over_week():
+    """Start a new week of officer hours (idempotent; the server also does this hourly)"""
+    try:
+        from database.database import SessionLocal
+        from crud.officer_workload_crud import roll_over_week as roll
+
+        db = SessionLocal()
+        try:
+            rolled = roll(db)
+        finally:
+            db.close()
+        print(f"✅ Rolled {rolled} officers over to the current week")
+        return True
+    except Exception as e:
+        print(f"❌ Failed to roll over officer workloads: {e}")
+        return False
+
+def dispatch_backlog(dry_run=False):
+    """Assign every pending request an officer can take, or only show the plan if ``dry_run``"""
+    try:
+        from database.database import SessionLocal
+        from services.dispatch import dispatch
+
+        db = SessionLocal()
+        try:
+            result = dispatch(db, dry_run=dry_run)
+        finally:
+            db.close()
+        verb = "Would assign" if dry_run else "Assigned"
+        print(f"✅ {verb} {len(result.assigned)} of {result.pending} pending requests "
+              f"in {result.seconds:.2f}s ({result.decisions_per_second:,.0f} decisions/s)")
+        return True
+    except Exception as e:
+        print(f"❌ Failed to dispatch pending requests: {e}")
+        return False
+
 def run_server():
     """Run the FastAPI server"""
     try:
@@ -84,6 +188,26 @@ def main():
     if "--create-tables" in sys.argv:
         if not create_tables():
             sys.exit(1)
+
+    if "--prune-tombstones" in sys.argv:
+        if not prune_tombstones():
+            sys.exit(1)
+
+    if "--verify-active" in sys.argv or "--rebuild-active" in sys.argv:
+        if not reconcile_active_requests(rebuild="--rebuild-active" in sys.argv):
+            sys.exit(1)
+
+    if "--roll-over-week" in sys.argv:
+        if not roll_over_week():
+            sys.exit(1)
+
+    if "--verify-workload" in sys.argv or "--rebuild-workload" in sys.argv:
+        if not reconcile_workloads(rebuild="--rebuild-workload" in sys.argv):
+            sys.exit(1)
+
+    if "--dispatch" in sys.argv:
+        if not dispatch_backlog(dry_run="--dry-run" in sys.argv):
+            sys.exit(1)
     
     # Default action: run server
     if len(sys.argv) == 1 or "--run" in sys.argv:
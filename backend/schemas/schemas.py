@@ -16,10 +16,22 @@ class LoginResponse(BaseModel):
     token_type: str
     user: dict
     expires_in: int
+    refresh_token: Optional[str] = None
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
+
+class TokenPair(BaseModel):
+    access_token: str
+    refresh_token: str
+    token_type: str
+    expires_in: int
 
 class TokenData(BaseModel):
     email: Optional[str] = None
     role: Optional[str] = None
+    # Scope claims carried by versioned access tokens (None for legacy tokens)
+    claims: Optional[dict] = None
 
 # Base schemas
 class UserBase(BaseModel):
@@ -254,6 +266,7 @@ class MaintenanceRequest(MaintenanceRequestBase):
     last_updated: datetime
     completion_timestamp: Optional[datetime] = None
     actual_cost: Optional[Decimal] = None
+    version: int = 1
     student: Student
     room: Room
     category: Category
@@ -262,6 +275,94 @@ class MaintenanceRequest(MaintenanceRequestBase):
     class Config:
         from_attributes = True
 
+class MaintenanceRequestSummary(BaseModel):
+    """Flat projection row for sparse fieldset listings (fields= / view=summary).
+
+    Every field is optional; only the requested ones are set and serialized.
+    """
+    issue_ID: Optional[int] = None
+    student_ID: Optional[int] = None
+    room_ID: Optional[int] = None
+    category_ID: Optional[int] = None
+    status_ID: Optional[int] = None
+    description: Optional[str] = None
+    availability: Optional[str] = None
+    submission_timestamp: Optional[datetime] = None
+    last_updated: Optional[datetime] = None
+    completion_timestamp: Optional[datetime] = None
+    estimated_cost: Optional[Decimal] = None
+    actual_cost: Optional[Decimal] = None
+    category_name: Optional[str] = None
+    status_name: Optional[str] = None
+    room_number: Optional[str] = None
+    floor_number: Optional[int] = None
+    hall_ID: Optional[int] = None
+    hall_name: Optional[str] = None
+    student_number: Optional[str] = None
+    student_name: Optional[str] = None
+
+class MaintenanceRequestTombstone(BaseModel):
+    issue_ID: int
+    deleted_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class MaintenanceRequestChanges(BaseModel):
+    """One page of the changes feed.
+
+    ``changed`` holds requests created or updated since the token (oldest
+    change first) and ``deleted`` the requests removed since then. Pass
+    ``next_token`` as ``since`` on the next call; while ``has_more`` is set
+    call again straight away.
+    """
+    changed: List[MaintenanceRequest]
+    deleted: List[MaintenanceRequestTombstone]
+    next_token: str
+    has_more: bool
+
+class MaintenanceRequestImport(MaintenanceRequestCreate):
+    """One row of a bulk import.
+
+    Backfilled paper records rarely carry database IDs, so the student and
+    category may be given by number/name instead, the room defaults to the
+    student's room, and the original submission time can be kept.
+    """
+    student_ID: Optional[int] = None
+    student_number: Optional[str] = None
+    room_ID: Optional[int] = None
+    category_ID: Optional[int] = None
+    category_name: Optional[str] = None
+    status_ID: Optional[int] = None  # defaults to Pending
+    submission_timestamp: Optional[datetime] = None
+    completion_timestamp: Optional[datetime] = None
+    actual_cost: Optional[Decimal] = None
+
+class ImportRowError(BaseModel):
+    row: int
+    errors: List[str]
+
+class ImportResult(BaseModel):
+    total: int
+    imported: int
+    failed: int
+    errors: List[ImportRowError]
+    errors_truncated: bool = False
+
+class BulkStatusUpdate(BaseModel):
+    issue_IDs: List[int]
+    status_ID: int
+
+class BulkStatusOutcome(BaseModel):
+    issue_ID: int
+    outcome: str  # "updated", "not_found" or "forbidden"
+    version: Optional[int] = None
+
+class BulkStatusResult(BaseModel):
+    status_ID: int
+    updated: int
+    results: List[BulkStatusOutcome]
+
 # Officer Assignment schemas
 class OfficerAssignmentBase(BaseModel):
     issue_ID: int
@@ -289,6 +390,44 @@ class OfficerAssignment(OfficerAssignmentBase):
     class Config:
         from_attributes = True
 
+class OfficerAssignmentRecord(OfficerAssignmentBase):
+    """An assignment's own columns, without the nested officer and request"""
+    assignment_ID: int
+    assignment_date: Optional[datetime] = None
+    actual_completion_date: Optional[datetime] = None
+    hours_worked: Optional[Decimal] = None
+
+    class Config:
+        from_attributes = True
+
+class AssignmentCompletion(BaseModel):
+    hours_worked: Optional[Decimal] = None
+    notes: Optional[str] = None
+
+# Officer workload schemas
+class OfficerWorkloadSummary(BaseModel):
+    officer_ID: int
+    officer_name: str
+    specialty_ID: int
+    specialty_name: str
+    active_assignments: int
+    total_hours_week: Decimal
+    availability_status: Optional[str] = None
+    week_start: date
+    last_updated: Optional[datetime] = None
+
+class DispatchDecision(BaseModel):
+    issue_ID: int
+    officer_ID: int
+
+class DispatchReport(BaseModel):
+    pending: int
+    planned: int
+    assigned: int
+    seconds: float
+    decisions_per_second: float
+    decisions: List[DispatchDecision]
+
 # Audit Log schemas
 class AuditLogBase(BaseModel):
     action_type: ActionType
@@ -0,0 +1,342 @@
+import asyncio
+import heapq
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import exists, select, update
+from sqlalchemy.orm import Session
+
+from config import settings
+from database.database import SessionLocal
+from models.models import ActiveRequests, MaintenanceOfficer, MaintenanceRequest, OfficerAssignment, OfficerWorkload
+from crud.active_request_crud import sync_update_statements
+from crud.officer_assignment_crud import open_assignments
+from crud.officer_workload_crud import week_start
+from services.lookup_registry import lookup_registry, PENDING, ASSIGNED
+from services.watermark import requests_changed
+from services.event_bus import publish_request_event
+
+logger = logging.getLogger(__name__)
+
+# Dispatch matches Pending requests with no open assignment to maintenance
+# officers, most urgent request first:
+#   urgency   time waited plus priority_level * DISPATCH_PRIORITY_STEP_HOURS.
+#             Every request ages at the same rate, so ordering by
+#             submission time minus the priority step never changes and
+#             one heap key per request holds for the whole pass.
+#   officer   the least loaded (open assignments, then hours this week)
+#             available officer of the specialty that handles the request's
+#             category, while under DISPATCH_MAX_ACTIVE_PER_OFFICER and
+#             DISPATCH_MAX_HOURS_PER_WEEK; one heap per specialty.
+# plan_dispatch is pure; dispatch() loads its inputs from active_requests
+# and officer_workload, plans, and applies the plan.
+
+
+class PendingRequest(NamedTuple):
+    issue_ID: int
+    specialty_ID: Optional[int]
+    priority_level: int
+    submitted: datetime
+
+
+class OfficerLoad(NamedTuple):
+    officer_ID: int
+    specialty_ID: int
+    active_assignments: int
+    hours_this_week: float
+
+
+class Decision(NamedTuple):
+    issue_ID: int
+    officer_ID: int
+
+
+def urgency_key(request: PendingRequest, step_seconds: float) -> float:
+    """Heap key of a request; smaller is more urgent"""
+    return request.submitted.timestamp() - (request.priority_level or 0) * step_seconds
+
+
+def plan_dispatch(
+    requests: Iterable[PendingRequest],
+    officers: Iterable[OfficerLoad],
+    max_active: Optional[int] = None,
+    max_hours: Optional[float] = None,
+    step_hours: Optional[float] = None
+) -> List[Decision]:
+    """Assign requests to officers, most urgent first, each to the least
+    loaded officer with capacity in its specialty.
+
+    O((requests + officers) log n). Requests whose specialty has no
+    officer with capacity are left out.
+    """
+    max_active = settings.DISPATCH_MAX_ACTIVE_PER_OFFICER if max_active is None else max_active
+    max_hours = settings.DISPATCH_MAX_HOURS_PER_WEEK if max_hours is None else max_hours
+    step_seconds = (settings.DISPATCH_PRIORITY_STEP_HOURS if step_hours is None else step_hours) * 3600
+
+    officer_heaps: Dict[int, list] = {}
+    for officer in officers:
+        if officer.active_assignments < max_active and officer.hours_this_week < max_hours:
+            officer_heaps.setdefault(officer.specialty_ID, []).append(
+                (officer.active_assignments, officer.hours_this_week, officer.officer_ID)
+            )
+    for heap in officer_heaps.values():
+        heapq.heapify(heap)
+
+    queue = [(urgency_key(request, step_seconds), request.issue_ID, request.specialty_ID) for request in requests]
+    heapq.heapify(queue)
+
+    decisions = []
+    while queue and officer_heaps:
+        _, issue_id, specialty_id = heapq.heappop(queue)
+        heap = officer_heaps.get(specialty_id)
+        if heap is None:
+            continue
+        active, hours, officer_id = heap[0]
+        decisions.append(Decision(issue_id, officer_id))
+        # A new assignment has no hours yet; only the count moves
+        if active + 1 < max_active:
+            heapq.heapreplace(heap, (active + 1, hours, officer_id))
+        else:
+            heapq.heappop(heap)
+            if not heap:
+                del officer_heaps[specialty_id]
+    return decisions
+
+
+def _unassigned(issue_id_column):
+    return ~exists().where(
+        OfficerAssignment.issue_ID == issue_id_column,
+        OfficerAssignment.actual_completion_date.is_(None),
+    )
+
+
+def load_pending(db: Session, specialty_ids: Optional[Iterable[int]] = None) -> List[PendingRequest]:
+    """Pending requests nobody is assigned to, from active_requests"""
+    statement = select(
+        ActiveRequests.issue_ID, ActiveRequests.category_ID,
+        ActiveRequests.priority_level, ActiveRequests.submission_timestamp
+    ).where(
+        ActiveRequests.status_ID == lookup_registry.status_id(PENDING),
+        _unassigned(ActiveRequests.issue_ID),
+    )
+    if specialty_ids is not None:
+        snapshot = lookup_registry.current()
+        statement = statement.where(ActiveRequests.category_ID.in_(
+            [category_id for specialty_id in specialty_ids for category_id in snapshot.categories_for_specialty(specialty_id)]
+        ))
+    return [
+        PendingRequest(issue_id, lookup_registry.specialty_for_category(category_id), priority or 0, submitted)
+        for issue_id, category_id, priority, submitted in db.execute(statement)
+    ]
+
+
+def load_officers(db: Session, specialty_ids: Optional[Iterable[int]] = None) -> List[OfficerLoad]:
+    """Available officers and their counters; officers without a workload row count as idle"""
+    statement = select(
+        MaintenanceOfficer.officer_ID, MaintenanceOfficer.specialty_ID,
+        OfficerWorkload.active_assignments, OfficerWorkload.total_hours_week,
+        OfficerWorkload.week_start, OfficerWorkload.availability_status
+    ).outerjoin(OfficerWorkload, MaintenanceOfficer.officer_ID == OfficerWorkload.officer_ID)
+    if specialty_ids is not None:
+        statement = statement.where(MaintenanceOfficer.specialty_ID.in_(list(specialty_ids)))
+
+    current = week_start()
+    officers = []
+    for officer_id, specialty_id, active, hours, week, availability in db.execute(statement):
+        if availability not in (None, "available"):
+            continue
+        # Hours from a week that has ended are not counted, as on the workload read
+        this_week = float(hours or 0) if week is not None and week >= current else 0.0
+        officers.append(OfficerLoad(officer_id, specialty_id, active or 0, this_week))
+    return officers
+
+
+def apply_decisions(db: Session, decisions: List[Decision]) -> List[Decision]:
+    """Open the planned assignments and move their requests to Assigned.
+
+    Commits every DISPATCH_BATCH_SIZE requests. Each batch first locks the
+    requests still Pending and unassigned, so one changed (or dispatched by
+    another worker) since it was planned is skipped. Returns the decisions
+    applied.
+    """
+    pending_id = lookup_registry.status_id(PENDING)
+    values = {"status_ID": lookup_registry.status_id(ASSIGNED)}
+    applied = []
+    for start in range(0, len(decisions), settings.DISPATCH_BATCH_SIZE):
+        batch = decisions[start:start + settings.DISPATCH_BATCH_SIZE]
+        rows = {
+            row.issue_ID: row
+            for row in db.execute(
+                select(MaintenanceRequest.issue_ID, MaintenanceRequest.student_ID,
+                       MaintenanceRequest.room_ID, MaintenanceRequest.version)
+                .where(
+                    MaintenanceRequest.issue_ID.in_([decision.issue_ID for decision in batch]),
+                    MaintenanceRequest.status_ID == pending_id,
+                    _unassigned(MaintenanceRequest.issue_ID),
+                )
+                .with_for_update()
+            )
+        }
+        batch = [decision for decision in batch if decision.issue_ID in rows]
+        if batch:
+            ids = [decision.issue_ID for decision in batch]
+            open_assignments(db, batch)
+            db.execute(
+                update(MaintenanceRequest)
+                .where(MaintenanceRequest.issue_ID.in_(ids))
+                .values(**values, version=MaintenanceRequest.version + 1)
+                .execution_options(synchronize_session=False)
+            )
+            for statement in sync_update_statements(ids, values):
+                db.execute(statement)
+        db.commit()
+        if batch:
+            requests_changed()
+            for decision in batch:
+                row = rows[decision.issue_ID]
+                publish_request_event(
+                    "request.status_changed", row.issue_ID, row.student_ID, row.room_ID,
+                    values["status_ID"], row.version + 1
+                )
+            applied.extend(batch)
+    return applied
+
+
+@dataclass
+class DispatchResult:
+    """What one dispatch pass considered, planned and applied"""
+    pending: int = 0
+    planned: int = 0
+    assigned: List[Decision] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def decisions_per_second(self) -> float:
+        return self.planned / self.seconds if self.seconds else 0.0
+
+
+def dispatch(db: Session, specialty_ids: Optional[Iterable[int]] = None, dry_run: bool = False) -> DispatchResult:
+    """Dispatch the backlog, or only requests for ``specialty_ids``.
+
+    With ``dry_run`` the plan is returned as ``assigned`` without changing
+    anything.
+    """
+    started = time.perf_counter()
+    if specialty_ids is not None:
+        specialty_ids = list(specialty_ids)
+    requests = load_pending(db, specialty_ids)
+    decisions = plan_dispatch(requests, load_officers(db, specialty_ids)) if requests else []
+    if dry_run:
+        db.rollback()
+        assigned = decisions
+    else:
+        assigned = apply_decisions(db, decisions)
+    return DispatchResult(
+        pending=len(requests),
+        planned=len(decisions),
+        assigned=assigned,
+        seconds=time.perf_counter() - started,
+    )
+
+
+class Dispatcher:
+    """Runs dispatch in the background: for the specialty of each new
+    submission as it arrives, and over the whole backlog every
+    ``interval_seconds`` (which also picks up capacity freed by completed
+    assignments).
+
+    ``request_submitted`` may be called from any thread; submissions that
+    arrive while a pass is running are handled together by the next one.
+    Passes run one at a time per process; across workers, the row locks
+    taken when a plan is applied keep a request from being assigned twice.
+    """
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._lock = threading.Lock()
+        self._due: Set[int] = set()
+        self._full_due = False
+
+    def _notify(self) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._wake.set)
+        except RuntimeError:
+            # Loop closed during shutdown
+            pass
+
+    def request_submitted(self, category_id: int) -> None:
+        """Schedule a pass for the specialty that handles ``category_id``"""
+        if self._loop is None:
+            # Not running (CLI scripts); the next sweep picks the request up
+            return
+        specialty_id = lookup_registry.specialty_for_category(category_id)
+        if specialty_id is None:
+            return
+        with self._lock:
+            self._due.add(specialty_id)
+        self._notify()
+
+    def backlog_changed(self) -> None:
+        """Schedule a pass over the whole backlog (after an import)"""
+        if self._loop is None:
+            return
+        with self._lock:
+            self._full_due = True
+        self._notify()
+
+    def _dispatch(self, specialty_ids: Optional[Set[int]]) -> DispatchResult:
+        db = SessionLocal()
+        try:
+            return dispatch(db, specialty_ids)
+        finally:
+            db.close()
+
+    async def _run(self) -> None:
+        next_sweep = time.monotonic()
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=max(0.0, next_sweep - time.monotonic()))
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            with self._lock:
+                due, self._due = self._due, set()
+                full, self._full_due = self._full_due or time.monotonic() >= next_sweep, False
+            if full:
+                next_sweep = time.monotonic() + self.interval_seconds
+            try:
+                result = await run_in_threadpool(self._dispatch, None if full else due)
+                if result.assigned:
+                    logger.info(
+                        f"🚚 Dispatched {len(result.assigned)} of {result.pending} pending requests "
+                        f"in {result.seconds * 1000:.0f}ms"
+                    )
+            except Exception as e:
+                logger.error(f"Dispatch failed: {e}")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._loop = asyncio.get_running_loop()
+            self._wake = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        self._loop = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+dispatcher = Dispatcher(interval_seconds=settings.DISPATCH_INTERVAL_SECONDS)
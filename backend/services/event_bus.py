@@ -0,0 +1,198 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, List, Optional, Set
+
+from config import settings
+from services.lookup_registry import lookup_registry
+from services.topology import topology
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Event:
+    """One change to a maintenance request, as pushed to subscribers"""
+    id: str
+    seq: int
+    type: str
+    student_ID: Optional[int]
+    hall_ID: Optional[int]
+    data: dict
+
+    def to_sse(self) -> str:
+        return f"id: {self.id}\nevent: {self.type}\ndata: {json.dumps(self.data, default=str)}\n\n"
+
+
+@dataclass(eq=False)
+class Subscription:
+    """A connected client: its scope and a bounded queue of pending events.
+
+    ``student_id``/``hall_id`` restrict which events it receives (both None
+    means everything). A ``None`` in the queue tells the reader to stop.
+    """
+    queue: asyncio.Queue
+    student_id: Optional[int] = None
+    hall_id: Optional[int] = None
+    last_seq: int = 0
+    evicted: bool = False
+
+    def wants(self, event: Event) -> bool:
+        if self.student_id is not None and event.student_ID != self.student_id:
+            return False
+        if self.hall_id is not None and event.hall_ID != self.hall_id:
+            return False
+        return True
+
+
+class EventBus:
+    """In-process pub/sub for maintenance request changes.
+
+    ``publish`` may be called from any thread (sync routes run in the
+    threadpool); delivery always happens on the event loop passed to
+    ``bind``. Every subscriber has a bounded queue, and one that falls
+    ``queue_size`` events behind is evicted rather than allowed to grow
+    without limit; it can reconnect with the last event ID it saw and be
+    replayed from the last ``replay_size`` events.
+
+    Events only reach clients connected to the same process.
+    """
+
+    def __init__(self, queue_size: int, replay_size: int):
+        self.queue_size = queue_size
+        # Event IDs are "<epoch>-<seq>" so an ID from before a restart is
+        # recognized instead of being mistaken for a recent one
+        self.epoch = str(int(time.time()))
+        self._seq = 0
+        self._history: Deque[Event] = deque(maxlen=replay_size)
+        self._subscribers: Set[Subscription] = set()
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.published = 0
+        self.evictions = 0
+
+    def bind(self, loop: asyncio.AbstractEventLoop) -> None:
+        self._loop = loop
+
+    def publish(self, event_type: str, data: dict, student_id: Optional[int] = None,
+                hall_id: Optional[int] = None) -> Optional[Event]:
+        """Record an event and schedule its delivery; safe from any thread"""
+        with self._lock:
+            self._seq += 1
+            event = Event(f"{self.epoch}-{self._seq}", self._seq, event_type, student_id, hall_id, data)
+            self._history.append(event)
+            self.published += 1
+            loop = self._loop
+            if loop is None:
+                # No server running (CLI scripts); nothing to deliver to
+                return event
+            try:
+                # Scheduled under the lock so events reach the loop in ID order
+                loop.call_soon_threadsafe(self._fan_out, event)
+            except RuntimeError:
+                # Loop closed during shutdown
+                pass
+        return event
+
+    def _deliver(self, subscription: Subscription, event: Event) -> None:
+        if subscription.evicted or event.seq <= subscription.last_seq or not subscription.wants(event):
+            return
+        try:
+            subscription.queue.put_nowait(event)
+            subscription.last_seq = event.seq
+        except asyncio.QueueFull:
+            self._evict(subscription)
+
+    def _fan_out(self, event: Event) -> None:
+        for subscription in list(self._subscribers):
+            self._deliver(subscription, event)
+
+    def _stop(self, subscription: Subscription) -> None:
+        subscription.evicted = True
+        self._subscribers.discard(subscription)
+        # Drop what is still queued rather than a gap in the middle: the
+        # client resumes from the last event it actually read
+        while not subscription.queue.empty():
+            subscription.queue.get_nowait()
+        subscription.queue.put_nowait(None)
+
+    def _evict(self, subscription: Subscription) -> None:
+        self._stop(subscription)
+        self.evictions += 1
+        logger.info(f"Evicted slow event subscriber at event {subscription.last_seq}")
+
+    def _replay_from(self, seq: int) -> Optional[List[Event]]:
+        """Events after ``seq``, or None if some of them were already dropped"""
+        with self._lock:
+            history = list(self._history)
+        missed = [event for event in history if event.seq > seq]
+        if missed and missed[0].seq != seq + 1:
+            return None
+        return missed
+
+    def subscribe(self, student_id: Optional[int] = None, hall_id: Optional[int] = None,
+                  last_event_id: Optional[str] = None) -> Subscription:
+        """Register a subscriber on the running loop, replaying missed events.
+
+        Without ``last_event_id`` delivery starts with the next event. If the
+        events after it are no longer all in the replay buffer (or it is
+        from before a restart) the first event is a ``resync`` telling the
+        client to reload instead.
+        """
+        subscription = Subscription(asyncio.Queue(maxsize=self.queue_size), student_id, hall_id)
+        epoch, _, seq = (last_event_id or "").partition("-")
+        missed = None
+        if last_event_id is None:
+            missed = []
+            subscription.last_seq = self._seq
+        elif epoch == self.epoch and seq.isdigit():
+            subscription.last_seq = int(seq)
+            missed = self._replay_from(subscription.last_seq)
+
+        if missed is None:
+            subscription.last_seq = self._seq
+            subscription.queue.put_nowait(
+                Event(f"{self.epoch}-{self._seq}", self._seq, "resync", None, None, {"reason": "events missed"})
+            )
+        for event in missed or ():
+            self._deliver(subscription, event)
+        if not subscription.evicted:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def close(self) -> None:
+        """End every open stream (shutdown)"""
+        for subscription in list(self._subscribers):
+            self._stop(subscription)
+
+    def snapshot(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "evictions": self.evictions,
+            "replay_buffer": len(self._history),
+        }
+
+
+event_bus = EventBus(queue_size=settings.EVENT_STREAM_QUEUE_SIZE, replay_size=settings.EVENT_STREAM_REPLAY_SIZE)
+
+
+def publish_request_event(event_type: str, issue_id: int, student_id: int, room_id: int,
+                          status_id: Optional[int] = None, version: Optional[int] = None) -> None:
+    """Publish a change to one request, scoped to its student and hall"""
+    room = topology.room(room_id)
+    hall_id = room.hall_ID if room is not None else None
+    data = {"issue_ID": issue_id, "student_ID": student_id, "room_ID": room_id, "hall_ID": hall_id}
+    if status_id is not None:
+        data["status_ID"] = status_id
+        data["status_name"] = lookup_registry.status(status_id).status_name
+    if version is not None:
+        data["version"] = version
+    event_bus.publish(event_type, data, student_id=student_id, hall_id=hall_id)
@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from config import settings
+from database.database import engine, check_database_health, db_circuit_breaker, get_liveness_stats
+from database.circuit_breaker import OPEN
+from services.watermark import conditional_get_stats
+from services.event_bus import event_bus
+
+logger = logging.getLogger(__name__)
+
+
+class HealthMonitor:
+    """Keeps a periodically refreshed health snapshot.
+
+    /health serves the last snapshot so load balancer and uptime checks never
+    touch the database; only the background refresh (and /health/deep)
+    issues a probe.
+    """
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._snapshot = {
+            "database": "unknown",
+            "db_latency_ms": None,
+            "checked_at": None,
+        }
+
+    @property
+    def snapshot(self) -> dict:
+        return self._snapshot
+
+    def _pool_stats(self) -> dict:
+        pool = engine.pool
+        return {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "overflow": pool.overflow(),
+        }
+
+    def _probe(self) -> dict:
+        latency_ms = None
+        # While the circuit is open the breaker's own probe owns recovery
+        if db_circuit_breaker.state == OPEN:
+            db_healthy = False
+        else:
+            started = time.perf_counter()
+            db_healthy = check_database_health()
+            latency_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        return {
+            "database": "connected" if db_healthy else "disconnected",
+            "db_latency_ms": latency_ms,
+            "pool": self._pool_stats(),
+            "circuit_breaker": db_circuit_breaker.snapshot(),
+            "liveness": get_liveness_stats(),
+            "conditional_get": conditional_get_stats.snapshot(),
+            "event_stream": event_bus.snapshot(),
+            "checked_at": datetime.now(timezone.utc).isoformat(),
+        }
+
+    async def refresh(self) -> dict:
+        """Probe now and replace the snapshot"""
+        self._snapshot = await run_in_threadpool(self._probe)
+        return self._snapshot
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Health refresh failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+health_monitor = HealthMonitor(interval_seconds=settings.HEALTH_CHECK_INTERVAL_SECONDS)
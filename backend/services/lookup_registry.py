@@ -0,0 +1,185 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.models import Category, Status, Specialty
+from schemas import schemas
+from services.snapshot import SnapshotRegistry
+
+# Status names the application logic depends on
+PENDING = "Pending"
+ASSIGNED = "Assigned"
+IN_PROGRESS = "In Progress"
+UNDER_REVIEW = "Under Review"
+COMPLETED = "Completed"
+
+# Statuses of open work, as materialized in active_requests. Names missing
+# from the Status table are skipped.
+ACTIVE_STATUSES = (PENDING, ASSIGNED, IN_PROGRESS, UNDER_REVIEW)
+
+
+class UnknownLookup(KeyError):
+    """A category, status or specialty name/ID that is not in the registry"""
+
+    def __init__(self, kind: str, key):
+        super().__init__(f"Unknown {kind}: {key}")
+        self.kind = kind
+        self.key = key
+
+    def __str__(self):
+        return self.args[0]
+
+
+@dataclass(frozen=True)
+class LookupSnapshot:
+    """Immutable view of the lookup tables at one version"""
+    version: int
+    categories: Dict[int, schemas.Category] = field(default_factory=dict)
+    statuses: Dict[int, schemas.Status] = field(default_factory=dict)
+    specialties: Dict[int, schemas.Specialty] = field(default_factory=dict)
+    category_ids: Dict[str, int] = field(default_factory=dict)
+    status_ids: Dict[str, int] = field(default_factory=dict)
+    specialty_ids: Dict[str, int] = field(default_factory=dict)
+    # Specialty that handles each category, None if no officer can
+    category_specialties: Dict[int, Optional[int]] = field(default_factory=dict)
+
+    def category(self, category_id: int) -> schemas.Category:
+        try:
+            return self.categories[category_id]
+        except KeyError:
+            raise UnknownLookup("category", category_id) from None
+
+    def status(self, status_id: int) -> schemas.Status:
+        try:
+            return self.statuses[status_id]
+        except KeyError:
+            raise UnknownLookup("status", status_id) from None
+
+    def specialty(self, specialty_id: int) -> schemas.Specialty:
+        try:
+            return self.specialties[specialty_id]
+        except KeyError:
+            raise UnknownLookup("specialty", specialty_id) from None
+
+    def category_id(self, name: str) -> int:
+        try:
+            return self.category_ids[name.lower()]
+        except KeyError:
+            raise UnknownLookup("category", name) from None
+
+    def status_id(self, name: str) -> int:
+        try:
+            return self.status_ids[name.lower()]
+        except KeyError:
+            raise UnknownLookup("status", name) from None
+
+    def specialty_id(self, name: str) -> int:
+        try:
+            return self.specialty_ids[name.lower()]
+        except KeyError:
+            raise UnknownLookup("specialty", name) from None
+
+    def specialty_for_category(self, category_id: int) -> Optional[int]:
+        self.category(category_id)
+        return self.category_specialties[category_id]
+
+    def categories_for_specialty(self, specialty_id: int) -> List[int]:
+        return [c for c, s in self.category_specialties.items() if s == specialty_id]
+
+    def active_status_ids(self) -> tuple:
+        return tuple(self.status_ids[name.lower()] for name in ACTIVE_STATUSES if name.lower() in self.status_ids)
+
+
+def _load_snapshot(db: Session, version: int) -> LookupSnapshot:
+    categories = {
+        row.category_ID: schemas.Category.model_validate(row)
+        for row in db.execute(select(Category)).scalars()
+    }
+    statuses = {
+        row.status_ID: schemas.Status.model_validate(row)
+        for row in db.execute(select(Status)).scalars()
+    }
+    specialties = {
+        row.specialty_ID: schemas.Specialty.model_validate(row)
+        for row in db.execute(select(Specialty)).scalars()
+    }
+    specialty_ids = {s.specialty_name.lower(): i for i, s in specialties.items()}
+    fallback = specialty_ids.get(settings.DISPATCH_FALLBACK_SPECIALTY.lower())
+    return LookupSnapshot(
+        version=version,
+        categories=categories,
+        statuses=statuses,
+        specialties=specialties,
+        category_ids={c.category_name.lower(): i for i, c in categories.items()},
+        status_ids={s.status_name.lower(): i for i, s in statuses.items()},
+        specialty_ids=specialty_ids,
+        # Categories are handled by the specialty of the same name (Plumbing
+        # by Plumbing), anything else by the fallback specialty
+        category_specialties={
+            i: specialty_ids.get(c.category_name.lower(), fallback) for i, c in categories.items()
+        },
+    )
+
+
+class LookupRegistry(SnapshotRegistry[LookupSnapshot]):
+    """In-process cache of the Category, Status and Specialty tables.
+
+    Reloaded when a lookup row changes through the ORM or when the snapshot
+    is older than ``ttl_seconds``.
+    """
+
+    name = "Lookup registry"
+
+    def _build(self, db: Session, version: int) -> LookupSnapshot:
+        return _load_snapshot(db, version)
+
+    def _describe(self, snapshot: LookupSnapshot) -> str:
+        return (
+            f"{len(snapshot.categories)} categories, {len(snapshot.statuses)} statuses, "
+            f"{len(snapshot.specialties)} specialties"
+        )
+
+    def _by_id(self, kind: str, key: int):
+        try:
+            return getattr(self.current(), kind)(key)
+        except UnknownLookup:
+            # Rows reference lookups by foreign key, so a miss means one was
+            # added behind our back since the last load
+            return getattr(self.load(), kind)(key)
+
+    def category(self, category_id: int) -> schemas.Category:
+        return self._by_id("category", category_id)
+
+    def status(self, status_id: int) -> schemas.Status:
+        return self._by_id("status", status_id)
+
+    def specialty(self, specialty_id: int) -> schemas.Specialty:
+        return self._by_id("specialty", specialty_id)
+
+    def specialty_for_category(self, category_id: int) -> Optional[int]:
+        """Specialty whose officers handle a category, or None"""
+        return self._by_id("specialty_for_category", category_id)
+
+    async def require_async(self, category_ids=(), status_ids=()) -> LookupSnapshot:
+        """The current snapshot, reloaded off the event loop if it is due or
+        lacks any of the given IDs, so reads by those IDs never block"""
+        snapshot = await self.current_async()
+        if any(key not in snapshot.categories for key in category_ids if key is not None) or \
+                any(key not in snapshot.statuses for key in status_ids if key is not None):
+            snapshot = await self.load_async()
+        return snapshot
+
+    def status_id(self, name: str) -> int:
+        """Status ID by name (case-insensitive); raises UnknownLookup"""
+        return self.current().status_id(name)
+
+    def active_status_ids(self) -> tuple:
+        """IDs of the ACTIVE_STATUSES that exist"""
+        return self.current().active_status_ids()
+
+
+lookup_registry = LookupRegistry(ttl_seconds=settings.LOOKUP_REGISTRY_TTL_SECONDS)
+lookup_registry.invalidate_on_commit(Category, Status, Specialty)
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordPoolSaturated(Exception):
+    """Raised when the password hashing pool has no free worker or queue slot"""
+
+
+class PasswordHasherPool:
+    """Bounded worker pool for bcrypt hashing and verification.
+
+    bcrypt releases the GIL while it works, so a small thread pool keeps the
+    event loop free without the overhead of a process pool. At most
+    ``max_workers + max_queue`` jobs are admitted at once; anything beyond
+    that is rejected immediately so callers can answer with a 503 instead of
+    queueing logins behind each other.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self.completed += 1
+        self._slots.release()
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run ``func(*args)`` on the pool, failing fast when it is saturated"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            logger.warning("Password hashing pool saturated, rejecting request")
+            raise PasswordPoolSaturated()
+
+        with self._lock:
+            self._in_flight += 1
+        future = self._executor.submit(func, *args)
+        # Release the slot when the job finishes, not when the caller stops
+        # waiting, so cancelled requests cannot over-admit work.
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> dict:
+        """Return a snapshot of pool usage counters"""
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "queue_limit": self.max_queue,
+                "in_flight": self._in_flight,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_pool = PasswordHasherPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_QUEUE_LIMIT,
+)
@@ -0,0 +1,182 @@
+import logging
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event, inspect, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, object_session
+
+from config import settings
+from models.models import User, Student, HallOfficer
+from services.cache import BoundedTTLCache
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Compact view of the authenticated user and the scope they act in"""
+    id: int
+    email: str
+    role: str
+    student_ID: Optional[int] = None
+    room_ID: Optional[int] = None
+    hall_ID: Optional[int] = None
+    scope_version: int = 0
+
+
+# Principals keyed by email (the token subject)
+principal_cache = BoundedTTLCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    default_ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+
+def _principal_statement(email: str):
+    # Student.user_ID and Hall_Officer.user_ID are unique, but databases
+    # created before those constraints may hold duplicates; the oldest row
+    # wins so the scope put into tokens is always the same. The second row
+    # fetched only reveals a duplicate.
+    return select(
+        User.id, User.email, User.role, User.scope_version,
+        Student.student_ID, Student.room_ID, HallOfficer.hall_ID
+    ).outerjoin(Student, Student.user_ID == User.id) \
+     .outerjoin(HallOfficer, HallOfficer.user_ID == User.id) \
+     .where(User.email == email) \
+     .order_by(Student.student_ID, HallOfficer.manager_ID) \
+     .limit(2)
+
+
+def _principal_from_rows(rows) -> Optional[Principal]:
+    if not rows:
+        return None
+    row = rows[0]
+    if len(rows) > 1:
+        logger.warning(
+            f"User {row.id} has more than one Student or Hall_Officer row; "
+            f"using student {row.student_ID}, hall {row.hall_ID}"
+        )
+    return Principal(
+        id=row.id,
+        email=row.email,
+        role=row.role,
+        student_ID=row.student_ID,
+        room_ID=row.room_ID,
+        hall_ID=row.hall_ID,
+        scope_version=row.scope_version or 0,
+    )
+
+
+def load_principal(db: Session, email: str) -> Optional[Principal]:
+    """Resolve a user and their student/hall scope in a single query"""
+    return _principal_from_rows(db.execute(_principal_statement(email)).all())
+
+
+async def load_principal_async(db: AsyncSession, email: str) -> Optional[Principal]:
+    """AsyncSession variant of load_principal"""
+    result = await db.execute(_principal_statement(email))
+    return _principal_from_rows(result.all())
+
+
+def get_principal(db: Session, email: str) -> Optional[Principal]:
+    """Return the cached principal for ``email``, loading it on a miss"""
+    principal = principal_cache.get(email)
+    if principal is None:
+        principal = load_principal(db, email)
+        if principal is not None:
+            principal_cache.set(email, principal)
+    return principal
+
+
+async def get_principal_async(db: AsyncSession, email: str) -> Optional[Principal]:
+    """AsyncSession variant of get_principal"""
+    principal = principal_cache.get(email)
+    if principal is None:
+        principal = await load_principal_async(db, email)
+        if principal is not None:
+            principal_cache.set(email, principal)
+    return principal
+
+
+def invalidate_principal(user_id: int) -> None:
+    """Drop any cached principal belonging to ``user_id``"""
+    if principal_cache.invalidate_where(lambda principal: principal.id == user_id):
+        logger.debug(f"Invalidated cached principal for user {user_id}")
+
+
+# User.scope_version is bumped, in the same transaction, whenever a user's
+# room or hall changes. Tokens embed the version they were minted with; a
+# refresh re-reads the scope, so access tokens (short-lived, and never checked
+# against the database) carry stale claims at most until they expire.
+def bump_scope_version(connection, user_id: int) -> None:
+    """Increment the stored scope version on the flushing connection"""
+    users = User.__table__
+    connection.execute(
+        update(users).where(users.c.id == user_id).values(scope_version=users.c.scope_version + 1)
+    )
+    logger.debug(f"Bumped scope version for user {user_id}")
+
+
+def principal_claims(principal: Principal) -> dict:
+    """Scope claims embedded in self-describing access tokens"""
+    return {
+        "sub": principal.email,
+        "uid": principal.id,
+        "role": principal.role,
+        "sid": principal.student_ID,
+        "rid": principal.room_ID,
+        "hid": principal.hall_ID,
+        "sv": principal.scope_version,
+    }
+
+
+def principal_from_claims(claims: dict) -> Principal:
+    return Principal(
+        id=claims["uid"],
+        email=claims["sub"],
+        role=claims["role"],
+        student_ID=claims.get("sid"),
+        room_ID=claims.get("rid"),
+        hall_ID=claims.get("hid"),
+        scope_version=claims.get("sv", 0),
+    )
+
+
+def _scope_changed(connection, target, bump: bool) -> None:
+    invalidate_principal(target.user_ID)
+    if bump:
+        bump_scope_version(connection, target.user_ID)
+    # Drop this worker's copies again once the change is visible, in case
+    # they were reloaded in between
+    session = object_session(target)
+    if session is not None:
+        session.info.setdefault("scope_changed_users", set()).add(target.user_ID)
+
+
+# Student and Hall_Officer rows define a principal's scope, so any change to
+# them must evict the owning user's cached principal and, when the room or
+# hall assignment moves, invalidate tokens carrying the old scope.
+@event.listens_for(Student, "after_insert")
+@event.listens_for(Student, "after_delete")
+@event.listens_for(HallOfficer, "after_insert")
+@event.listens_for(HallOfficer, "after_delete")
+def _scope_row_added_or_removed(mapper, connection, target):
+    _scope_changed(connection, target, bump=True)
+
+
+@event.listens_for(Student, "after_update")
+@event.listens_for(HallOfficer, "after_update")
+def _scope_row_changed(mapper, connection, target):
+    scope_column = "room_ID" if isinstance(target, Student) else "hall_ID"
+    _scope_changed(connection, target, bump=inspect(target).attrs[scope_column].history.has_changes())
+
+
+@event.listens_for(Session, "after_commit")
+def _scope_change_committed(session):
+    for user_id in session.info.pop("scope_changed_users", ()):
+        invalidate_principal(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _scope_change_rolled_back(session):
+    session.info.pop("scope_changed_users", None)
@@ -0,0 +1,73 @@
+import csv
+import io
+import json
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Iterator
+
+from crud.maintenance_request_crud import EXPORT_FIELDS, stream_maintenance_requests, hydrate_projection
+from database.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+# Rows written per chunk handed to the response; keeps the number of tiny
+# writes down without holding much in memory
+CHUNK_ROWS = 500
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _ndjson_chunks(rows) -> Iterator[str]:
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(hydrate_projection(row), default=_json_default))
+        if len(lines) >= CHUNK_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def _csv_chunks(rows) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(EXPORT_FIELDS)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow(["" if value is None else value for value in hydrate_projection(row).values()])
+        if count % CHUNK_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def export_maintenance_requests(export_format: str, **filters) -> Iterator[str]:
+    """Stream matching requests as NDJSON or CSV text chunks.
+
+    Owns its session: the request's session is gone by the time a streaming
+    body is consumed, and the cursor has to stay open for the whole export.
+    """
+    db = SessionLocal()
+    try:
+        rows = stream_maintenance_requests(db, **filters)
+        if export_format == "csv":
+            yield from _csv_chunks(rows)
+        else:
+            yield from _ndjson_chunks(rows)
+    except Exception as e:
+        logger.error(f"Maintenance request export failed: {e}")
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,247 @@
+import csv
+import io
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import BinaryIO, Iterator, List, Optional, TextIO, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from config import settings
+from crud.active_request_crud import materialize_missing_statement
+from database.database import SessionLocal
+from models.models import MaintenanceRequest, Student
+from schemas.schemas import MaintenanceRequestImport
+from services.lookup_registry import lookup_registry, PENDING
+from services.topology import topology
+from services.watermark import requests_changed
+from services.event_bus import event_bus
+from services.dispatch import dispatcher
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("csv", "ndjson")
+
+
+@dataclass
+class ImportSummary:
+    total: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: List[dict] = field(default_factory=list)
+    errors_truncated: bool = False
+
+
+def read_rows(stream: TextIO, import_format: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Yield (row number, fields, parse error) one row at a time.
+
+    Empty CSV cells are dropped so schema defaults apply. Row numbers are
+    1-based data rows (the CSV header is not counted).
+    """
+    if import_format == "csv":
+        for number, row in enumerate(csv.DictReader(stream), start=1):
+            yield number, {key: value for key, value in row.items() if key and value not in ("", None)}, None
+        return
+
+    number = 0
+    for line in stream:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield number, None, "Each line must be a JSON object"
+            continue
+        yield number, row, None
+
+
+def _validation_messages(e: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()]
+
+
+class RequestImporter:
+    """Validates and inserts maintenance requests in chunks.
+
+    Student, room, category and status references are checked against maps
+    loaded once up front (rooms and lookups from the in-memory snapshots)
+    instead of per row, and each chunk goes to the
+    database as a single executemany INSERT. A bad row is reported and
+    skipped; it never aborts the rest of the import.
+    """
+
+    def __init__(self, db: Session, chunk_size: int = None, max_errors: int = None):
+        self.db = db
+        self.chunk_size = chunk_size or settings.IMPORT_CHUNK_SIZE
+        self.max_errors = max_errors or settings.IMPORT_MAX_ERRORS
+        self.summary = ImportSummary()
+        self._loaded = False
+
+    def preload(self) -> None:
+        db = self.db
+        self.student_rooms = {}
+        self.student_numbers = {}
+        for student_id, student_number, room_id in db.execute(
+            select(Student.student_ID, Student.student_number, Student.room_ID)
+        ):
+            self.student_rooms[student_id] = room_id
+            if student_number:
+                self.student_numbers[student_number] = student_id
+        self.rooms = set(topology.current().rooms)
+        lookups = lookup_registry.current()
+        self.categories = lookups.category_ids
+        self.category_ids = set(lookups.categories)
+        self.statuses = set(lookups.statuses)
+        self.pending_status = lookups.status_id(PENDING)
+        self._loaded = True
+
+    def _fail(self, number: int, errors: List[str]) -> None:
+        self.summary.failed += 1
+        if len(self.summary.errors) < self.max_errors:
+            self.summary.errors.append({"row": number, "errors": errors})
+        else:
+            self.summary.errors_truncated = True
+
+    def _resolve(self, row: MaintenanceRequestImport) -> Tuple[Optional[dict], List[str]]:
+        errors = []
+
+        student_id = row.student_ID
+        if student_id is None and row.student_number is not None:
+            student_id = self.student_numbers.get(row.student_number)
+            if student_id is None:
+                errors.append(f"student_number: unknown student {row.student_number}")
+        elif student_id is None:
+            errors.append("student_ID: student_ID or student_number is required")
+        elif student_id not in self.student_rooms:
+            errors.append(f"student_ID: unknown student {student_id}")
+
+        room_id = row.room_ID
+        if room_id is None and student_id in self.student_rooms:
+            room_id = self.student_rooms[student_id]
+            if room_id is None:
+                errors.append("room_ID: not given and the student has no room")
+        elif room_id is not None and room_id not in self.rooms:
+            errors.append(f"room_ID: unknown room {room_id}")
+
+        category_id = row.category_ID
+        if category_id is None and row.category_name is not None:
+            category_id = self.categories.get(row.category_name.lower())
+            if category_id is None:
+                errors.append(f"category_name: unknown category {row.category_name}")
+        elif category_id is None:
+            errors.append("category_ID: category_ID or category_name is required")
+        elif category_id not in self.category_ids:
+            errors.append(f"category_ID: unknown category {category_id}")
+
+        status_id = self.pending_status if row.status_ID is None else row.status_ID
+        if status_id not in self.statuses:
+            errors.append(f"status_ID: unknown status {status_id}")
+
+        if errors:
+            return None, errors
+
+        now = datetime.now().replace(microsecond=0)
+        submitted = row.submission_timestamp or now
+        return {
+            "student_ID": student_id,
+            "room_ID": room_id,
+            "category_ID": category_id,
+            "status_ID": status_id,
+            "description": row.description,
+            "availability": row.availability,
+            "estimated_cost": row.estimated_cost,
+            "actual_cost": row.actual_cost,
+            "submission_timestamp": submitted,
+            # The row is written now, whatever its submission date, so the
+            # changes feed picks up backfilled records
+            "last_updated": now,
+            "completion_timestamp": row.completion_timestamp,
+            "version": 1,
+        }, []
+
+    def _max_issue_id(self) -> int:
+        """New rows get IDs above this, so active_requests can pick them up by range"""
+        return self.db.scalar(select(func.coalesce(func.max(MaintenanceRequest.issue_ID), 0)))
+
+    def _insert(self, pending: List[Tuple[int, dict]]) -> None:
+        if not pending:
+            return
+        table = MaintenanceRequest.__table__
+        try:
+            after_id = self._max_issue_id()
+            self.db.execute(insert(table), [values for _, values in pending])
+            self.db.execute(materialize_missing_statement(after_id=after_id))
+            self.db.commit()
+            self.summary.imported += len(pending)
+            return
+        except SQLAlchemyError as e:
+            self.db.rollback()
+            logger.warning(f"Import chunk of {len(pending)} rows failed, retrying row by row: {e}")
+
+        # Isolate the offending rows so the rest of the chunk still lands
+        after_id = self._max_issue_id()
+        for number, values in pending:
+            try:
+                self.db.execute(insert(table), values)
+                self.db.execute(materialize_missing_statement(after_id=after_id))
+                self.db.commit()
+                self.summary.imported += 1
+            except SQLAlchemyError as e:
+                self.db.rollback()
+                self._fail(number, [f"database: {e.__class__.__name__}: {getattr(e, 'orig', e)}"])
+
+    def run(self, stream: TextIO, import_format: str) -> ImportSummary:
+        if not self._loaded:
+            self.preload()
+
+        pending: List[Tuple[int, dict]] = []
+        for number, data, parse_error in read_rows(stream, import_format):
+            self.summary.total += 1
+            if parse_error:
+                self._fail(number, [parse_error])
+                continue
+            try:
+                row = MaintenanceRequestImport.model_validate(data)
+            except ValidationError as e:
+                self._fail(number, _validation_messages(e))
+                continue
+
+            values, errors = self._resolve(row)
+            if errors:
+                self._fail(number, errors)
+                continue
+            pending.append((number, values))
+            if len(pending) >= self.chunk_size:
+                self._insert(pending)
+                pending = []
+
+        self._insert(pending)
+        requests_changed()
+        if self.summary.imported:
+            # One summary event for unscoped (admin/maintenance) subscribers
+            # rather than one per backfilled row
+            event_bus.publish("requests.imported", {"imported": self.summary.imported})
+            dispatcher.backlog_changed()
+        logger.info(
+            f"Imported {self.summary.imported} of {self.summary.total} maintenance requests "
+            f"({self.summary.failed} failed)"
+        )
+        return self.summary
+
+
+def import_maintenance_requests(source: BinaryIO, import_format: str, chunk_size: int = None) -> ImportSummary:
+    """Import from a binary stream (upload spool or open file) with its own session"""
+    # utf-8-sig drops the BOM spreadsheet tools like to prepend
+    text = io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+    db = SessionLocal()
+    try:
+        return RequestImporter(db, chunk_size=chunk_size).run(text, import_format)
+    finally:
+        db.close()
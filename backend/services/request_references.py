@@ -0,0 +1,115 @@
+import logging
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+
+from config import settings
+from models.models import User, Student, Room, Hall
+from schemas import schemas
+from services.cache import BoundedTTLCache
+
+logger = logging.getLogger(__name__)
+
+# Serialized objects nested in a MaintenanceRequest response, keyed by
+# (kind, primary key). Lets a write path build its response without
+# re-selecting the row with all of its joins.
+reference_cache = BoundedTTLCache(
+    max_entries=settings.REFERENCE_CACHE_MAX_ENTRIES,
+    default_ttl=settings.REFERENCE_CACHE_TTL_SECONDS,
+)
+
+# kind -> (model, loader options, response schema). Rooms are not cached
+# here; they come from the topology snapshot.
+_REFERENCES = {
+    "student": (
+        Student,
+        (joinedload(Student.user), joinedload(Student.room).joinedload(Room.hall)),
+        schemas.Student,
+    ),
+}
+
+
+def _statement(kind: str, key: int):
+    model, options, _ = _REFERENCES[kind]
+    return select(model).options(*options).where(inspect(model).primary_key[0] == key)
+
+
+def _many_statement(kind: str, keys: List[int]):
+    model, options, _ = _REFERENCES[kind]
+    return select(model).options(*options).where(inspect(model).primary_key[0].in_(keys))
+
+
+def _cached(kind: str, keys: Iterable[int]) -> Tuple[Dict[int, dict], List[int]]:
+    values, missing = {}, []
+    for key in dict.fromkeys(keys):
+        value = reference_cache.get((kind, key))
+        if value is None:
+            missing.append(key)
+        else:
+            values[key] = value
+    return values, missing
+
+
+def _store_all(kind: str, values: Dict[int, dict], objs) -> Dict[int, dict]:
+    key_name = inspect(_REFERENCES[kind][0]).primary_key[0].key
+    for obj in objs:
+        key = getattr(obj, key_name)
+        values[key] = _store(kind, key, obj)
+    return values
+
+
+def _store(kind: str, key: int, obj) -> Optional[dict]:
+    if obj is None:
+        return None
+    value = _REFERENCES[kind][2].model_validate(obj).model_dump()
+    reference_cache.set((kind, key), value)
+    return value
+
+
+def get_reference(db: Session, kind: str, key: int) -> Optional[dict]:
+    """Serialized ``kind`` with primary key ``key``, loading it on a miss"""
+    value = reference_cache.get((kind, key))
+    if value is None:
+        value = _store(kind, key, db.execute(_statement(kind, key)).scalars().first())
+    return value
+
+
+async def get_reference_async(db: AsyncSession, kind: str, key: int) -> Optional[dict]:
+    """AsyncSession variant of get_reference"""
+    value = reference_cache.get((kind, key))
+    if value is None:
+        result = await db.execute(_statement(kind, key))
+        value = _store(kind, key, result.scalars().first())
+    return value
+
+
+def get_references(db: Session, kind: str, keys: Iterable[int]) -> Dict[int, dict]:
+    """Serialized ``kind`` for each of ``keys``, loading all misses in one query"""
+    values, missing = _cached(kind, keys)
+    if missing:
+        values = _store_all(kind, values, db.execute(_many_statement(kind, missing)).scalars())
+    return values
+
+
+async def get_references_async(db: AsyncSession, kind: str, keys: Iterable[int]) -> Dict[int, dict]:
+    """AsyncSession variant of get_references"""
+    values, missing = _cached(kind, keys)
+    if missing:
+        result = await db.execute(_many_statement(kind, missing))
+        values = _store_all(kind, values, result.scalars())
+    return values
+
+
+# Cached values embed related rows (a student embeds its user, room and
+# hall), so any change to one of these tables drops the whole cache. They
+# change rarely and the cache refills on demand.
+def _clear_references(mapper, connection, target):
+    reference_cache.clear()
+    logger.debug(f"Reference cache cleared after {mapper.class_.__name__} change")
+
+
+for _model in (User, Student, Room, Hall):
+    event.listen(_model, "after_update", _clear_references)
+    event.listen(_model, "after_delete", _clear_references)
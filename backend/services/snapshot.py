@@ -0,0 +1,126 @@
+import logging
+import threading
+import time
+from typing import Generic, Optional, TypeVar
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from database.database import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+S = TypeVar("S")
+
+
+class SnapshotRegistry(Generic[S]):
+    """Holds an immutable snapshot of slow-changing reference tables.
+
+    Readers get the current snapshot; a reload builds a complete new one and
+    swaps it in, so nobody ever sees a half-loaded view. The snapshot is
+    rebuilt on first use after ``invalidate`` (wired to the source models with
+    ``invalidate_on_commit``) or once it is older than ``ttl_seconds``, which
+    picks up edits made directly in SQL. Subclasses implement ``_build``.
+    """
+
+    name = "snapshot"
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[S] = None
+        self._loaded_at = 0.0
+        self._stale = True
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def _build(self, db: Session, version: int) -> S:
+        raise NotImplementedError
+
+    def _describe(self, snapshot: S) -> str:
+        return ""
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def load(self, db: Session = None) -> S:
+        """Reload now, using ``db`` if given or a session of its own"""
+        with self._lock:
+            own_session = db is None
+            if own_session:
+                db = SessionLocal()
+            try:
+                # Cleared before reading so a change during the load marks it stale again
+                self._stale = False
+                snapshot = self._build(db, self._version + 1)
+            except Exception:
+                self._stale = True
+                raise
+            finally:
+                if own_session:
+                    db.close()
+            self._version += 1
+            self._loaded_at = time.monotonic()
+            self._snapshot = snapshot
+        logger.info(f"{self.name} v{self._version}: {self._describe(snapshot)}")
+        return snapshot
+
+    def _due(self) -> bool:
+        return self._snapshot is None or self._stale or time.monotonic() - self._loaded_at > self.ttl_seconds
+
+    def current(self) -> S:
+        """The current snapshot, reloading first if it is stale or expired"""
+        snapshot = self._snapshot
+        if self._due():
+            try:
+                return self.load()
+            except Exception as e:
+                # Serve the previous snapshot rather than failing on a transient error
+                if snapshot is None:
+                    raise
+                logger.error(f"{self.name} reload failed, serving v{self._version}: {e}")
+        return snapshot
+
+    async def current_async(self) -> S:
+        """current() for the event loop: a due reload (blocking queries and
+        the reload lock) runs in the threadpool"""
+        if self._due():
+            return await run_in_threadpool(self.current)
+        return self._snapshot
+
+    async def load_async(self) -> S:
+        """load() in the threadpool"""
+        return await run_in_threadpool(self.load)
+
+    def invalidate(self) -> None:
+        self._stale = True
+
+    def invalidate_on_commit(self, *models) -> None:
+        """Invalidate once a session that wrote any of ``models`` commits.
+
+        Flush hooks only note the registry on the session: invalidating at
+        flush time would let a concurrent reload cache the pre-commit rows,
+        and nothing would mark them stale again until the TTL ran out.
+        """
+        def changed(mapper, connection, target):
+            session = object_session(target)
+            if session is None:
+                self.invalidate()
+            else:
+                session.info.setdefault("stale_snapshots", set()).add(self)
+
+        for model in models:
+            for event_name in ("after_insert", "after_update", "after_delete"):
+                event.listen(model, event_name, changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _snapshot_sources_committed(session):
+    for registry in session.info.pop("stale_snapshots", ()):
+        registry.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _snapshot_sources_rolled_back(session):
+    session.info.pop("stale_snapshots", None)
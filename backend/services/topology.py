@@ -0,0 +1,125 @@
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.models import Hall, Room
+from schemas import schemas
+from services.snapshot import SnapshotRegistry
+
+
+class UnknownRoom(KeyError):
+    """A room or hall ID that is not in the topology"""
+
+    def __init__(self, kind: str, key: int):
+        super().__init__(f"Unknown {kind}: {key}")
+        self.kind = kind
+        self.key = key
+
+    def __str__(self):
+        return self.args[0]
+
+
+@dataclass(frozen=True)
+class TopologySnapshot:
+    """Immutable view of the hall/room tree at one version.
+
+    ``rooms`` holds each room serialized with its hall, as nested in a
+    MaintenanceRequest response; ``hall_rooms`` lists the room IDs of each
+    hall so a hall filter can become ``room_ID IN (...)``.
+    """
+    version: int
+    halls: Dict[int, schemas.Hall] = field(default_factory=dict)
+    rooms: Dict[int, schemas.Room] = field(default_factory=dict)
+    hall_rooms: Dict[int, Tuple[int, ...]] = field(default_factory=dict)
+
+    def hall(self, hall_id: int) -> schemas.Hall:
+        try:
+            return self.halls[hall_id]
+        except KeyError:
+            raise UnknownRoom("hall", hall_id) from None
+
+    def room(self, room_id: int) -> schemas.Room:
+        try:
+            return self.rooms[room_id]
+        except KeyError:
+            raise UnknownRoom("room", room_id) from None
+
+    def room_ids(self, hall_id: int) -> Tuple[int, ...]:
+        """Rooms of ``hall_id``; empty for a hall with no rooms or no such hall"""
+        return self.hall_rooms.get(hall_id, ())
+
+
+def _load_snapshot(db: Session, version: int) -> TopologySnapshot:
+    halls = {
+        row.hall_ID: schemas.Hall.model_validate(row)
+        for row in db.execute(select(Hall)).scalars()
+    }
+    rooms = {}
+    hall_rooms: Dict[int, list] = {hall_id: [] for hall_id in halls}
+    for row in db.execute(select(Room).order_by(Room.hall_ID, Room.room_number)).scalars():
+        hall = halls[row.hall_ID]
+        rooms[row.room_ID] = schemas.Room(
+            room_ID=row.room_ID,
+            room_number=row.room_number,
+            hall_ID=row.hall_ID,
+            floor_number=row.floor_number,
+            created_at=row.created_at,
+            hall=hall,
+        )
+        hall_rooms[row.hall_ID].append(row.room_ID)
+    return TopologySnapshot(
+        version=version,
+        halls=halls,
+        rooms=rooms,
+        hall_rooms={hall_id: tuple(ids) for hall_id, ids in hall_rooms.items()},
+    )
+
+
+class Topology(SnapshotRegistry[TopologySnapshot]):
+    """In-process copy of the Hall and Room tables.
+
+    Request responses take their room and hall from here instead of joining
+    them, and hall scoping filters on the hall's room IDs. Reloaded when a
+    hall or room changes through the ORM or when the snapshot is older than
+    ``ttl_seconds``.
+    """
+
+    name = "Topology"
+
+    def _build(self, db: Session, version: int) -> TopologySnapshot:
+        return _load_snapshot(db, version)
+
+    def _describe(self, snapshot: TopologySnapshot) -> str:
+        return f"{len(snapshot.halls)} halls, {len(snapshot.rooms)} rooms"
+
+    def room(self, room_id: Optional[int]) -> Optional[schemas.Room]:
+        """Room with its hall, or None for a missing room_ID"""
+        if room_id is None:
+            return None
+        try:
+            return self.current().room(room_id)
+        except UnknownRoom:
+            # Requests reference rooms by foreign key, so a miss means one
+            # was added behind our back since the last load
+            return self.load().room(room_id)
+
+    async def require_async(self, room_ids=()) -> TopologySnapshot:
+        """The current snapshot, reloaded off the event loop if it is due or
+        lacks any of ``room_ids``, so room reads never block"""
+        snapshot = await self.current_async()
+        if any(room_id not in snapshot.rooms for room_id in room_ids if room_id is not None):
+            snapshot = await self.load_async()
+        return snapshot
+
+    def hall(self, hall_id: int) -> schemas.Hall:
+        return self.current().hall(hall_id)
+
+    def room_ids(self, hall_id: int) -> Tuple[int, ...]:
+        return self.current().room_ids(hall_id)
+
+
+topology = Topology(ttl_seconds=settings.TOPOLOGY_TTL_SECONDS)
+topology.invalidate_on_commit(Hall, Room)
@@ -0,0 +1,127 @@
+import hashlib
+import threading
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.models import MaintenanceRequest
+from services.cache import BoundedTTLCache
+from services.lookup_registry import lookup_registry
+from services.topology import topology
+
+# Per-scope watermark of the maintenance request table, keyed by
+# (student_id, hall_id). Cleared by every write in this process; the short
+# TTL bounds how long a write made by another worker can go unnoticed.
+watermark_cache = BoundedTTLCache(
+    max_entries=settings.LIST_WATERMARK_MAX_SCOPES,
+    default_ttl=settings.LIST_WATERMARK_TTL_SECONDS,
+)
+
+
+def _watermark_select(student_id: Optional[int], hall_id: Optional[int]):
+    """Aggregates that change whenever a row in scope is inserted, updated or deleted.
+
+    last_updated alone only has whole-second resolution, so the version sum
+    (bumped by every update) and the highest ID (bumped by every insert)
+    are folded in as well.
+    """
+    statement = select(
+        func.count(),
+        func.max(MaintenanceRequest.issue_ID),
+        func.max(MaintenanceRequest.last_updated),
+        func.coalesce(func.sum(MaintenanceRequest.version), 0),
+    )
+    if student_id is not None:
+        statement = statement.where(MaintenanceRequest.student_ID == student_id)
+    if hall_id is not None:
+        statement = statement.where(MaintenanceRequest.room_ID.in_(topology.room_ids(hall_id)))
+    return statement
+
+
+def _as_key(row) -> tuple:
+    count, max_id, max_updated, version_sum = row
+    return count, max_id, max_updated.isoformat() if max_updated else None, int(version_sum)
+
+
+def request_watermark(db: Session, student_id: Optional[int] = None, hall_id: Optional[int] = None) -> tuple:
+    """Watermark of the requests visible in a scope, from cache where possible"""
+    scope = (student_id, hall_id)
+    watermark = watermark_cache.get(scope)
+    if watermark is None:
+        watermark = _as_key(db.execute(_watermark_select(student_id, hall_id)).one())
+        watermark_cache.set(scope, watermark)
+    return watermark
+
+
+async def request_watermark_async(
+    db: AsyncSession, student_id: Optional[int] = None, hall_id: Optional[int] = None
+) -> tuple:
+    """AsyncSession variant of request_watermark"""
+    scope = (student_id, hall_id)
+    watermark = watermark_cache.get(scope)
+    if watermark is None:
+        result = await db.execute(_watermark_select(student_id, hall_id))
+        watermark = _as_key(result.one())
+        watermark_cache.set(scope, watermark)
+    return watermark
+
+
+def requests_changed() -> None:
+    """Call after committing any write to maintenance requests"""
+    watermark_cache.clear()
+
+
+def list_etag(watermark: tuple, *parts) -> str:
+    """Weak ETag for a listing: the scope's watermark plus whatever shapes the page.
+
+    Responses also embed lookup and topology data, so their snapshot
+    versions are part of the tag.
+    """
+    key = repr((watermark, lookup_registry.version, topology.version, parts))
+    return f'W/"{hashlib.sha1(key.encode()).hexdigest()[:20]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against ``etag``"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    return any(
+        (tag[2:] if tag.startswith("W/") else tag) == opaque
+        for tag in (part.strip() for part in if_none_match.split(","))
+    )
+
+
+class ConditionalGetStats:
+    """Counts, per endpoint, how many list requests were answered with 304"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def record(self, endpoint: str, conditional: bool, not_modified: bool) -> None:
+        with self._lock:
+            counts = self._counts.setdefault(endpoint, [0, 0, 0])
+            counts[0] += 1
+            counts[1] += conditional
+            counts[2] += not_modified
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                endpoint: {
+                    "requests": requests,
+                    "conditional": conditional,
+                    "not_modified": not_modified,
+                    "not_modified_ratio": round(not_modified / requests, 3) if requests else 0.0,
+                }
+                for endpoint, (requests, conditional, not_modified) in self._counts.items()
+            }
+
+
+conditional_get_stats = ConditionalGetStats()
@@ -0,0 +1,58 @@
+import asyncio
+import logging
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from config import settings
+from database.database import SessionLocal
+from crud.officer_workload_crud import roll_over_week
+
+logger = logging.getLogger(__name__)
+
+
+class WorkloadRollover:
+    """Starts a new week of officer hours once the calendar week changes.
+
+    Checks every ``interval_seconds``; the check is one locking SELECT that
+    finds nothing to do except in the first run after Monday 00:00, and
+    roll_over_week is idempotent, so every worker can run one. ``python
+    run.py --roll-over-week`` does the same from cron.
+    """
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._task: Optional[asyncio.Task] = None
+
+    def _roll(self) -> int:
+        db = SessionLocal()
+        try:
+            return roll_over_week(db)
+        finally:
+            db.close()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                rolled = await run_in_threadpool(self._roll)
+                if rolled:
+                    logger.info(f"📅 Started a new workload week for {rolled} officers")
+            except Exception as e:
+                logger.error(f"Workload rollover failed: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+workload_rollover = WorkloadRollover(interval_seconds=settings.WORKLOAD_ROLLOVER_CHECK_SECONDS)
@@ -0,0 +1,140 @@
+"""
+Shared fixtures: the app served over an in-memory SQLite database.
+
+SessionLocal is rebound to the test engine before anything opens a session,
+so get_db and the snapshot registries read the seeded data below. Run from
+backend/:
+
+    python -m pytest tests
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+import bcrypt
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.dialects.mysql import ENUM
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import StaticPool
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from crud.active_request_crud import rebuild_active_requests
+from database.database import SessionLocal
+from database.instrumentation import install_query_instrumentation
+from models.models import (
+    Base, Category, Hall, HallOfficer, MaintenanceOfficer, MaintenanceRequest, Room, Specialty, Status, Student, User
+)
+
+PASSWORD = "secret123"
+
+CATEGORIES = ["Electrical", "Plumbing", "Carpentry", "Welding", "General Maintenance"]
+STATUSES = ["Pending", "Assigned", "In Progress", "Completed", "Canceled", "On Hold"]
+SPECIALTIES = ["Electrical", "Plumbing", "Carpentry", "General Maintenance"]
+
+
+@compiles(ENUM, "sqlite")
+def _sqlite_enum(element, compiler, **kw):
+    # User.role is a MySQL ENUM; SQLite only needs somewhere to put it
+    return "VARCHAR(32)"
+
+
+test_engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+install_query_instrumentation(test_engine)
+SessionLocal.configure(bind=test_engine)
+
+
+def seed(db):
+    """Two halls with one room and one student each, and 30 requests split between them"""
+    password = bcrypt.hashpw(PASSWORD.encode("utf-8"), bcrypt.gensalt(4)).decode("utf-8")
+    db.add_all(Category(category_name=name) for name in CATEGORIES)
+    db.add_all(Status(status_name=name) for name in STATUSES)
+    db.add_all(Specialty(specialty_name=name) for name in SPECIALTIES)
+    db.add_all([
+        User(name="Admin", email="admin@university.edu", password=password, role="admin"),
+        User(name="Hall Officer", email="officer@university.edu", password=password, role="hall officer"),
+        User(name="Jane Student", email="jane@university.edu", password=password, role="student"),
+        User(name="Bob Fixer", email="bob@university.edu", password=password, role="maintenance officer"),
+        User(name="Tom Student", email="tom@university.edu", password=password, role="student"),
+    ])
+    db.flush()
+    db.add(HallOfficer(user_ID=2))
+    db.flush()
+    db.add_all([Hall(hall_name="Peter", manager_ID=1), Hall(hall_name="Paul", manager_ID=1)])
+    db.flush()
+    db.query(HallOfficer).update({"hall_ID": 1})
+    db.add_all([
+        Room(room_number="101A", hall_ID=1, floor_number=1),
+        Room(room_number="201B", hall_ID=2, floor_number=2),
+    ])
+    db.flush()
+    db.add_all([
+        Student(user_ID=3, student_number="S1", room_ID=1),
+        Student(user_ID=5, student_number="S2", room_ID=2),
+    ])
+    db.add(MaintenanceOfficer(user_ID=4, specialty_ID=1, employee_number="E1"))
+    db.flush()
+    submitted = datetime(2025, 1, 1)
+    for i in range(30):
+        db.add(MaintenanceRequest(
+            student_ID=1 + i % 2, room_ID=1 + i % 2, category_ID=1 + i % 5, status_ID=1 + i % 4,
+            description=f"Issue {i}",
+            submission_timestamp=submitted + timedelta(minutes=i),
+            last_updated=submitted + timedelta(minutes=i),
+        ))
+    db.commit()
+    # Requests added straight through the ORM skip the active_requests upkeep
+    rebuild_active_requests(db)
+
+
+@pytest.fixture(scope="session")
+def engine():
+    from services.lookup_registry import lookup_registry
+    from services.topology import topology
+
+    Base.metadata.create_all(test_engine)
+    db = SessionLocal()
+    try:
+        seed(db)
+        lookup_registry.load(db)
+        topology.load(db)
+    finally:
+        db.close()
+    return test_engine
+
+
+@pytest.fixture(scope="session")
+def client(engine):
+    from main import app
+
+    # Not entered as a context manager, so the background services started
+    # on lifespan (health monitor, dispatcher, ...) stay off
+    return TestClient(app)
+
+
+@pytest.fixture(scope="session")
+def sign_in(client):
+    """Log a seeded user in; returns the login response body"""
+
+    def body(email):
+        response = client.post("/api/v1/auth/login", json={"email": email, "password": PASSWORD})
+        assert response.status_code == 200, response.text
+        return response.json()
+
+    return body
+
+
+@pytest.fixture(scope="session")
+def login(sign_in):
+    """Bearer headers for a seeded user, cached per email"""
+    tokens = {}
+
+    def headers(email):
+        if email not in tokens:
+            tokens[email] = {"Authorization": f"Bearer {sign_in(email)['access_token']}"}
+        return tokens[email]
+
+    return headers
@@ -0,0 +1,55 @@
+from jose import jwt
+
+from api.routes.auth import create_access_token
+from database.database import SessionLocal
+from database.instrumentation import assert_max_queries
+from models.models import Student
+
+AUTH = "/api/v1/auth"
+
+
+def move_student(user_id, room_id):
+    db = SessionLocal()
+    try:
+        db.query(Student).filter(Student.user_ID == user_id).one().room_ID = room_id
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_access_tokens_are_checked_without_queries(client, engine, login):
+    headers = login("jane@university.edu")
+    client.get(f"{AUTH}/verify", headers=headers)
+
+    with assert_max_queries(0, engine):
+        response = client.get(f"{AUTH}/verify", headers=headers)
+
+    assert response.status_code == 200
+
+
+def test_refresh_reissues_tokens_with_the_current_scope(client, sign_in):
+    tokens = sign_in("tom@university.edu")
+    claims = jwt.get_unverified_claims(tokens["access_token"])
+    assert claims["rid"] == 2
+
+    move_student(5, 1)
+    try:
+        # The old access token stays valid until it expires
+        old = {"Authorization": f"Bearer {tokens['access_token']}"}
+        assert client.get(f"{AUTH}/verify", headers=old).status_code == 200
+
+        response = client.post(f"{AUTH}/refresh", json={"refresh_token": tokens["refresh_token"]})
+        assert response.status_code == 200
+        refreshed = jwt.get_unverified_claims(response.json()["access_token"])
+        assert refreshed["rid"] == 1
+        assert refreshed["sv"] == claims["sv"] + 1
+    finally:
+        move_student(5, 2)
+
+
+def test_refresh_rejects_a_scope_version_from_the_future(client, sign_in):
+    claims = jwt.get_unverified_claims(sign_in("jane@university.edu")["refresh_token"])
+    forged = create_access_token({**claims, "sv": claims["sv"] + 1})
+    response = client.post(f"{AUTH}/refresh", json={"refresh_token": forged})
+
+    assert response.status_code == 401
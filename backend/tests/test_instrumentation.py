@@ -0,0 +1,50 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from database.instrumentation import assert_max_queries
+
+REQUESTS = "/api/v1/maintenance-requests"
+
+
+def test_assert_max_queries_passes_within_budget(client, engine, login):
+    headers = login("jane@university.edu")
+    client.get(f"{REQUESTS}/", headers=headers)
+
+    with assert_max_queries(2, engine) as stats:
+        response = client.get(f"{REQUESTS}/", headers=headers)
+
+    assert response.status_code == 200
+    assert 0 < stats.count <= 2
+
+
+def test_assert_max_queries_fails_over_budget(client, engine, login):
+    headers = login("jane@university.edu")
+    client.get(f"{REQUESTS}/", headers=headers)
+
+    with pytest.raises(AssertionError, match="Expected at most 0 queries"):
+        with assert_max_queries(0, engine):
+            client.get(f"{REQUESTS}/", headers=headers)
+
+
+def test_server_timing_counts_request_statements(client, login):
+    response = client.get(f"{REQUESTS}/", headers=login("jane@university.edu"))
+
+    assert response.status_code == 200
+    assert "queries" in response.headers["Server-Timing"]
+
+
+def test_streamed_responses_have_no_server_timing(client, login):
+    response = client.get(f"{REQUESTS}/export", headers=login("admin@university.edu"))
+
+    assert response.status_code == 200
+    assert response.text
+    assert "Server-Timing" not in response.headers
+
+
+def test_failed_statement_leaves_no_timing_state(engine):
+    with engine.connect() as conn:
+        with pytest.raises(OperationalError):
+            conn.execute(text("SELECT * FROM no_such_table"))
+        conn.execute(text("SELECT 1"))
+        assert "query_start_time" not in conn.info
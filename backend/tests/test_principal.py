@@ -0,0 +1,34 @@
+import logging
+from collections import namedtuple
+
+from database.database import SessionLocal
+from services.principal import _principal_from_rows, load_principal
+
+Row = namedtuple("Row", "id email role scope_version student_ID room_ID hall_ID")
+
+
+def test_first_of_duplicate_scope_rows_wins_and_is_logged(caplog):
+    rows = [
+        Row(7, "dup@university.edu", "hall officer", 0, None, None, 1),
+        Row(7, "dup@university.edu", "hall officer", 0, None, None, 2),
+    ]
+
+    with caplog.at_level(logging.WARNING, logger="services.principal"):
+        principal = _principal_from_rows(rows)
+
+    assert principal.hall_ID == 1
+    assert "more than one" in caplog.text
+
+
+def test_load_principal_resolves_scope(engine):
+    db = SessionLocal()
+    try:
+        officer = load_principal(db, "officer@university.edu")
+        student = load_principal(db, "jane@university.edu")
+        missing = load_principal(db, "nobody@university.edu")
+    finally:
+        db.close()
+
+    assert (officer.role, officer.hall_ID, officer.student_ID) == ("hall officer", 1, None)
+    assert (student.student_ID, student.room_ID) == (1, 1)
+    assert missing is None
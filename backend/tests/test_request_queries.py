@@ -0,0 +1,25 @@
+import pytest
+
+from database.instrumentation import assert_max_queries
+
+REQUESTS = "/api/v1/maintenance-requests"
+
+# Responses join each request's student and user (RESPONSE_GRAPH) and take
+# rooms, halls and lookups from the in-memory snapshots; /active reads the
+# materialized active_requests table. An N+1 regression adds a statement per
+# row and blows the budget.
+ENDPOINTS = [f"{REQUESTS}/", f"{REQUESTS}/active", f"{REQUESTS}/hall/1", f"{REQUESTS}/3"]
+
+
+@pytest.mark.parametrize("email", ["admin@university.edu", "officer@university.edu"])
+@pytest.mark.parametrize("path", ENDPOINTS)
+def test_request_responses_run_a_fixed_number_of_queries(client, engine, login, email, path):
+    headers = login(email)
+
+    with assert_max_queries(2, engine):
+        response = client.get(path, headers=headers)
+
+    assert response.status_code == 200, response.text
+    body = response.json()
+    if isinstance(body, list):
+        assert body
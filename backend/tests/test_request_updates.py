@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from crud.pagination import encode_cursor
+from database.database import SessionLocal
+from models.models import ActiveRequests
+
+REQUESTS = "/api/v1/maintenance-requests"
+
+# Seeded statuses: 1 Pending, 2 Assigned, 3 In Progress, 4 Completed
+PENDING, COMPLETED = 1, 4
+
+
+@pytest.fixture
+def request_id(client, login):
+    """A fresh Pending request submitted by Jane.
+
+    Left in place: SQLite hands a deleted top ID to the next insert, which
+    would collide with the deleted request's tombstone.
+    """
+    response = client.post(
+        f"{REQUESTS}/",
+        json={"student_ID": 1, "room_ID": 1, "category_ID": 1, "description": "Flickering light"},
+        headers=login("jane@university.edu"),
+    )
+    assert response.status_code == 201, response.text
+    return response.json()["issue_ID"]
+
+
+def active_row(issue_id):
+    db = SessionLocal()
+    try:
+        return db.get(ActiveRequests, issue_id)
+    finally:
+        db.close()
+
+
+def test_put_with_current_etag_bumps_the_version(client, login, request_id):
+    headers = login("admin@university.edu")
+    etag = client.get(f"{REQUESTS}/{request_id}", headers=headers).headers["ETag"]
+    assert etag == f'"{request_id}-1"'
+
+    response = client.put(
+        f"{REQUESTS}/{request_id}", json={"description": "Light out"}, headers={**headers, "If-Match": etag}
+    )
+
+    assert response.status_code == 200, response.text
+    assert response.json()["version"] == 2
+    assert response.headers["ETag"] == f'"{request_id}-2"'
+
+
+def test_put_with_stale_etag_fails_with_412(client, login, request_id):
+    headers = login("admin@university.edu")
+    client.put(f"{REQUESTS}/{request_id}", json={"description": "First edit"}, headers=headers)
+
+    response = client.put(
+        f"{REQUESTS}/{request_id}",
+        json={"description": "Lost edit"},
+        headers={**headers, "If-Match": f'"{request_id}-1"'},
+    )
+
+    assert response.status_code == 412
+    assert response.headers["ETag"] == f'"{request_id}-2"'
+    current = client.get(f"{REQUESTS}/{request_id}", headers=headers).json()
+    assert (current["description"], current["version"]) == ("First edit", 2)
+
+
+def test_put_to_a_missing_request_is_404_not_412(client, login):
+    response = client.put(
+        f"{REQUESTS}/99999",
+        json={"description": "Nobody home"},
+        headers={**login("admin@university.edu"), "If-Match": '"99999-1"'},
+    )
+
+    assert response.status_code == 404
+
+
+def test_if_match_naming_another_request_fails_with_412(client, login, request_id):
+    response = client.put(
+        f"{REQUESTS}/{request_id}",
+        json={"description": "Wrong tag"},
+        headers={**login("admin@university.edu"), "If-Match": '"3-1"'},
+    )
+
+    assert response.status_code == 412
+
+
+def test_status_patch_honours_if_match(client, login, request_id):
+    stale = client.patch(f"{REQUESTS}/{request_id}/status/2", headers={"If-Match": f'"{request_id}-0"'})
+    assert stale.status_code == 412
+
+    response = client.patch(f"{REQUESTS}/{request_id}/status/2", headers={"If-Match": f'"{request_id}-1"'})
+    assert response.status_code == 200, response.text
+    assert (response.json()["status_ID"], response.json()["version"]) == (2, 2)
+
+
+def test_status_changes_move_requests_in_and_out_of_the_active_set(client, login, request_id):
+    assert active_row(request_id).status_name == "Pending"
+
+    client.patch(f"{REQUESTS}/{request_id}/status/{COMPLETED}")
+    assert active_row(request_id) is None
+
+    client.patch(f"{REQUESTS}/{request_id}/status/{PENDING}")
+    row = active_row(request_id)
+    assert row is not None
+    assert (row.status_name, row.version) == ("Pending", 3)
+
+
+def test_category_change_is_copied_to_the_active_set(client, login, request_id):
+    response = client.put(f"{REQUESTS}/{request_id}", json={"category_ID": 2}, headers=login("admin@university.edu"))
+
+    assert response.status_code == 200, response.text
+    row = active_row(request_id)
+    assert (row.category_ID, row.category_name, row.version) == (2, "Plumbing", 2)
+
+
+def test_changes_feed_rejects_an_expired_sync_token(client, login):
+    too_old = datetime.now() - timedelta(days=365)
+    token = encode_cursor(too_old, 0, too_old, 0)
+
+    response = client.get(f"{REQUESTS}/changes", params={"since": token}, headers=login("admin@university.edu"))
+
+    assert response.status_code == 410
+
+
+def test_changes_feed_accepts_its_own_next_token(client, login):
+    headers = login("admin@university.edu")
+    first = client.get(f"{REQUESTS}/changes", headers=headers)
+    assert first.status_code == 200
+
+    response = client.get(f"{REQUESTS}/changes", params={"since": first.json()["next_token"]}, headers=headers)
+
+    assert response.status_code == 200
@@ -0,0 +1,97 @@
+import asyncio
+import threading
+
+from database.database import SessionLocal
+from models.models import Room, Status
+from services.lookup_registry import lookup_registry
+from services.topology import topology
+
+
+def test_topology_reload_during_a_write_is_invalidated_on_commit(engine):
+    db = SessionLocal()
+    try:
+        room = Room(room_number="102A", hall_ID=1, floor_number=1)
+        db.add(room)
+        db.flush()
+        room_id = room.room_ID
+        # A reload between the flush and the commit (in another thread, or
+        # here on the test's single connection) must not be the last word
+        topology.load(db)
+        reloaded = topology.version
+        db.commit()
+
+        assert topology.version == reloaded
+        assert room_id in topology.room_ids(1)
+        assert topology.version == reloaded + 1
+    finally:
+        db.delete(room)
+        db.commit()
+        db.close()
+    assert room_id not in topology.room_ids(1)
+
+
+def test_rolled_back_topology_write_leaves_the_snapshot_alone(engine):
+    topology.current()
+    loaded = topology.version
+    db = SessionLocal()
+    try:
+        db.add(Room(room_number="103A", hall_ID=1, floor_number=1))
+        db.flush()
+        db.rollback()
+    finally:
+        db.close()
+
+    topology.current()
+    assert topology.version == loaded
+
+
+def test_lookup_reload_during_a_write_is_invalidated_on_commit(engine):
+    db = SessionLocal()
+    try:
+        status = Status(status_name="Awaiting Parts")
+        db.add(status)
+        db.flush()
+        lookup_registry.load(db)
+        reloaded = lookup_registry.version
+        db.commit()
+
+        assert lookup_registry.status_id("awaiting parts") == status.status_ID
+        assert lookup_registry.version == reloaded + 1
+    finally:
+        db.delete(status)
+        db.commit()
+        db.close()
+    # Reload now: a lazy reload inside a later test's transaction would share,
+    # and roll back, the test engine's single connection
+    lookup_registry.current()
+
+
+def test_async_reads_reload_off_the_event_loop(engine, monkeypatch):
+    threads = []
+    build = topology._build
+
+    def recording_build(db, version):
+        threads.append(threading.get_ident())
+        return build(db, version)
+
+    monkeypatch.setattr(topology, "_build", recording_build)
+    topology.invalidate()
+
+    async def read():
+        loop_thread = threading.get_ident()
+        await topology.require_async()
+        return loop_thread
+
+    loop_thread = asyncio.run(read())
+    assert threads and loop_thread not in threads
+
+
+def test_async_reads_reload_for_an_unknown_id(engine):
+    lookup_registry.current()
+    loaded = lookup_registry.version
+
+    asyncio.run(lookup_registry.require_async(status_ids=[1]))
+    assert lookup_registry.version == loaded
+
+    asyncio.run(lookup_registry.require_async(status_ids=[999]))
+    assert lookup_registry.version == loaded + 1
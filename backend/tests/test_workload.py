@@ -0,0 +1,26 @@
+from decimal import Decimal
+
+from crud.officer_assignment_crud import create_assignment, update_assignment
+from database.database import SessionLocal
+from models.models import OfficerAssignment, OfficerWorkload
+from schemas.schemas import OfficerAssignmentCreate, OfficerAssignmentUpdate
+
+
+def test_update_recreates_a_missing_workload_row(engine):
+    db = SessionLocal()
+    try:
+        assignment = create_assignment(db, OfficerAssignmentCreate(issue_ID=1, officer_ID=1))
+        db.query(OfficerWorkload).filter(OfficerWorkload.officer_ID == 1).delete()
+        db.commit()
+
+        update_assignment(db, assignment.assignment_ID, OfficerAssignmentUpdate(hours_worked=Decimal("2.5")))
+
+        workload = db.get(OfficerWorkload, 1)
+        assert workload is not None
+        assert workload.active_assignments == 1
+        assert workload.total_hours_week == Decimal("2.50")
+    finally:
+        db.query(OfficerAssignment).filter(OfficerAssignment.officer_ID == 1).delete()
+        db.query(OfficerWorkload).filter(OfficerWorkload.officer_ID == 1).delete()
+        db.commit()
+        db.close()